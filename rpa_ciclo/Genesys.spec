@@ -74,6 +74,15 @@ else:
 hidden_imports = [
     'main_ciclo',  # CRÍTICO - módulo principal do RPA Ciclo
     'validador_hibrido',  # NOVO - Sistema de validação híbrida (substitui OCR)
+    'detector_tela',  # Detector de telas - captura única para todos os templates
+    'artefatos_debug',  # Gravação assíncrona das imagens de debug
+    'motor_ocr',  # Motor OCR persistente (tesserocr com fallback pytesseract)
+    'indice_itens',  # Índice dos códigos de item (ajuste de leituras de OCR)
+    'clipboard_eventos',  # Espera por mudança do clipboard (número de sequência)
+    'pool_visao',  # Pool de processos da visão/OCR (opcional)
+    'multiprocessing.shared_memory',  # Frames compartilhados com o pool_visao
+    'fila_status_sheets',  # Fila write-behind do Status Oracle (batchUpdate)
+    'leitor_separacao',  # Leitura da Separação só das colunas usadas (batchGet)
     'telegram_notifier',  # NOVO - Notificações via Telegram
     'google_sheets_ciclo',  # Integração Google Sheets
     'google_sheets_manager',  # Manager de planilhas (bancada)
@@ -98,6 +107,7 @@ hidden_imports = [
     'cv2',  # OpenCV para confidence na detecção de imagem
     'numpy',  # Necessário para OpenCV e análise de pixels
     'pytesseract',  # OCR para validação visual (mantido como fallback)
+    'tesserocr',  # OCR em memória (modelo carregado uma vez) - opcional
     'requests',  # Para Telegram API
 ]
 
@@ -115,7 +125,7 @@ excludes_list = [
 all_datas = added_files + tesseract_datas
 
 a = Analysis(
-    ['RPA_Ciclo_GUI_v2.py', 'main_ciclo.py', 'validador_hibrido.py', 'telegram_notifier.py'],  # Incluir telegram_notifier
+    ['RPA_Ciclo_GUI_v2.py', 'main_ciclo.py', 'validador_hibrido.py', 'detector_tela.py', 'artefatos_debug.py', 'motor_ocr.py', 'indice_itens.py', 'clipboard_eventos.py', 'pool_visao.py', 'fila_status_sheets.py', 'leitor_separacao.py', 'telegram_notifier.py'],  # Incluir telegram_notifier
     pathex=[os.path.abspath('.')],  # Adicionar path atual
     binaries=tesseract_binaries,
     datas=all_datas,
@@ -18,6 +18,12 @@ from pathlib import Path
 from datetime import datetime
 import glob
 
+# Processos filhos do pool_visao (.exe): executar a tarefa e sair antes de
+# importar o RPA e montar a interface
+import multiprocessing
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
 # Importar o módulo principal do RPA
 import main_ciclo as main
 
@@ -457,250 +463,252 @@ def mostrar_ajuda():
     tk.Button(ajuda_window, text="Fechar", command=ajuda_window.destroy, font=("Arial", 10), bg="#2196F3", fg="white").pack(pady=10)
 
 # ─── INTERFACE PRINCIPAL ────────────────────────────────────────────────────
-app = tk.Tk()
-app.title("RPA Ciclo Automação v2.0")
-app.geometry("750x700")
-app.resizable(False, False)
-
-# Ícone da janela
-try:
-    icone_path = os.path.join(base_path, "Topo.png")
-    if os.path.exists(icone_path):
-        app.iconphoto(True, ImageTk.PhotoImage(file=icone_path))
-except Exception as e:
-    print(f"Erro ao definir ícone: {e}")
-
-# ─── ÁREA DOS LOGOS ─────────────────────────────────────────────────────────
-try:
-    logo_frame = tk.Frame(app, bg="#f7f7f7")
-    logo_frame.pack(pady=(15, 10), fill=tk.X)
-
-    # Logo Genesys
-    logo1_path = os.path.join(base_path, "Logo.png")
-    if os.path.exists(logo1_path):
-        logo1_img = Image.open(logo1_path).resize((130, 80))
-        logo1_tk = ImageTk.PhotoImage(logo1_img)
-
-        # Logo Tecumseh
-        logo2_path = os.path.join(base_path, "Tecumseh.png")
-        if os.path.exists(logo2_path):
-            logo2_img = Image.open(logo2_path).resize((80, 60))
-            logo2_tk = ImageTk.PhotoImage(logo2_img)
-
-            # Container centralizado para os logos
-            logos_container = tk.Frame(logo_frame, bg="#f7f7f7")
-            logos_container.pack()
-
-            tk.Label(logos_container, image=logo1_tk, bg="#f7f7f7").pack(side="left", padx=12)
-            tk.Label(logos_container, image=logo2_tk, bg="#f7f7f7").pack(side="left", padx=12)
-        else:
-            raise FileNotFoundError("Logo Tecumseh não encontrado")
-    else:
-        raise FileNotFoundError("Logo Genesys não encontrado")
-
-except Exception as e:
-    print(f"❌ Erro ao carregar logos: {e}")
-    # Frame vazio se logos falharem
-    logo_frame = tk.Frame(app, height=80, bg="#f7f7f7")
-    logo_frame.pack(pady=(15, 10), fill=tk.X)
-    tk.Label(logo_frame, text="RPA CICLO AUTOMAÇÃO", font=("Arial", 14, "bold"), bg="#f7f7f7").pack()
-
-# ─── ÁREA DE CONTROLES ──────────────────────────────────────────────────────
-controls_frame = tk.Frame(app)
-controls_frame.pack(pady=8)
-
-# Botões principais
-btn_iniciar_unico = tk.Button(
-    controls_frame,
-    text="🎯 Ciclo Único",
-    command=lambda: iniciar_rpa(modo_continuo=False),
-    font=("Arial", 10, "bold"),
-    bg="#2196F3",
-    fg="white",
-    padx=12,
-    pady=8,
-    width=13
-)
-btn_iniciar_unico.pack(side="left", padx=4)
-
-btn_iniciar_continuo = tk.Button(
-    controls_frame,
-    text="🔄 Modo Contínuo",
-    command=lambda: iniciar_rpa(modo_continuo=True),
-    font=("Arial", 10, "bold"),
-    bg="#4CAF50",
-    fg="white",
-    padx=12,
-    pady=8,
-    width=13
-)
-btn_iniciar_continuo.pack(side="left", padx=4)
-
-btn_parar = tk.Button(
-    controls_frame,
-    text="⏹️ Parar RPA",
-    command=parar_rpa,
-    font=("Arial", 10, "bold"),
-    bg="#f44336",
-    fg="white",
-    padx=12,
-    pady=8,
-    width=13,
-    state='disabled'
-)
-btn_parar.pack(side="left", padx=4)
-
-# ─── ÁREA DE UTILITÁRIOS (PASTAS E GOOGLE SHEETS) ───────────────────────────
-utils_frame = tk.Frame(app)
-utils_frame.pack(pady=8)
-
-tk.Button(
-    utils_frame,
-    text="📊 Movimentações Oracle",
-    command=abrir_pasta_movimentacoes_oracle,
-    font=("Arial", 9),
-    bg="#FF9800",
-    fg="white",
-    padx=10,
-    pady=4
-).pack(side="left", padx=3)
-
-tk.Button(
-    utils_frame,
-    text="📋 Excel Bancada",
-    command=abrir_pasta_excel_bancada,
-    font=("Arial", 9),
-    bg="#9C27B0",
-    fg="white",
-    padx=10,
-    pady=4
-).pack(side="left", padx=3)
-
-tk.Button(
-    utils_frame,
-    text="❓ Ajuda",
-    command=mostrar_ajuda,
-    font=("Arial", 9),
-    padx=10,
-    pady=4
-).pack(side="left", padx=3)
-
-# ─── STATUS ─────────────────────────────────────────────────────────────────
-status_frame = tk.Frame(app)
-status_frame.pack(pady=8)
-
-status_label = tk.Label(
-    status_frame,
-    text="Status: Aguardando",
-    font=("Arial", 11, "bold"),
-    fg="orange"
-)
-status_label.pack()
-
-# ─── DIVISOR ENTRE SEÇÕES ───────────────────────────────────────────────────
-separator1 = ttk.Separator(app, orient='horizontal')
-separator1.pack(fill='x', padx=20, pady=5)
-
-# ─── ÁREA DE HISTÓRICO DE EXCEL ─────────────────────────────────────────────
-historico_frame = tk.Frame(app)
-historico_frame.pack(pady=5, padx=20, fill=tk.BOTH, expand=False)
-
-# Cabeçalho do histórico
-historico_header = tk.Frame(historico_frame)
-historico_header.pack(fill=tk.X)
-
-tk.Label(historico_header, text="📂 Histórico de Excel Gerados:", font=("Arial", 10, "bold")).pack(side="left")
-
-label_contador_historico = tk.Label(historico_header, text="Total: 0 arquivos", font=("Arial", 9), fg="gray")
-label_contador_historico.pack(side="left", padx=10)
-
-btn_atualizar_historico = tk.Button(
-    historico_header,
-    text="🔄 Atualizar",
-    command=atualizar_historico_excel,
-    font=("Arial", 8),
-    bg="#4CAF50",
-    fg="white",
-    padx=8,
-    pady=2
-)
-btn_atualizar_historico.pack(side="right")
-
-# Listbox com scrollbar para histórico
-historico_scroll = tk.Scrollbar(historico_frame, orient=tk.VERTICAL)
-historico_listbox = tk.Listbox(
-    historico_frame,
-    height=6,
-    width=100,
-    font=("Consolas", 8),
-    yscrollcommand=historico_scroll.set,
-    bg="#f8f8f8"
-)
-historico_scroll.config(command=historico_listbox.yview)
-historico_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=(5, 0))
-historico_scroll.pack(side=tk.RIGHT, fill=tk.Y, pady=(5, 0))
-
-# Bind duplo clique para abrir arquivo
-historico_listbox.bind("<Double-Button-1>", abrir_arquivo_selecionado)
-
-tk.Label(historico_frame, text="💡 Duplo clique em um arquivo para abrir", font=("Arial", 8), fg="gray").pack(anchor="w", pady=(2, 0))
-
-# ─── DIVISOR ENTRE SEÇÕES ───────────────────────────────────────────────────
-separator2 = ttk.Separator(app, orient='horizontal')
-separator2.pack(fill='x', padx=20, pady=5)
-
-# ─── ÁREA DE LOG ────────────────────────────────────────────────────────────
-log_frame = tk.Frame(app)
-log_frame.pack(pady=5, padx=20, fill=tk.BOTH, expand=True)
-
-tk.Label(log_frame, text="📋 Log de Execução:", font=("Arial", 10, "bold")).pack(anchor="w")
-
-# Text widget com scrollbar
-log_text = scrolledtext.ScrolledText(
-    log_frame,
-    height=15,
-    width=100,
-    wrap=tk.WORD,
-    state='disabled',
-    font=("Consolas", 8),
-    bg="#f8f8f8"
-)
-log_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
-
-# ─── INICIALIZAÇÃO ──────────────────────────────────────────────────────────
-# Ajusta o título inicial
-set_title_running(False)
-
-# Log inicial
-log_interface("🤖 RPA Ciclo Automação v2.0 carregado")
-log_interface("✅ Sistema pronto para iniciar")
-log_interface("📖 Clique em 'Ajuda' para instruções detalhadas")
-log_interface("")
-log_interface("Escolha o modo de execução:")
-log_interface("  🎯 Ciclo Único - Executa uma vez e para")
-log_interface("  🔄 Modo Contínuo - Repete automaticamente")
-
-# Carregar histórico de Excel ao iniciar
-atualizar_historico_excel()
-
-# Interceptar fechamento da janela
-def on_closing():
-    if estado["executando"]:
-        resposta = messagebox.askyesno(
-            "Confirmar Saída",
-            "RPA está em execução. Deseja realmente sair?\n\n"
-            "Isso interromperá a automação."
-        )
-        if not resposta:
-            return
+# Só no processo principal: com o pool_visao, os processos filhos (spawn)
+# importam este arquivo como "__mp_main__" e não podem abrir outra janela
+if __name__ == "__main__":
+    app = tk.Tk()
+    app.title("RPA Ciclo Automação v2.0")
+    app.geometry("750x700")
+    app.resizable(False, False)
 
-        # Parar RPA se estiver rodando
-        parar_rpa()
+    # Ícone da janela
+    try:
+        icone_path = os.path.join(base_path, "Topo.png")
+        if os.path.exists(icone_path):
+            app.iconphoto(True, ImageTk.PhotoImage(file=icone_path))
+    except Exception as e:
+        print(f"Erro ao definir ícone: {e}")
+
+    # ─── ÁREA DOS LOGOS ─────────────────────────────────────────────────────────
+    try:
+        logo_frame = tk.Frame(app, bg="#f7f7f7")
+        logo_frame.pack(pady=(15, 10), fill=tk.X)
+
+        # Logo Genesys
+        logo1_path = os.path.join(base_path, "Logo.png")
+        if os.path.exists(logo1_path):
+            logo1_img = Image.open(logo1_path).resize((130, 80))
+            logo1_tk = ImageTk.PhotoImage(logo1_img)
+
+            # Logo Tecumseh
+            logo2_path = os.path.join(base_path, "Tecumseh.png")
+            if os.path.exists(logo2_path):
+                logo2_img = Image.open(logo2_path).resize((80, 60))
+                logo2_tk = ImageTk.PhotoImage(logo2_img)
+
+                # Container centralizado para os logos
+                logos_container = tk.Frame(logo_frame, bg="#f7f7f7")
+                logos_container.pack()
+
+                tk.Label(logos_container, image=logo1_tk, bg="#f7f7f7").pack(side="left", padx=12)
+                tk.Label(logos_container, image=logo2_tk, bg="#f7f7f7").pack(side="left", padx=12)
+            else:
+                raise FileNotFoundError("Logo Tecumseh não encontrado")
+        else:
+            raise FileNotFoundError("Logo Genesys não encontrado")
 
-    app.destroy()
+    except Exception as e:
+        print(f"❌ Erro ao carregar logos: {e}")
+        # Frame vazio se logos falharem
+        logo_frame = tk.Frame(app, height=80, bg="#f7f7f7")
+        logo_frame.pack(pady=(15, 10), fill=tk.X)
+        tk.Label(logo_frame, text="RPA CICLO AUTOMAÇÃO", font=("Arial", 14, "bold"), bg="#f7f7f7").pack()
+
+    # ─── ÁREA DE CONTROLES ──────────────────────────────────────────────────────
+    controls_frame = tk.Frame(app)
+    controls_frame.pack(pady=8)
+
+    # Botões principais
+    btn_iniciar_unico = tk.Button(
+        controls_frame,
+        text="🎯 Ciclo Único",
+        command=lambda: iniciar_rpa(modo_continuo=False),
+        font=("Arial", 10, "bold"),
+        bg="#2196F3",
+        fg="white",
+        padx=12,
+        pady=8,
+        width=13
+    )
+    btn_iniciar_unico.pack(side="left", padx=4)
+
+    btn_iniciar_continuo = tk.Button(
+        controls_frame,
+        text="🔄 Modo Contínuo",
+        command=lambda: iniciar_rpa(modo_continuo=True),
+        font=("Arial", 10, "bold"),
+        bg="#4CAF50",
+        fg="white",
+        padx=12,
+        pady=8,
+        width=13
+    )
+    btn_iniciar_continuo.pack(side="left", padx=4)
+
+    btn_parar = tk.Button(
+        controls_frame,
+        text="⏹️ Parar RPA",
+        command=parar_rpa,
+        font=("Arial", 10, "bold"),
+        bg="#f44336",
+        fg="white",
+        padx=12,
+        pady=8,
+        width=13,
+        state='disabled'
+    )
+    btn_parar.pack(side="left", padx=4)
+
+    # ─── ÁREA DE UTILITÁRIOS (PASTAS E GOOGLE SHEETS) ───────────────────────────
+    utils_frame = tk.Frame(app)
+    utils_frame.pack(pady=8)
+
+    tk.Button(
+        utils_frame,
+        text="📊 Movimentações Oracle",
+        command=abrir_pasta_movimentacoes_oracle,
+        font=("Arial", 9),
+        bg="#FF9800",
+        fg="white",
+        padx=10,
+        pady=4
+    ).pack(side="left", padx=3)
+
+    tk.Button(
+        utils_frame,
+        text="📋 Excel Bancada",
+        command=abrir_pasta_excel_bancada,
+        font=("Arial", 9),
+        bg="#9C27B0",
+        fg="white",
+        padx=10,
+        pady=4
+    ).pack(side="left", padx=3)
+
+    tk.Button(
+        utils_frame,
+        text="❓ Ajuda",
+        command=mostrar_ajuda,
+        font=("Arial", 9),
+        padx=10,
+        pady=4
+    ).pack(side="left", padx=3)
+
+    # ─── STATUS ─────────────────────────────────────────────────────────────────
+    status_frame = tk.Frame(app)
+    status_frame.pack(pady=8)
+
+    status_label = tk.Label(
+        status_frame,
+        text="Status: Aguardando",
+        font=("Arial", 11, "bold"),
+        fg="orange"
+    )
+    status_label.pack()
+
+    # ─── DIVISOR ENTRE SEÇÕES ───────────────────────────────────────────────────
+    separator1 = ttk.Separator(app, orient='horizontal')
+    separator1.pack(fill='x', padx=20, pady=5)
+
+    # ─── ÁREA DE HISTÓRICO DE EXCEL ─────────────────────────────────────────────
+    historico_frame = tk.Frame(app)
+    historico_frame.pack(pady=5, padx=20, fill=tk.BOTH, expand=False)
+
+    # Cabeçalho do histórico
+    historico_header = tk.Frame(historico_frame)
+    historico_header.pack(fill=tk.X)
+
+    tk.Label(historico_header, text="📂 Histórico de Excel Gerados:", font=("Arial", 10, "bold")).pack(side="left")
+
+    label_contador_historico = tk.Label(historico_header, text="Total: 0 arquivos", font=("Arial", 9), fg="gray")
+    label_contador_historico.pack(side="left", padx=10)
+
+    btn_atualizar_historico = tk.Button(
+        historico_header,
+        text="🔄 Atualizar",
+        command=atualizar_historico_excel,
+        font=("Arial", 8),
+        bg="#4CAF50",
+        fg="white",
+        padx=8,
+        pady=2
+    )
+    btn_atualizar_historico.pack(side="right")
+
+    # Listbox com scrollbar para histórico
+    historico_scroll = tk.Scrollbar(historico_frame, orient=tk.VERTICAL)
+    historico_listbox = tk.Listbox(
+        historico_frame,
+        height=6,
+        width=100,
+        font=("Consolas", 8),
+        yscrollcommand=historico_scroll.set,
+        bg="#f8f8f8"
+    )
+    historico_scroll.config(command=historico_listbox.yview)
+    historico_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=(5, 0))
+    historico_scroll.pack(side=tk.RIGHT, fill=tk.Y, pady=(5, 0))
+
+    # Bind duplo clique para abrir arquivo
+    historico_listbox.bind("<Double-Button-1>", abrir_arquivo_selecionado)
+
+    tk.Label(historico_frame, text="💡 Duplo clique em um arquivo para abrir", font=("Arial", 8), fg="gray").pack(anchor="w", pady=(2, 0))
+
+    # ─── DIVISOR ENTRE SEÇÕES ───────────────────────────────────────────────────
+    separator2 = ttk.Separator(app, orient='horizontal')
+    separator2.pack(fill='x', padx=20, pady=5)
+
+    # ─── ÁREA DE LOG ────────────────────────────────────────────────────────────
+    log_frame = tk.Frame(app)
+    log_frame.pack(pady=5, padx=20, fill=tk.BOTH, expand=True)
+
+    tk.Label(log_frame, text="📋 Log de Execução:", font=("Arial", 10, "bold")).pack(anchor="w")
+
+    # Text widget com scrollbar
+    log_text = scrolledtext.ScrolledText(
+        log_frame,
+        height=15,
+        width=100,
+        wrap=tk.WORD,
+        state='disabled',
+        font=("Consolas", 8),
+        bg="#f8f8f8"
+    )
+    log_text.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
 
-app.protocol("WM_DELETE_WINDOW", on_closing)
+    # ─── INICIALIZAÇÃO ──────────────────────────────────────────────────────────
+    # Ajusta o título inicial
+    set_title_running(False)
 
-# ─── EXECUÇÃO ───────────────────────────────────────────────────────────────
-if __name__ == "__main__":
+    # Log inicial
+    log_interface("🤖 RPA Ciclo Automação v2.0 carregado")
+    log_interface("✅ Sistema pronto para iniciar")
+    log_interface("📖 Clique em 'Ajuda' para instruções detalhadas")
+    log_interface("")
+    log_interface("Escolha o modo de execução:")
+    log_interface("  🎯 Ciclo Único - Executa uma vez e para")
+    log_interface("  🔄 Modo Contínuo - Repete automaticamente")
+
+    # Carregar histórico de Excel ao iniciar
+    atualizar_historico_excel()
+
+    # Interceptar fechamento da janela
+    def on_closing():
+        if estado["executando"]:
+            resposta = messagebox.askyesno(
+                "Confirmar Saída",
+                "RPA está em execução. Deseja realmente sair?\n\n"
+                "Isso interromperá a automação."
+            )
+            if not resposta:
+                return
+
+            # Parar RPA se estiver rodando
+            parar_rpa()
+
+        app.destroy()
+
+    app.protocol("WM_DELETE_WINDOW", on_closing)
+
+    # ─── EXECUÇÃO ───────────────────────────────────────────────────────────────
     app.mainloop()
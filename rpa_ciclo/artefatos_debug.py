@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""
+artefatos_debug.py
+==================
+Gravação ASSÍNCRONA das imagens de debug da detecção de telas.
+
+Antes, detectar_imagem_opencv fazia cv2.imwrite (PNG da tela inteira) em
+toda detecção com sucesso, e na falha gravava tela + template + comparação,
+tudo na thread de automação. O verificar_tempo_oracle também salvava
+debug_tempo_oracle_tela.png a cada item.
+
+Aqui as imagens vão para uma fila processada por uma thread separada, com:
+- limite de frequência por template (não grava a mesma coisa toda hora)
+- compressão opcional em JPEG/WebP
+- opção de gravar somente falhas
+
+As imagens ficam numa pasta própria (debug_artefatos/) com orçamento de
+tamanho e idade: ao estourar, os arquivos mais antigos são apagados
+primeiro. Um índice (indice.jsonl) registra, para cada arquivo, qual
+detecção, item/linha e score o gerou.
+
+Uso:
+    gravador = obter_gravador()
+    gravador.salvar("debug_tela_atual", frame_bgr, chave="ErroProduto.png", falha=True)
+
+Data: 2026-10-18
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+
+try:
+    import cv2
+    import numpy as np
+    OPENCV_DISPONIVEL = True
+except ImportError:
+    OPENCV_DISPONIVEL = False
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+# Formato das imagens: "png", "jpg" ou "webp"
+FORMATO_PADRAO = "jpg"
+
+# Qualidade para jpg/webp (0-100)
+QUALIDADE_PADRAO = 80
+
+# Intervalo mínimo (segundos) entre gravações da mesma chave (template)
+INTERVALO_MINIMO_PADRAO = 30
+
+# Máximo de imagens aguardando gravação (acima disso, descarta)
+TAMANHO_FILA_PADRAO = 20
+
+# Pasta gerenciada das imagens de debug
+PASTA_PADRAO = "debug_artefatos"
+
+# Orçamento da pasta: tamanho total (MB) e idade máxima (dias)
+TAMANHO_MAXIMO_MB_PADRAO = 200
+IDADE_MAXIMA_DIAS_PADRAO = 7
+
+# Índice das imagens (uma linha JSON por arquivo)
+ARQUIVO_INDICE = "indice.jsonl"
+
+# Extensões consideradas imagens de debug na pasta gerenciada
+EXTENSOES_IMAGEM = (".png", ".jpg", ".jpeg", ".webp")
+
+# ============================================================================
+# FUNÇÕES AUXILIARES
+# ============================================================================
+
+def gui_log(mensagem):
+    """Log compatível com GUI (pode ser substituído externamente)"""
+    print(mensagem)
+
+
+def montar_comparacao(tela_bgr, template_bgr):
+    """
+    Imagem lado a lado (tela | template) na mesma altura.
+
+    Returns:
+        numpy.ndarray: Imagem comparativa (BGR)
+    """
+    h1, w1 = tela_bgr.shape[:2]
+    h2, w2 = template_bgr.shape[:2]
+
+    if h1 > h2:
+        template_resized = cv2.resize(template_bgr, (int(w2 * h1 / h2), h1))
+        return np.hstack([tela_bgr, template_resized])
+
+    screen_resized = cv2.resize(tela_bgr, (int(w1 * h2 / h1), h2))
+    return np.hstack([screen_resized, template_bgr])
+
+
+def _para_bgr(imagem):
+    """Aceita numpy BGR ou PIL.Image (RGB) e retorna numpy BGR"""
+    if isinstance(imagem, np.ndarray):
+        return imagem
+    return cv2.cvtColor(np.array(imagem.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+# ============================================================================
+# GRAVADOR EM SEGUNDO PLANO
+# ============================================================================
+
+class GravadorDebug:
+    """Fila + thread que grava as imagens de debug fora da thread de automação"""
+
+    def __init__(self, pasta=PASTA_PADRAO, formato=FORMATO_PADRAO, qualidade=QUALIDADE_PADRAO,
+                 intervalo_minimo=INTERVALO_MINIMO_PADRAO, somente_falhas=False,
+                 tamanho_fila=TAMANHO_FILA_PADRAO, habilitado=True,
+                 tamanho_maximo_mb=TAMANHO_MAXIMO_MB_PADRAO, idade_maxima_dias=IDADE_MAXIMA_DIAS_PADRAO):
+        self.pasta = pasta
+        self.formato = formato.lower().lstrip(".")
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.idade_maxima = idade_maxima_dias * 86400
+        self.qualidade = qualidade
+        self.intervalo_minimo = intervalo_minimo
+        self.somente_falhas = somente_falhas
+        self.habilitado = habilitado and OPENCV_DISPONIVEL
+
+        self._fila = queue.Queue(maxsize=tamanho_fila)
+        self._ultima_gravacao = {}  # chave -> timestamp
+        self._lock = threading.Lock()
+        self._thread = None
+
+        # Arquivos da pasta gerenciada, do mais antigo ao mais novo: (mtime, caminho, tamanho)
+        self._arquivos = None
+        self._tamanho_total = 0
+        self._contexto = {}  # item/linha em processamento (vai para o índice)
+
+        self.estatisticas = {"gravados": 0, "limitados": 0, "descartados": 0, "erros": 0, "removidos": 0}
+
+    # ─── CONTEXTO ───────────────────────────────────────────────────────────
+    def definir_contexto(self, **contexto):
+        """
+        Define o contexto gravado no índice junto com cada imagem
+        (ex: item="ABC123", linha=42). Sem argumentos, limpa o contexto.
+        """
+        self._contexto = {chave: valor for chave, valor in contexto.items() if valor is not None}
+
+    # ─── DECISÃO ────────────────────────────────────────────────────────────
+    def aceita(self, chave=None, falha=True):
+        """
+        True se uma imagem com essa chave seria gravada agora (respeitando
+        somente_falhas e o limite por chave). Serve para evitar capturar a
+        tela só para o debug quando ela seria descartada.
+        """
+        if not self.habilitado:
+            return False
+        if self.somente_falhas and not falha:
+            return False
+        if chave is None or self.intervalo_minimo <= 0:
+            return True
+
+        with self._lock:
+            ultima = self._ultima_gravacao.get(chave)
+        return ultima is None or time.time() - ultima >= self.intervalo_minimo
+
+    def _reservar(self, chave, falha):
+        """Como aceita(), mas já registra a gravação para o limite por chave"""
+        if not self.aceita(chave, falha):
+            if self.habilitado and not (self.somente_falhas and not falha):
+                self.estatisticas["limitados"] += 1
+            return False
+
+        if chave is not None:
+            with self._lock:
+                self._ultima_gravacao[chave] = time.time()
+        return True
+
+    # ─── ENFILEIRAR ─────────────────────────────────────────────────────────
+    def salvar(self, nome_base, imagem, chave=None, falha=True, score=None):
+        """
+        Enfileira uma imagem (numpy BGR ou PIL.Image) para gravação.
+
+        Args:
+            nome_base: Prefixo do arquivo (ex: "debug_tela_atual")
+            imagem: Imagem a gravar
+            chave: Chave do limite de frequência (ex: nome do template)
+            falha: True se a imagem documenta uma falha
+            score: Score da detecção (vai para o índice)
+
+        Returns:
+            str: Caminho que será gravado, ou None se descartado
+        """
+        if not self._reservar(chave, falha):
+            return None
+        return self._enfileirar(nome_base, lambda: _para_bgr(imagem), chave, falha, score)
+
+    def salvar_falha_deteccao(self, tela_bgr, template_bgr, chave=None, score=None):
+        """
+        Enfileira o trio de uma detecção que falhou: tela, template usado e
+        comparação lado a lado (montada na thread do gravador).
+
+        Returns:
+            list: Caminhos que serão gravados (vazia se descartado)
+        """
+        if not self._reservar(chave, True):
+            return []
+
+        caminhos = [self._enfileirar("debug_tela_atual", lambda: tela_bgr, chave, True, score)]
+        if template_bgr is not None:
+            caminhos.append(self._enfileirar("debug_template_usado", lambda: template_bgr, chave, True, score))
+            caminhos.append(self._enfileirar("debug_comparacao", lambda: montar_comparacao(tela_bgr, template_bgr),
+                                             chave, True, score))
+        return [c for c in caminhos if c]
+
+    def _enfileirar(self, nome_base, gerar_imagem, chave=None, falha=True, score=None):
+        agora = datetime.now()
+        caminho = os.path.join(self.pasta, f"{nome_base}_{agora.strftime('%Y%m%d_%H%M%S_%f')[:-3]}.{self.formato}")
+
+        registro = {
+            "arquivo": os.path.basename(caminho),
+            "data": agora.isoformat(timespec="seconds"),
+            "deteccao": chave,
+            "falha": falha,
+            "score": round(float(score), 4) if score is not None else None,
+        }
+        registro.update(self._contexto)
+
+        self._iniciar_thread()
+        try:
+            self._fila.put_nowait((caminho, gerar_imagem, registro))
+        except queue.Full:
+            self.estatisticas["descartados"] += 1
+            return None
+        return caminho
+
+    # ─── THREAD ─────────────────────────────────────────────────────────────
+    def _iniciar_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="GravadorDebug", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            caminho, gerar_imagem, registro = self._fila.get()
+            try:
+                self._gravar(caminho, gerar_imagem())
+                self.estatisticas["gravados"] += 1
+                self._registrar(caminho, registro)
+                self._aplicar_retencao()
+            except Exception as e:
+                self.estatisticas["erros"] += 1
+                gui_log(f"[DEBUG] ⚠️ Erro ao gravar {os.path.basename(caminho)}: {e}")
+            finally:
+                self._fila.task_done()
+
+    def _gravar(self, caminho, imagem_bgr):
+        if self.pasta and not os.path.isdir(self.pasta):
+            os.makedirs(self.pasta, exist_ok=True)
+
+        parametros = []
+        if self.formato in ("jpg", "jpeg"):
+            parametros = [cv2.IMWRITE_JPEG_QUALITY, int(self.qualidade)]
+        elif self.formato == "webp":
+            parametros = [cv2.IMWRITE_WEBP_QUALITY, int(self.qualidade)]
+
+        cv2.imwrite(caminho, imagem_bgr, parametros)
+
+    # ─── PASTA GERENCIADA ───────────────────────────────────────────────────
+    def _caminho_indice(self):
+        return os.path.join(self.pasta, ARQUIVO_INDICE)
+
+    def _carregar_arquivos(self):
+        """Lista os arquivos já existentes na pasta (uma vez, na thread do gravador)"""
+        arquivos = []
+        if os.path.isdir(self.pasta):
+            for nome in os.listdir(self.pasta):
+                if not nome.lower().endswith(EXTENSOES_IMAGEM):
+                    continue
+                caminho = os.path.join(self.pasta, nome)
+                try:
+                    info = os.stat(caminho)
+                except OSError:
+                    continue
+                arquivos.append((info.st_mtime, caminho, info.st_size))
+
+        arquivos.sort()
+        self._arquivos = deque(arquivos)
+        self._tamanho_total = sum(tamanho for _, _, tamanho in arquivos)
+
+    def _registrar(self, caminho, registro):
+        """Adiciona o arquivo recém-gravado à lista e ao índice"""
+        if self._arquivos is None:
+            self._carregar_arquivos()
+        else:
+            try:
+                tamanho = os.path.getsize(caminho)
+            except OSError:
+                return
+            self._arquivos.append((time.time(), caminho, tamanho))
+            self._tamanho_total += tamanho
+
+        with open(self._caminho_indice(), "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+    def _aplicar_retencao(self):
+        """Apaga os arquivos mais antigos enquanto o orçamento de tamanho/idade estiver estourado"""
+        limite_idade = time.time() - self.idade_maxima
+        removidos = set()
+
+        while self._arquivos and (self._tamanho_total > self.tamanho_maximo or self._arquivos[0][0] < limite_idade):
+            _, caminho, tamanho = self._arquivos.popleft()
+            self._tamanho_total -= tamanho
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+            removidos.add(os.path.basename(caminho))
+
+        if removidos:
+            self.estatisticas["removidos"] += len(removidos)
+            self._reescrever_indice(removidos)
+
+    def _reescrever_indice(self, removidos):
+        """Tira do índice as entradas dos arquivos apagados (grava .tmp + replace)"""
+        caminho_indice = self._caminho_indice()
+        if not os.path.isfile(caminho_indice):
+            return
+
+        with open(caminho_indice, "r", encoding="utf-8") as f:
+            linhas = [linha for linha in f if linha.strip()]
+
+        mantidas = []
+        for linha in linhas:
+            try:
+                if json.loads(linha).get("arquivo") in removidos:
+                    continue
+            except ValueError:
+                continue
+            mantidas.append(linha)
+
+        temp = caminho_indice + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            f.writelines(mantidas)
+        os.replace(temp, caminho_indice)
+
+    def aguardar_fila(self):
+        """Bloqueia até todas as imagens enfileiradas serem gravadas"""
+        self._fila.join()
+
+
+# ============================================================================
+# INSTÂNCIA GLOBAL
+# ============================================================================
+
+_gravador = None
+
+
+def configurar_gravador(config=None, pasta_base="."):
+    """
+    Cria o gravador global conforme "debug_imagens" do config.json.
+
+    Formato:
+        "debug_imagens": {
+            "habilitado": true,
+            "formato": "jpg",
+            "qualidade": 80,
+            "somente_falhas": true,
+            "intervalo_minimo_por_template": 30,
+            "tamanho_fila": 20,
+            "pasta": "debug_artefatos",
+            "tamanho_maximo_mb": 200,
+            "idade_maxima_dias": 7
+        }
+
+    Args:
+        config: Dicionário completo do config.json
+        pasta_base: Pasta onde fica a pasta de debug (ex: pasta do .exe)
+
+    Returns:
+        GravadorDebug
+    """
+    global _gravador
+
+    cfg = config.get("debug_imagens", {}) if config else {}
+    _gravador = GravadorDebug(
+        pasta=os.path.join(str(pasta_base), cfg.get("pasta", PASTA_PADRAO)),
+        tamanho_maximo_mb=float(cfg.get("tamanho_maximo_mb", TAMANHO_MAXIMO_MB_PADRAO)),
+        idade_maxima_dias=float(cfg.get("idade_maxima_dias", IDADE_MAXIMA_DIAS_PADRAO)),
+        formato=cfg.get("formato", FORMATO_PADRAO),
+        qualidade=int(cfg.get("qualidade", QUALIDADE_PADRAO)),
+        intervalo_minimo=float(cfg.get("intervalo_minimo_por_template", INTERVALO_MINIMO_PADRAO)),
+        somente_falhas=bool(cfg.get("somente_falhas", False)),
+        tamanho_fila=int(cfg.get("tamanho_fila", TAMANHO_FILA_PADRAO)),
+        habilitado=bool(cfg.get("habilitado", True)),
+    )
+    return _gravador
+
+
+def definir_contexto(**contexto):
+    """Contexto (item, linha...) gravado no índice junto com as próximas imagens"""
+    obter_gravador().definir_contexto(**contexto)
+
+
+def obter_gravador():
+    """Gravador global (cria com os valores padrão se ainda não configurado)"""
+    global _gravador
+
+    if _gravador is None:
+        _gravador = GravadorDebug()
+    return _gravador
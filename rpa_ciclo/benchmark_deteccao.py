@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da detecção de imagens: modo "normal" x modo "rapido"
+
+Compara precisão e latência dos dois modos do detector_tela sobre as telas
+de referência (informacoes/tela-*.jpg e debug_*.png):
+
+- Casos REAIS: cada template contra cada tela (resultado do modo normal é
+  a referência)
+- Casos SINTÉTICOS: cada template colado numa posição conhecida de cada
+  tela (verifica se os dois modos acham o template no lugar certo)
+
+Uso:
+    python benchmark_deteccao.py
+"""
+
+import glob
+import os
+import time
+
+import cv2
+
+import detector_tela
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+PASTA_INFORMACOES = os.path.join(PASTA, "informacoes")
+
+MODOS = ["normal", "rapido"]
+TOLERANCIA_POSICAO = 4  # pixels
+
+
+def carregar_telas():
+    """Telas de referência: capturas em informacoes/ + debug_*.png"""
+    arquivos = sorted(glob.glob(os.path.join(PASTA_INFORMACOES, "tela-*.jpg")))
+    arquivos += sorted(glob.glob(os.path.join(PASTA, "debug_*.png")))
+
+    telas = []
+    for arquivo in arquivos:
+        frame = cv2.imread(arquivo)
+        if frame is not None:
+            telas.append((os.path.basename(arquivo), frame))
+    return telas
+
+
+def medir(frame, caminho, modo):
+    """Executa uma detecção (tela inteira, sem dica de último acerto)"""
+    detector_tela._ultimos_acertos.clear()
+    detector_tela.limpar_cache_resultados()
+    inicio = time.perf_counter()
+    deteccao = detector_tela.localizar_no_frame(frame, caminho, detector_tela.CONFIDENCE_PADRAO, modo=modo)
+    return deteccao, (time.perf_counter() - inicio) * 1000
+
+
+def colar_template(frame, template):
+    """Cola o template no centro da tela (se couber). Retorna (frame, posição)"""
+    frame_h, frame_w = frame.shape[:2]
+    t_h, t_w = template.shape[:2]
+    if t_w > frame_w or t_h > frame_h:
+        return None, None
+
+    x = (frame_w - t_w) // 2 + 7
+    y = (frame_h - t_h) // 2 + 5
+    x, y = min(x, frame_w - t_w), min(y, frame_h - t_h)
+
+    sintetico = frame.copy()
+    sintetico[y:y + t_h, x:x + t_w] = template
+    return sintetico, (x, y)
+
+
+def main():
+    print("=" * 70)
+    print("BENCHMARK DE DETECÇÃO - MODO NORMAL x MODO RÁPIDO")
+    print("=" * 70)
+
+    telas = carregar_telas()
+    templates = {nome: detector_tela.caminho_template(arquivo) for nome, arquivo in detector_tela.TEMPLATES_TELA.items()}
+    templates = {nome: caminho for nome, caminho in templates.items() if caminho}
+
+    print(f"\nTelas: {len(telas)} | Templates: {len(templates)}")
+
+    tempos = {modo: [] for modo in MODOS}
+    divergencias = 0
+    total_reais = 0
+
+    # ─── CASOS REAIS ─────────────────────────────────────────────────────────
+    print("\n[1] Casos reais (referência = modo normal)")
+    for nome_tela, frame in telas:
+        for nome, caminho in templates.items():
+            resultados = {}
+            for modo in MODOS:
+                deteccao, ms = medir(frame, caminho, modo)
+                resultados[modo] = deteccao
+                tempos[modo].append(ms)
+
+            total_reais += 1
+            normal, rapido = resultados["normal"], resultados["rapido"]
+            if normal["encontrado"] != rapido["encontrado"]:
+                divergencias += 1
+                print(f"   DIVERGENTE {nome_tela} / {nome}: normal={normal['score']:.2f} rapido={rapido['score']:.2f}")
+            elif normal["encontrado"]:
+                print(f"   OK {nome_tela} / {nome}: encontrado (normal={normal['score']:.2f} rapido={rapido['score']:.2f})")
+
+    print(f"   Concordância: {total_reais - divergencias}/{total_reais}")
+
+    # ─── CASOS SINTÉTICOS ────────────────────────────────────────────────────
+    print("\n[2] Casos sintéticos (template colado em posição conhecida)")
+    acertos = {modo: 0 for modo in MODOS}
+    total_sinteticos = 0
+
+    for nome_tela, frame in telas:
+        for nome, caminho in templates.items():
+            template = detector_tela.carregar_template(caminho)
+            sintetico, posicao = colar_template(frame, template)
+            if sintetico is None:
+                continue
+
+            total_sinteticos += 1
+            for modo in MODOS:
+                deteccao, ms = medir(sintetico, caminho, modo)
+                tempos[modo].append(ms)
+
+                if deteccao["encontrado"] and deteccao["posicao"]:
+                    x, y = deteccao["posicao"][:2]
+                    if abs(x - posicao[0]) <= TOLERANCIA_POSICAO and abs(y - posicao[1]) <= TOLERANCIA_POSICAO:
+                        acertos[modo] += 1
+
+    for modo in MODOS:
+        print(f"   {modo:>6}: {acertos[modo]}/{total_sinteticos} encontrados na posição correta")
+
+    # ─── LATÊNCIA ────────────────────────────────────────────────────────────
+    print("\n[3] Latência por detecção (ms)")
+    for modo in MODOS:
+        valores = sorted(tempos[modo])
+        if not valores:
+            continue
+        media = sum(valores) / len(valores)
+        mediana = valores[len(valores) // 2]
+        p95 = valores[min(len(valores) - 1, int(len(valores) * 0.95))]
+        print(f"   {modo:>6}: média={media:8.1f}  mediana={mediana:8.1f}  p95={p95:8.1f}")
+
+    print("\n" + "=" * 70)
+
+
+if __name__ == "__main__":
+    main()
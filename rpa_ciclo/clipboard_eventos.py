@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+clipboard_eventos.py
+====================
+Espera por MUDANÇA do clipboard em vez de delays fixos.
+
+O validador (Ctrl+C em cada campo) e a cópia da Bancada dormiam tempos
+fixos e liam o clipboard uma vez depois. A maioria das cópias termina em
+poucos ms, então o sleep fixo era espera desperdiçada em cada item.
+
+Aqui:
+- Windows: GetClipboardSequenceNumber (user32) - contador que o sistema
+  incrementa a cada escrita no clipboard. Ler o número é barato (não
+  copia o conteúdo), então dá para consultar a cada poucos ms
+- Outros sistemas / sem user32: compara o conteúdo (pyperclip.paste)
+
+Uso:
+    marca = marcar()
+    pyautogui.hotkey('ctrl', 'c')
+    if aguardar_mudanca(marca, timeout=0.3):
+        valor = pyperclip.paste()
+
+    valor = copiar_e_aguardar(lambda: pyautogui.hotkey('ctrl', 'c'), timeout=0.3)
+
+Data: 2026-10-18
+"""
+
+import sys
+import time
+
+try:
+    import pyperclip
+    PYPERCLIP_DISPONIVEL = True
+except ImportError:
+    PYPERCLIP_DISPONIVEL = False
+
+try:
+    import ctypes
+    _user32 = ctypes.windll.user32 if sys.platform == "win32" else None
+    SEQUENCIA_DISPONIVEL = _user32 is not None
+except (ImportError, AttributeError, OSError):
+    _user32 = None
+    SEQUENCIA_DISPONIVEL = False
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+# Intervalo entre consultas (s): número de sequência é barato, conteúdo não
+INTERVALO_SEQUENCIA = 0.005
+INTERVALO_CONTEUDO = 0.02
+
+# ============================================================================
+# PRIMITIVAS
+# ============================================================================
+
+def numero_sequencia():
+    """Número de sequência do clipboard (None se o sistema não fornecer)"""
+    if _user32 is None:
+        return None
+    try:
+        return _user32.GetClipboardSequenceNumber()
+    except Exception:
+        return None
+
+
+def ler():
+    """Conteúdo do clipboard ("" se vazio ou indisponível)"""
+    if not PYPERCLIP_DISPONIVEL:
+        return ""
+    try:
+        return pyperclip.paste() or ""
+    except Exception:
+        return ""
+
+
+class MarcaClipboard:
+    """Estado do clipboard num instante (número de sequência ou conteúdo)"""
+
+    def __init__(self):
+        self.sequencia = numero_sequencia()
+        # Sem número de sequência, a única referência é o conteúdo
+        self.conteudo = ler() if self.sequencia is None else None
+
+    def mudou(self):
+        if self.sequencia is not None:
+            atual = numero_sequencia()
+            return atual is not None and atual != self.sequencia
+        return ler() != self.conteudo
+
+    @property
+    def intervalo(self):
+        return INTERVALO_SEQUENCIA if self.sequencia is not None else INTERVALO_CONTEUDO
+
+
+def marcar():
+    """Marca o estado atual - chamar ANTES da ação que copia"""
+    return MarcaClipboard()
+
+
+def aguardar_mudanca(marca, timeout, parar=None, intervalo=None):
+    """
+    Espera o clipboard mudar em relação à marca.
+
+    Args:
+        marca: MarcaClipboard (de marcar()) tirada antes da cópia
+        timeout: Espera máxima (segundos)
+        parar: Função opcional -> True para abortar (ex: RPA parado)
+        intervalo: Intervalo entre consultas (None = padrão da marca). Para
+                   conteúdos grandes sem número de sequência, usar um
+                   intervalo maior (cada consulta copia o texto inteiro)
+
+    Returns:
+        bool: True assim que houver mudança, False no timeout/abortado
+    """
+    limite = time.time() + timeout
+    while True:
+        if marca.mudou():
+            return True
+        if time.time() >= limite or (parar is not None and parar()):
+            return False
+        time.sleep(intervalo or marca.intervalo)
+
+
+def copiar_e_aguardar(acao, timeout, parar=None):
+    """
+    Executa a ação de cópia e devolve o clipboard assim que ele mudar.
+
+    Args:
+        acao: Função que dispara a cópia (ex: lambda: pyautogui.hotkey('ctrl', 'c'))
+        timeout: Espera máxima pela mudança (segundos)
+        parar: Função opcional -> True para abortar
+
+    Returns:
+        str: Conteúdo copiado (strip) ou "" se o clipboard não mudou
+
+    Sem número de sequência a mudança é detectada pelo conteúdo: limpe o
+    clipboard antes (pyperclip.copy("")) para que copiar o mesmo valor
+    que já estava lá também seja percebido.
+    """
+    limite = time.time() + timeout
+    marca = marcar()
+    acao()
+    if not aguardar_mudanca(marca, timeout, parar):
+        return ""
+
+    # O número muda já no EmptyClipboard de quem copia; o texto pode chegar
+    # alguns ms depois
+    valor = ler().strip()
+    while not valor and time.time() < limite:
+        time.sleep(INTERVALO_CONTEUDO)
+        valor = ler().strip()
+    return valor
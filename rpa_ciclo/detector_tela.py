@@ -0,0 +1,1255 @@
+# -*- coding: utf-8 -*-
+"""
+detector_tela.py
+================
+Detector de telas do Oracle com CAPTURA ÚNICA por verificação.
+
+Antes, cada verificação (queda de rede, erro de produto, modal de quantidade
+negativa, timeout do Oracle, tela de transferência) fazia o seu próprio
+ImageGrab.grab() + conversão de cor dentro de um loop de timeout. Por item
+isso somava dezenas de capturas de tela inteira.
+
+Aqui a tela é capturada UMA vez e todos os templates registrados são
+comparados contra o mesmo frame, retornando scores e posições de cada um.
+As funções de verificação do main_ciclo.py passam a ser simples consultas
+nesse resultado.
+
+Uso:
+    resultado = analisar_tela()
+    if resultado.encontrado("queda_rede"):
+        ...
+
+Data: 2026-10-18
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from collections import deque, namedtuple
+
+try:
+    import cv2
+    import numpy as np
+    from PIL import ImageGrab
+    OPENCV_DISPONIVEL = True
+except ImportError:
+    OPENCV_DISPONIVEL = False
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+# Templates registrados: nome lógico -> arquivo em informacoes/
+TEMPLATES_TELA = {
+    "qtd_negativa": "qtd_negativa.png",
+    "erro_produto": "ErroProduto.png",
+    "queda_rede": "queda_rede.png",
+    "tempo_oracle": "tempo_oracle.png",
+    "tela_transferencia": "tela_transferencia_subinventory.png",
+}
+
+# Confiança mínima padrão (igual ao detectar_imagem_opencv)
+CONFIDENCE_PADRAO = 0.8
+
+# Confiança específica por template (quando diferente do padrão)
+CONFIDENCE_TEMPLATES = {
+    "qtd_negativa": 0.75,  # mesma confiança de verificar_modal_qtd_negativa
+    "erro_produto": 0.8,
+    "queda_rede": 0.8,
+    "tempo_oracle": 0.8,
+    "tela_transferencia": 0.8,
+}
+
+# Escalas testadas quando o match em 1.0 falha
+ESCALAS_MULTI = [0.7, 0.8, 0.9, 1.0, 1.1, 1.2]
+
+# Intervalo entre capturas nos loops de espera (segundos)
+INTERVALO_CAPTURA = 0.3
+
+# Modo de matching: "normal" (BGR em resolução cheia) ou "rapido"
+# (tons de cinza reduzido para achar candidatos + confirmação em resolução cheia)
+MODO_MATCHING = "normal"
+
+# Modo rápido: fator de redução do frame/template na busca grossa
+FATOR_REDUCAO = 0.25
+
+# Modo rápido: quantos picos da busca grossa são confirmados em resolução cheia
+TOP_K_PICOS = 3
+
+# Modo rápido: confiança mínima de um pico na busca grossa para ser confirmado
+CONFIDENCE_GROSSA = 0.4
+
+# Modo rápido: menor lado (pixels) do template reduzido - abaixo disso a
+# variante é comparada direto em resolução cheia
+MIN_LADO_REDUZIDO = 8
+
+# Impressão digital do frame: tamanho da miniatura em cinza e quantização
+# (bits descartados) - tela igual = mesma impressão = reaproveita resultado
+TAMANHO_IMPRESSAO = (64, 36)
+BITS_DESCARTADOS_IMPRESSAO = 2
+
+# Confirmação exata antes de reaproveitar: o frame reduzido (FATOR_REDUCAO,
+# cinza) é comparado com o da impressão guardada. Mais que
+# PIXELS_DIFERENTES_MAX pixels com diferença > DIFERENCA_PIXEL_MINIMA = tela
+# mudou (um modal pequeno pode ter a mesma miniatura 64x36; o cursor
+# piscando num campo muda só uns poucos pixels)
+DIFERENCA_PIXEL_MINIMA = 16
+PIXELS_DIFERENTES_MAX = 16
+
+# Regiões de busca por template: nome do arquivo -> (x, y, largura, altura)
+# Preenchidas via configurar_deteccao() a partir do config.json
+REGIOES_TEMPLATES = {}
+
+# Margem (pixels) da janela em volta do último acerto de cada template
+MARGEM_ULTIMO_ACERTO = 40
+
+# Último acerto de cada template: caminho -> (x, y, largura, altura)
+_ultimos_acertos = {}
+
+# Escala vencedora de cada template por resolução (persistida em JSON):
+# "ErroProduto.png@1920x1080" -> 0.9. A escala aprendida é tentada primeiro;
+# a varredura completa só acontece quando ela deixa de bater.
+ARQUIVO_ESCALAS = "escalas_aprendidas.json"
+_escalas_aprendidas = {}
+_caminho_escalas = None  # definido em configurar_deteccao()
+_lock_escalas = threading.Lock()
+
+# Executor remoto da análise (pool_visao): função (frame, nomes) -> deteccoes
+# ou None para analisar aqui mesmo. None = sempre local
+_executor_remoto = None
+
+# ============================================================================
+# FUNÇÕES AUXILIARES
+# ============================================================================
+
+def gui_log(mensagem):
+    """Log compatível com GUI (pode ser substituído externamente)"""
+    print(mensagem)
+
+
+def configurar_deteccao(config, pasta_base=None):
+    """
+    Aplica as configurações de "deteccao_imagens" do config.json.
+
+    Formato:
+        "deteccao_imagens": {
+            "regioes": {"qtd_negativa.png": [x, y, largura, altura], ...},
+            "margem_ultimo_acerto": 40,
+            "modo": "normal",  # ou "rapido"
+            "arquivo_escalas": "escalas_aprendidas.json"
+        }
+
+    Args:
+        config: Dicionário completo do config.json
+        pasta_base: Pasta do arquivo de escalas aprendidas (ex: pasta do .exe).
+                    Se None, as escalas aprendidas ficam só em memória
+    """
+    global MARGEM_ULTIMO_ACERTO, MODO_MATCHING
+
+    deteccao = config.get("deteccao_imagens", {}) if config else {}
+
+    REGIOES_TEMPLATES.clear()
+    for nome_arquivo, regiao in deteccao.get("regioes", {}).items():
+        if isinstance(regiao, (list, tuple)) and len(regiao) == 4:
+            REGIOES_TEMPLATES[nome_arquivo] = tuple(int(v) for v in regiao)
+
+    MARGEM_ULTIMO_ACERTO = int(deteccao.get("margem_ultimo_acerto", MARGEM_ULTIMO_ACERTO))
+    MODO_MATCHING = deteccao.get("modo", MODO_MATCHING)
+    _ultimos_acertos.clear()
+
+    if pasta_base is not None:
+        carregar_escalas(os.path.join(str(pasta_base), deteccao.get("arquivo_escalas", ARQUIVO_ESCALAS)))
+
+
+# ============================================================================
+# ESCALAS APRENDIDAS (PERSISTIDAS ENTRE EXECUÇÕES)
+# ============================================================================
+
+def _chave_escala(caminho, screen_w, screen_h):
+    return f"{os.path.basename(caminho)}@{screen_w}x{screen_h}"
+
+
+def carregar_escalas(caminho_arquivo, somente_leitura=False):
+    """
+    Lê as escalas aprendidas de um JSON e passa a gravar as novas nele.
+
+    Args:
+        caminho_arquivo: Caminho do JSON (criado no primeiro aprendizado)
+        somente_leitura: True -> só lê; as novas ficam em memória (processos
+                         do pool_visao: quem grava é o processo principal)
+
+    Returns:
+        int: Quantidade de escalas carregadas
+    """
+    global _caminho_escalas
+
+    escalas = {}
+    if os.path.isfile(caminho_arquivo):
+        try:
+            with open(caminho_arquivo, "r", encoding="utf-8") as f:
+                escalas = {k: float(v) for k, v in json.load(f).get("escalas", {}).items()}
+        except (OSError, ValueError, AttributeError) as e:
+            gui_log(f"⚠️ [DETECTOR] Arquivo de escalas inválido ({e}) - será recriado")
+
+    with _lock_escalas:
+        _caminho_escalas = None if somente_leitura else caminho_arquivo
+        _escalas_aprendidas.clear()
+        _escalas_aprendidas.update(escalas)
+
+    return len(escalas)
+
+
+def escala_aprendida(caminho, screen_w, screen_h):
+    """Escala vencedora registrada para o template nessa resolução (ou None)"""
+    with _lock_escalas:
+        return _escalas_aprendidas.get(_chave_escala(caminho, screen_w, screen_h))
+
+
+def _aprender_escala(caminho, screen_w, screen_h, escala):
+    """Registra a escala vencedora e grava o JSON (só quando muda)"""
+    chave = _chave_escala(caminho, screen_w, screen_h)
+
+    with _lock_escalas:
+        if _escalas_aprendidas.get(chave) == escala:
+            return
+        _escalas_aprendidas[chave] = escala
+        if not _caminho_escalas:
+            return
+
+        try:
+            temp = _caminho_escalas + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump({"escalas": _escalas_aprendidas}, f, indent=2, sort_keys=True)
+            os.replace(temp, _caminho_escalas)
+        except OSError as e:
+            gui_log(f"⚠️ [DETECTOR] Não foi possível gravar escalas aprendidas: {e}")
+
+
+def caminho_template(nome_arquivo):
+    """
+    Resolve o caminho de um template (compatível com .exe e script Python).
+
+    Procura primeiro em informacoes/ e depois na raiz (o build copia as
+    imagens de erro para os dois lugares).
+
+    Args:
+        nome_arquivo: Nome do arquivo (ex: "qtd_negativa.png")
+
+    Returns:
+        str: Caminho completo da imagem ou None se não encontrado
+    """
+    base = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+
+    for caminho in (os.path.join(base, "informacoes", nome_arquivo), os.path.join(base, nome_arquivo)):
+        if os.path.isfile(caminho):
+            return caminho
+
+    return None
+
+
+def capturar_tela():
+    """
+    Captura a tela inteira UMA vez e converte para BGR (formato do OpenCV).
+
+    Returns:
+        numpy.ndarray: Frame BGR da tela
+    """
+    screenshot = ImageGrab.grab()
+    return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+
+
+# ============================================================================
+# CACHE DE TEMPLATES (PROCESSO INTEIRO)
+# ============================================================================
+# Cada PNG é lido UMA vez (chave: caminho + mtime) e as variantes de escala
+# são pré-calculadas para a resolução atual da tela. Assim as tentativas
+# dentro do timeout não repetem cv2.imread nem cv2.resize.
+
+_cache_templates = {}   # caminho -> (mtime, template_bgr)
+_cache_variantes = {}   # (caminho, mtime, screen_w, screen_h) -> variantes
+_lock_cache = threading.Lock()
+
+
+def carregar_template(caminho):
+    """
+    Retorna o template (BGR) do cache, relendo o arquivo só se o mtime mudou.
+
+    Args:
+        caminho: Caminho da imagem
+
+    Returns:
+        numpy.ndarray: Template BGR ou None se não puder ser lido
+    """
+    try:
+        mtime = os.path.getmtime(caminho)
+    except OSError:
+        return None
+
+    with _lock_cache:
+        em_cache = _cache_templates.get(caminho)
+        if em_cache is not None and em_cache[0] == mtime:
+            return em_cache[1]
+
+    template = cv2.imread(caminho)
+    if template is None:
+        return None
+
+    with _lock_cache:
+        _cache_templates[caminho] = (mtime, template)
+
+    return template
+
+
+def calcular_variantes(template_bgr, screen_w, screen_h):
+    """
+    Pré-calcula as variantes de escala de um template para uma resolução.
+
+    Args:
+        template_bgr: Template original (BGR)
+        screen_w, screen_h: Dimensões da tela
+
+    Returns:
+        dict: {"base": (escala, array), "escalas": [(escala, array), ...]}
+    """
+    template_h, template_w = template_bgr.shape[:2]
+
+    # Template maior que a tela: redimensionar para caber
+    if template_w > screen_w or template_h > screen_h:
+        escala_base = min(screen_w / template_w, screen_h / template_h) * 0.95
+        template_base = cv2.resize(template_bgr, (int(template_w * escala_base), int(template_h * escala_base)))
+    else:
+        escala_base = 1.0
+        template_base = template_bgr
+
+    escalas = []
+    if template_w != screen_w or template_h != screen_h:
+        for escala in ESCALAS_MULTI:
+            new_w = int(template_w * escala)
+            new_h = int(template_h * escala)
+
+            # Pular se ficar maior que a tela
+            if new_w > screen_w or new_h > screen_h:
+                continue
+
+            escalas.append((escala, template_bgr if escala == 1.0 else cv2.resize(template_bgr, (new_w, new_h))))
+
+    # Versões em cinza reduzidas (modo rápido) - mesma ordem de [base] + escalas
+    reduzidas = []
+    for _, variante in [(escala_base, template_base)] + escalas:
+        h, w = variante.shape[:2]
+        red_w, red_h = int(w * FATOR_REDUCAO), int(h * FATOR_REDUCAO)
+        if min(red_w, red_h) < MIN_LADO_REDUZIDO:
+            reduzidas.append(None)
+        else:
+            cinza = cv2.cvtColor(variante, cv2.COLOR_BGR2GRAY)
+            reduzidas.append(cv2.resize(cinza, (red_w, red_h), interpolation=cv2.INTER_AREA))
+
+    return {"base": (escala_base, template_base), "escalas": escalas, "reduzidas": reduzidas}
+
+
+def obter_variantes(caminho, screen_w, screen_h):
+    """
+    Variantes de escala de um template (cacheadas por caminho, mtime e resolução).
+
+    Returns:
+        dict: Mesmo formato de calcular_variantes() ou None se o arquivo não existir
+    """
+    template = carregar_template(caminho)
+    if template is None:
+        return None
+
+    with _lock_cache:
+        em_cache = _cache_templates.get(caminho)
+        mtime = em_cache[0] if em_cache is not None else None
+        chave = (caminho, mtime, screen_w, screen_h)
+        variantes = _cache_variantes.get(chave)
+    if variantes is not None:
+        return variantes
+
+    variantes = calcular_variantes(template, screen_w, screen_h)
+    if mtime is None:
+        # limpar_cache_templates() rodou depois do carregar_template(): não cachear
+        return variantes
+
+    with _lock_cache:
+        # Descartar variantes de versões antigas do mesmo arquivo
+        for antiga in [c for c in _cache_variantes if c[0] == caminho and c[1] != mtime]:
+            del _cache_variantes[antiga]
+        _cache_variantes[chave] = variantes
+
+    return variantes
+
+
+def precarregar_templates(pasta=None, screen_w=None, screen_h=None):
+    """
+    Lê todos os PNGs de informacoes/ para o cache (chamar no início do RPA).
+
+    Args:
+        pasta: Pasta dos templates (padrão: informacoes/ ao lado do módulo)
+        screen_w, screen_h: Resolução para pré-calcular as escalas
+                            (opcional - se None, só carrega os arquivos)
+
+    Returns:
+        int: Quantidade de templates carregados
+    """
+    if not OPENCV_DISPONIVEL:
+        return 0
+
+    if pasta is None:
+        base = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+        pasta = os.path.join(base, "informacoes")
+
+    if not os.path.isdir(pasta):
+        return 0
+
+    total = 0
+    for nome_arquivo in sorted(os.listdir(pasta)):
+        if not nome_arquivo.lower().endswith(".png"):
+            continue
+
+        caminho = os.path.join(pasta, nome_arquivo)
+        if screen_w and screen_h:
+            carregado = obter_variantes(caminho, screen_w, screen_h) is not None
+        else:
+            carregado = carregar_template(caminho) is not None
+
+        if carregado:
+            total += 1
+
+    return total
+
+
+def limpar_cache_templates():
+    """Esvazia o cache de templates (força releitura dos arquivos)"""
+    with _lock_cache:
+        _cache_templates.clear()
+        _cache_variantes.clear()
+
+
+# ============================================================================
+# IMPRESSÃO DIGITAL DO FRAME (TELA NÃO MUDOU = NÃO COMPARA DE NOVO)
+# ============================================================================
+# Todas as verificações passam por localizar_no_frame(), então o cache de
+# resultados é compartilhado: se a tela não mudou desde a última comparação
+# de um template, o resultado anterior é devolvido sem novo matchTemplate.
+#
+# O estado é POR THREAD: a thread de automação e a do MonitorTela analisam
+# frames diferentes e, com um cache só, uma sobrescrevia o da outra a cada
+# frame (quase nunca havia reaproveitamento, e as duas mexiam nos mesmos
+# globais sem lock).
+
+
+class _EstadoThread(threading.local):
+    """Último frame/impressão e resultados reaproveitáveis da thread atual"""
+
+    def __init__(self):
+        self.ultima_impressao = (None, None)   # (frame original, impressão)
+        self.ultimo_reduzido = (None, None)    # (frame original, frame cinza reduzido)
+        self.impressao_resultados = None       # impressão dos resultados guardados
+        self.reduzido_resultados = None        # frame reduzido dos resultados guardados
+        self.frame_confirmado = None           # último frame já confirmado igual
+        self.resultados = {}                   # (caminho, confidence, modo) -> deteccao
+
+
+_estado = _EstadoThread()
+_lock_estatisticas = threading.Lock()
+
+ESTATISTICAS = {"comparados": 0, "reaproveitados": 0, "colisoes": 0}
+
+
+def _contar(chave):
+    with _lock_estatisticas:
+        ESTATISTICAS[chave] += 1
+
+
+def impressao_frame(frame_bgr):
+    """
+    Impressão digital barata do frame: miniatura em cinza quantizada + hash.
+
+    Args:
+        frame_bgr: Frame da tela (BGR)
+
+    Returns:
+        str: Hash da miniatura (igual para telas visualmente iguais)
+    """
+    original, impressao = _estado.ultima_impressao
+    if original is frame_bgr:
+        return impressao
+
+    cinza = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+    miniatura = cv2.resize(cinza, TAMANHO_IMPRESSAO, interpolation=cv2.INTER_AREA)
+    miniatura = miniatura >> BITS_DESCARTADOS_IMPRESSAO
+
+    impressao = hashlib.md5(miniatura.tobytes()).hexdigest()
+    _estado.ultima_impressao = (frame_bgr, impressao)
+    return impressao
+
+
+def mesma_tela(reduzido_a, reduzido_b):
+    """Confirmação exata (frames reduzidos) de que a tela não mudou"""
+    if reduzido_a is None or reduzido_b is None or reduzido_a.shape != reduzido_b.shape:
+        return False
+    diferentes = np.count_nonzero(cv2.absdiff(reduzido_a, reduzido_b) > DIFERENCA_PIXEL_MINIMA)
+    return diferentes <= PIXELS_DIFERENTES_MAX
+
+
+def _resultado_em_cache(frame_bgr, impressao, chave):
+    """Resultado anterior do template se a tela não mudou (ou None)"""
+    if impressao == _estado.impressao_resultados:
+        if frame_bgr is _estado.frame_confirmado:
+            return _estado.resultados.get(chave)
+        # Mesma impressão: confirmar nos frames reduzidos antes de reaproveitar
+        if mesma_tela(reduzir_frame(frame_bgr), _estado.reduzido_resultados):
+            _estado.frame_confirmado = frame_bgr
+            return _estado.resultados.get(chave)
+        _contar("colisoes")
+
+    # Tela mudou: resultados antigos não valem mais
+    _estado.resultados.clear()
+    _estado.impressao_resultados = impressao
+    _estado.reduzido_resultados = reduzir_frame(frame_bgr)
+    _estado.frame_confirmado = frame_bgr
+    return None
+
+
+def _guardar_resultado(impressao, chave, deteccao):
+    if impressao == _estado.impressao_resultados:
+        _estado.resultados[chave] = deteccao
+
+
+def limpar_cache_resultados():
+    """Descarta os resultados reaproveitáveis da thread atual (força nova comparação)"""
+    _estado.resultados.clear()
+    _estado.impressao_resultados = None
+    _estado.reduzido_resultados = None
+    _estado.frame_confirmado = None
+
+
+# ============================================================================
+# TEMPLATE MATCHING
+# ============================================================================
+
+def reduzir_frame(frame_bgr):
+    """
+    Frame em tons de cinza reduzido por FATOR_REDUCAO (modo rápido).
+    Guarda o último resultado (por thread): vários templates no mesmo frame
+    reduzem uma vez só.
+    """
+    original, reduzido = _estado.ultimo_reduzido
+    if original is frame_bgr:
+        return reduzido
+
+    screen_h, screen_w = frame_bgr.shape[:2]
+    cinza = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+    reduzido = cv2.resize(cinza, (int(screen_w * FATOR_REDUCAO), int(screen_h * FATOR_REDUCAO)),
+                          interpolation=cv2.INTER_AREA)
+    _estado.ultimo_reduzido = (frame_bgr, reduzido)
+    return reduzido
+
+
+def _picos_candidatos(resultado, quantidade, largura, altura):
+    """
+    Maiores picos de um mapa de matchTemplate, suprimindo a vizinhança de
+    cada pico escolhido (para não repetir o mesmo lugar).
+
+    Returns:
+        list: [(score, (x, y)), ...] do maior para o menor
+    """
+    mapa = resultado.copy()
+    picos = []
+
+    for _ in range(quantidade):
+        _, max_val, _, max_loc = cv2.minMaxLoc(mapa)
+        if max_val < CONFIDENCE_GROSSA:
+            break
+
+        picos.append((max_val, max_loc))
+
+        x, y = max_loc
+        mapa[max(0, y - altura // 2):y + altura // 2 + 1, max(0, x - largura // 2):x + largura // 2 + 1] = -1.0
+
+    return picos
+
+
+def _confirmar_rapido(area, area_reduzida, template_test, template_reduzido):
+    """
+    Busca grossa no frame reduzido + confirmação dos melhores picos em
+    resolução cheia (mesmo TM_CCOEFF_NORMED e mesmos thresholds).
+
+    Returns:
+        tuple: (score, (x, y)) em coordenadas da área
+    """
+    red_h, red_w = template_reduzido.shape[:2]
+    if red_w > area_reduzida.shape[1] or red_h > area_reduzida.shape[0]:
+        return -1.0, (0, 0)
+
+    resultado = cv2.matchTemplate(area_reduzida, template_reduzido, cv2.TM_CCOEFF_NORMED)
+
+    area_h, area_w = area.shape[:2]
+    new_h, new_w = template_test.shape[:2]
+    folga = int(round(1 / FATOR_REDUCAO)) + 2
+
+    melhor_score, melhor_loc = -1.0, (0, 0)
+
+    for _, (x_red, y_red) in _picos_candidatos(resultado, TOP_K_PICOS, red_w, red_h):
+        # Janela em resolução cheia em volta do pico
+        x = int(x_red / FATOR_REDUCAO)
+        y = int(y_red / FATOR_REDUCAO)
+        x0, y0 = max(0, x - folga), max(0, y - folga)
+        x1, y1 = min(area_w, x + new_w + folga), min(area_h, y + new_h + folga)
+
+        janela = area[y0:y1, x0:x1]
+        if janela.shape[1] < new_w or janela.shape[0] < new_h:
+            continue
+
+        result_fino = cv2.matchTemplate(janela, template_test, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result_fino)
+
+        if max_val > melhor_score:
+            melhor_score, melhor_loc = max_val, (max_loc[0] + x0, max_loc[1] + y0)
+
+    return melhor_score, melhor_loc
+
+
+def localizar_template(frame_bgr, template_bgr, confidence=CONFIDENCE_PADRAO, variantes=None, regiao=None, modo=None,
+                       escala_preferida=None, multi_escala=True):
+    """
+    Procura um template em um frame já capturado (MULTI-ESCALA).
+
+    Mesma estratégia do detectar_imagem_opencv:
+    1. Se o template for maior que a tela, reduz para caber
+    2. Tenta a escala preferida (aprendida), se houver
+    3. Tenta na escala 1.0
+    4. Se falhar, tenta as escalas de ESCALAS_MULTI
+
+    Args:
+        frame_bgr: Frame da tela (BGR)
+        template_bgr: Template a procurar (BGR)
+        confidence: Confiança mínima (0.0 a 1.0)
+        variantes: Variantes pré-calculadas (obter_variantes). Se None,
+                   calcula na hora (sem cache)
+        regiao: (x, y, largura, altura) para procurar só nesse recorte
+                da tela (None = tela inteira)
+        modo: "normal" ou "rapido" (None = MODO_MATCHING)
+        escala_preferida: Escala tentada antes das demais (None = ordem normal)
+        multi_escala: False -> só a escala base (1.0, ou reduzida para caber
+                      na tela), como o pyautogui.locateOnScreen
+
+    Returns:
+        dict: {"encontrado": bool, "score": float,
+               "posicao": (x, y, largura, altura), "escala": float}
+               (posição sempre em coordenadas da tela)
+    """
+    if modo is None:
+        modo = MODO_MATCHING
+
+    screen_h, screen_w = frame_bgr.shape[:2]
+
+    if variantes is None:
+        variantes = calcular_variantes(template_bgr, screen_w, screen_h)
+
+    # Recortar a região de busca (limitada às bordas da tela)
+    offset_x, offset_y = 0, 0
+    area = frame_bgr
+    if regiao is not None:
+        x, y, largura, altura = regiao
+        offset_x, offset_y = max(0, int(x)), max(0, int(y))
+        x_fim, y_fim = min(screen_w, int(x + largura)), min(screen_h, int(y + altura))
+        area = frame_bgr[offset_y:y_fim, offset_x:x_fim]
+
+    area_h, area_w = area.shape[:2]
+
+    area_reduzida = None
+    if modo == "rapido":
+        frame_reduzido = reduzir_frame(frame_bgr)
+        area_reduzida = frame_reduzido[int(offset_y * FATOR_REDUCAO):int((offset_y + area_h) * FATOR_REDUCAO),
+                                       int(offset_x * FATOR_REDUCAO):int((offset_x + area_w) * FATOR_REDUCAO)]
+
+    melhor = {"encontrado": False, "score": 0.0, "posicao": None, "escala": variantes["base"][0]}
+
+    # Escala base primeiro, depois multi-escala (variantes já redimensionadas)
+    candidatos = list(enumerate([variantes["base"]] + (variantes["escalas"] if multi_escala else [])))
+
+    # Escala aprendida na frente (a mesma escala não é testada duas vezes)
+    if escala_preferida is not None:
+        preferidos = [c for c in candidatos if c[1][0] == escala_preferida][:1]
+        if preferidos:
+            candidatos = preferidos + [c for c in candidatos if c[1][0] != escala_preferida]
+
+    for indice, (escala, template_test) in candidatos:
+        new_h, new_w = template_test.shape[:2]
+
+        # Pular variantes maiores que a região de busca
+        if new_w > area_w or new_h > area_h:
+            continue
+
+        template_reduzido = variantes["reduzidas"][indice] if area_reduzida is not None else None
+
+        if template_reduzido is not None:
+            max_val_test, max_loc_test = _confirmar_rapido(area, area_reduzida, template_test, template_reduzido)
+        else:
+            result_test = cv2.matchTemplate(area, template_test, cv2.TM_CCOEFF_NORMED)
+            _, max_val_test, _, max_loc_test = cv2.minMaxLoc(result_test)
+
+        if melhor["posicao"] is None or max_val_test > melhor["score"]:
+            melhor = {
+                "encontrado": max_val_test >= confidence,
+                "score": float(max_val_test),
+                "posicao": (max_loc_test[0] + offset_x, max_loc_test[1] + offset_y, new_w, new_h),
+                "escala": escala,
+            }
+
+        if max_val_test >= confidence:
+            return melhor
+
+    return melhor
+
+
+def localizar_no_frame(frame_bgr, caminho, confidence=CONFIDENCE_PADRAO, modo=None, multi_escala=True):
+    """
+    Procura um template (por caminho) usando as dicas de localização.
+
+    Se a tela não mudou (mesma impressao_frame, confirmada com mesma_tela)
+    desde a última comparação deste template nesta thread, devolve o
+    resultado anterior sem comparar de novo.
+
+    Ordem de busca:
+    1. Janela em volta do último acerto deste template (MARGEM_ULTIMO_ACERTO)
+    2. Região configurada em REGIOES_TEMPLATES (se existir)
+    3. Tela inteira (só quando NÃO há região configurada)
+
+    Com multi_escala=False nenhuma dica é usada: tela inteira, só a escala
+    base, sem último acerto, região ou escala aprendida (e sem aprender).
+
+    Args:
+        frame_bgr: Frame da tela (BGR)
+        caminho: Caminho do template
+        confidence: Confiança mínima (0.0 a 1.0)
+        modo: "normal" ou "rapido" (None = MODO_MATCHING)
+        multi_escala: True -> escalas de ESCALAS_MULTI + dicas de localização
+
+    Returns:
+        dict: Mesmo formato de localizar_template() ou None se o template
+              não puder ser lido
+    """
+    screen_h, screen_w = frame_bgr.shape[:2]
+    variantes = obter_variantes(caminho, screen_w, screen_h)
+    if variantes is None:
+        return None
+
+    impressao = impressao_frame(frame_bgr)
+    chave = (caminho, confidence, modo or MODO_MATCHING, multi_escala)
+    deteccao = _resultado_em_cache(frame_bgr, impressao, chave)
+    if deteccao is not None:
+        _contar("reaproveitados")
+        return deteccao
+
+    _contar("comparados")
+
+    if not multi_escala:
+        deteccao = localizar_template(frame_bgr, None, confidence, variantes, modo=modo, multi_escala=False)
+        _guardar_resultado(impressao, chave, deteccao)
+        return deteccao
+
+    nome_arquivo = os.path.basename(caminho)
+    regiao_config = REGIOES_TEMPLATES.get(nome_arquivo)
+    escala_preferida = escala_aprendida(caminho, screen_w, screen_h)
+
+    # 1. Janela do último acerto
+    ultimo = _ultimos_acertos.get(caminho)
+    if ultimo is not None:
+        x, y, largura, altura = ultimo
+        margem = MARGEM_ULTIMO_ACERTO
+        janela = (x - margem, y - margem, largura + 2 * margem, altura + 2 * margem)
+        deteccao = localizar_template(frame_bgr, None, confidence, variantes, regiao=janela, modo=modo,
+                                      escala_preferida=escala_preferida)
+        if deteccao["encontrado"]:
+            _guardar_resultado(impressao, chave, deteccao)
+            return deteccao
+
+    # 2/3. Região configurada ou tela inteira
+    deteccao = localizar_template(frame_bgr, None, confidence, variantes, regiao=regiao_config, modo=modo,
+                                  escala_preferida=escala_preferida)
+
+    if deteccao["encontrado"]:
+        _ultimos_acertos[caminho] = deteccao["posicao"]
+        _aprender_escala(caminho, screen_w, screen_h, deteccao["escala"])
+
+    _guardar_resultado(impressao, chave, deteccao)
+    return deteccao
+
+
+# ============================================================================
+# API COMUM (SUBSTITUI pyautogui.locateOnScreen)
+# ============================================================================
+
+# Mesmos campos do Box do pyautogui/pyscreeze
+Regiao = namedtuple("Regiao", "left top width height")
+
+
+def localizar_na_tela(caminho, confidence=CONFIDENCE_PADRAO, frame=None, multi_escala=False):
+    """
+    Procura uma imagem na tela - substituto de pyautogui.locateOnScreen().
+
+    Usa o cache de templates e o reaproveitamento por impressão digital,
+    em vez de reler o arquivo e capturar a tela pelo pyscreeze a cada
+    chamada. Por padrão procura como o locateOnScreen (tela inteira,
+    escala 1.0); multi-escala e as dicas de localização (regiões, último
+    acerto, escala aprendida) só com multi_escala=True.
+
+    Args:
+        caminho: Caminho da imagem
+        confidence: Confiança mínima (0.0 a 1.0)
+        frame: Frame BGR já capturado (opcional - se None, captura agora)
+        multi_escala: True -> localizar_no_frame com ESCALAS_MULTI e dicas
+
+    Returns:
+        Regiao(left, top, width, height) ou None se não encontrou
+    """
+    if not OPENCV_DISPONIVEL or not os.path.isfile(caminho):
+        return None
+
+    if frame is None:
+        frame = capturar_tela()
+
+    deteccao = localizar_no_frame(frame, caminho, confidence, multi_escala=multi_escala)
+    if deteccao is None or not deteccao["encontrado"]:
+        return None
+
+    return Regiao(*deteccao["posicao"])
+
+
+# ============================================================================
+# RESULTADO DA ANÁLISE
+# ============================================================================
+
+class ResultadoTela:
+    """Resultado de UMA captura comparada contra vários templates"""
+
+    def __init__(self, deteccoes, timestamp, dimensoes, frame=None):
+        self.deteccoes = deteccoes  # nome -> dict de localizar_template
+        self.timestamp = timestamp
+        self.dimensoes = dimensoes  # (largura, altura) da tela
+        self.frame = frame  # Frame BGR analisado (para salvar debug)
+
+    def encontrado(self, nome):
+        """True se o template foi detectado neste frame"""
+        return self.deteccoes.get(nome, {}).get("encontrado", False)
+
+    def score(self, nome):
+        """Score do template neste frame (0.0 se não analisado)"""
+        return self.deteccoes.get(nome, {}).get("score", 0.0)
+
+    def posicao(self, nome):
+        """Posição (x, y, largura, altura) do template ou None"""
+        deteccao = self.deteccoes.get(nome, {})
+        return deteccao.get("posicao") if deteccao.get("encontrado") else None
+
+    def encontrados(self):
+        """Lista de templates detectados neste frame"""
+        return [nome for nome, d in self.deteccoes.items() if d.get("encontrado")]
+
+    def __repr__(self):
+        scores = ", ".join(f"{nome}={d.get('score', 0.0):.2f}" for nome, d in self.deteccoes.items())
+        return f"ResultadoTela({scores})"
+
+
+def analisar_tela(nomes=None, frame=None):
+    """
+    Captura a tela UMA vez e compara todos os templates pedidos.
+
+    Args:
+        nomes: Lista de templates (chaves de TEMPLATES_TELA). None = todos
+        frame: Frame BGR já capturado (opcional - se None, captura agora)
+
+    Returns:
+        ResultadoTela: Scores e posições de cada template
+    """
+    if nomes is None:
+        nomes = list(TEMPLATES_TELA.keys())
+
+    if not OPENCV_DISPONIVEL:
+        return ResultadoTela({}, time.time(), (0, 0))
+
+    # Instante da captura (não do fim da análise) - usado por MonitorTela.aguardar
+    instante = time.time()
+    if frame is None:
+        frame = capturar_tela()
+
+    screen_h, screen_w = frame.shape[:2]
+
+    if _executor_remoto is not None:
+        deteccoes = _executor_remoto(frame, nomes)
+        if deteccoes is not None:
+            # Os processos do pool não gravam o JSON: a escala vencedora é
+            # registrada (e persistida) aqui
+            for nome, deteccao in deteccoes.items():
+                caminho = caminho_template(TEMPLATES_TELA[nome]) if deteccao.get("encontrado") else None
+                if caminho is not None:
+                    _aprender_escala(caminho, screen_w, screen_h, deteccao["escala"])
+            return ResultadoTela(deteccoes, instante, (screen_w, screen_h), frame)
+
+    return ResultadoTela(detectar_no_frame(frame, nomes), instante, (screen_w, screen_h), frame)
+
+
+def detectar_no_frame(frame, nomes):
+    """
+    Compara os templates pedidos com um frame (sem capturar nem delegar).
+
+    Returns:
+        dict: nome -> dict de localizar_template (encontrado, score, posicao, escala)
+    """
+    deteccoes = {}
+
+    for nome in nomes:
+        caminho = caminho_template(TEMPLATES_TELA[nome])
+        if caminho is None:
+            deteccoes[nome] = {"encontrado": False, "score": 0.0, "posicao": None, "escala": 1.0}
+            continue
+
+        confidence = CONFIDENCE_TEMPLATES.get(nome, CONFIDENCE_PADRAO)
+        deteccao = localizar_no_frame(frame, caminho, confidence)
+        if deteccao is None:
+            deteccoes[nome] = {"encontrado": False, "score": 0.0, "posicao": None, "escala": 1.0}
+            continue
+
+        deteccoes[nome] = deteccao
+
+    return deteccoes
+
+
+def definir_executor_remoto(funcao):
+    """
+    Delega a comparação dos templates (ex: pool_visao em outros processos).
+
+    Args:
+        funcao: (frame, nomes) -> deteccoes, ou None se não conseguiu (aí a
+                análise é feita localmente). None remove o executor
+    """
+    global _executor_remoto
+    _executor_remoto = funcao
+
+
+def aguardar_deteccao(nomes, timeout=3, parar_em=None):
+    """
+    Repete analisar_tela() até algum template de parar_em aparecer ou o
+    timeout estourar. Cada tentativa é UMA captura para todos os templates.
+
+    Args:
+        nomes: Templates a analisar em cada captura
+        timeout: Tempo máximo em segundos
+        parar_em: Templates que encerram a espera quando detectados
+                  (None = qualquer um de nomes)
+
+    Returns:
+        ResultadoTela: Resultado da última captura
+    """
+    if parar_em is None:
+        parar_em = nomes
+
+    inicio = time.time()
+
+    while True:
+        resultado = analisar_tela(nomes)
+
+        if any(resultado.encontrado(nome) for nome in parar_em):
+            return resultado
+
+        if time.time() - inicio >= timeout:
+            return resultado
+
+        time.sleep(INTERVALO_CAPTURA)
+
+
+# ============================================================================
+# CLASSIFICADOR DE ESTADO DO ORACLE
+# ============================================================================
+# Em vez de perguntar "tem erro de produto?", "tem timeout?", "tem modal?"
+# em sequência (cada pergunta com o seu timeout), um frame é classificado
+# em UM estado conhecido e o loop de itens decide a partir dele.
+
+ESTADO_FORMULARIO = "FORMULARIO_TRANSFERENCIA"
+ESTADO_QTD_NEGATIVA = "QTD_NEGATIVA"
+ESTADO_ERRO_PRODUTO = "ERRO_PRODUTO"
+ESTADO_TEMPO_ORACLE = "TEMPO_ORACLE"
+ESTADO_QUEDA_REDE = "QUEDA_REDE"
+ESTADO_DESCONHECIDO = "DESCONHECIDO"
+
+# Estado -> template que o identifica, em ORDEM DE PRIORIDADE: quando mais
+# de um aparece (ex: modal por cima do formulário), vale o primeiro
+ESTADOS_ORACLE = [
+    (ESTADO_QUEDA_REDE, "queda_rede"),
+    (ESTADO_TEMPO_ORACLE, "tempo_oracle"),
+    (ESTADO_ERRO_PRODUTO, "erro_produto"),
+    (ESTADO_QTD_NEGATIVA, "qtd_negativa"),
+    (ESTADO_FORMULARIO, "tela_transferencia"),
+]
+
+# Templates dos estados que interrompem o fluxo normal (modais/erros)
+TEMPLATES_ANOMALOS = [nome for estado, nome in ESTADOS_ORACLE if estado != ESTADO_FORMULARIO]
+
+
+class EstadoOracle:
+    """Estado do Oracle em um frame + confiança de cada estado"""
+
+    def __init__(self, estado, confianca, confiancas, resultado):
+        self.estado = estado
+        self.confianca = confianca  # score do estado escolhido
+        self.confiancas = confiancas  # estado -> score do template
+        self.resultado = resultado  # ResultadoTela classificado
+
+    def __repr__(self):
+        return f"EstadoOracle({self.estado}, confiança={self.confianca:.2f})"
+
+
+def classificar_estado(resultado, confianca_minima=None):
+    """
+    Classifica um ResultadoTela já calculado em um estado do Oracle.
+
+    Args:
+        resultado: ResultadoTela com os templates de ESTADOS_ORACLE
+        confianca_minima: dict estado -> score mínimo, para estados que
+                          exigem mais que CONFIDENCE_TEMPLATES neste ponto
+
+    Returns:
+        EstadoOracle: Estado de maior prioridade detectado, ou DESCONHECIDO
+                      (confiança = 1 - maior score) se nenhum template bateu
+    """
+    confiancas = {estado: resultado.score(nome) for estado, nome in ESTADOS_ORACLE}
+    confianca_minima = confianca_minima or {}
+
+    for estado, nome in ESTADOS_ORACLE:
+        if resultado.encontrado(nome) and confiancas[estado] >= confianca_minima.get(estado, 0.0):
+            return EstadoOracle(estado, confiancas[estado], confiancas, resultado)
+
+    maior_score = max(confiancas.values(), default=0.0)
+    return EstadoOracle(ESTADO_DESCONHECIDO, 1.0 - maior_score, confiancas, resultado)
+
+
+def classificar_estado_oracle(frame=None):
+    """
+    Captura a tela UMA vez e retorna o estado atual do Oracle.
+
+    Args:
+        frame: Frame BGR já capturado (opcional - se None, captura agora)
+
+    Returns:
+        EstadoOracle
+    """
+    nomes = [nome for _, nome in ESTADOS_ORACLE]
+    return classificar_estado(analisar_tela(nomes, frame))
+
+
+def aguardar_estado_oracle(timeout=3, parar_em=None):
+    """
+    Classifica a tela até um dos templates de parar_em aparecer ou o
+    timeout estourar (um único timeout para todas as perguntas).
+
+    Args:
+        timeout: Tempo máximo em segundos
+        parar_em: Templates que encerram a espera (None = qualquer estado conhecido)
+
+    Returns:
+        EstadoOracle: Estado da última captura
+    """
+    nomes = [nome for _, nome in ESTADOS_ORACLE]
+    return classificar_estado(aguardar_deteccao(nomes, timeout=timeout, parar_em=parar_em))
+
+
+# ============================================================================
+# MONITOR DE TELA EM SEGUNDO PLANO
+# ============================================================================
+
+class MonitorTela:
+    """
+    Thread que captura a tela num intervalo fixo, analisa os templates e
+    guarda os últimos resultados num buffer circular.
+
+    A thread de automação não precisa mais bloquear esperando detecção:
+    - estado_atual(): último resultado (consulta instantânea)
+    - aguardar(): espera por evento (template apareceu) com timeout
+    - inscrever(): callback quando um template aparece/desaparece
+    """
+
+    def __init__(self, nomes=None, intervalo=0.5, tamanho_buffer=10):
+        self.nomes = list(nomes) if nomes else list(TEMPLATES_TELA.keys())
+        self.intervalo = intervalo
+        self.buffer = deque(maxlen=tamanho_buffer)
+        self._condicao = threading.Condition()
+        self._parar = threading.Event()
+        self._thread = None
+        self._inscricoes = {}  # id -> (nome, evento, callback)
+        self._proximo_id = 1
+        self._encontrados_anteriores = set()
+
+    # ─── CICLO DE VIDA ──────────────────────────────────────────────────────
+    def iniciar(self):
+        """Inicia a thread de captura (daemon)"""
+        if self.em_execucao():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name="MonitorTela", daemon=True)
+        self._thread.start()
+
+    def parar(self, timeout=2):
+        """Para a thread de captura"""
+        self._parar.set()
+        with self._condicao:
+            self._condicao.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def em_execucao(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _loop(self):
+        while not self._parar.is_set():
+            inicio = time.time()
+            try:
+                resultado = analisar_tela(self.nomes)
+                self._publicar(resultado)
+            except Exception as e:
+                gui_log(f"[MONITOR] ⚠️ Erro na captura: {e}")
+
+            # Respeitar o intervalo descontando o tempo da análise
+            self._parar.wait(max(0.0, self.intervalo - (time.time() - inicio)))
+
+    def _publicar(self, resultado):
+        with self._condicao:
+            self.buffer.append(resultado)
+            self._condicao.notify_all()
+            inscricoes = list(self._inscricoes.values())
+
+        encontrados = set(resultado.encontrados())
+        apareceram = encontrados - self._encontrados_anteriores
+        sumiram = self._encontrados_anteriores - encontrados
+        self._encontrados_anteriores = encontrados
+
+        for nome, evento, callback in inscricoes:
+            if (evento == "apareceu" and nome in apareceram) or (evento == "sumiu" and nome in sumiram):
+                try:
+                    callback(nome, resultado)
+                except Exception as e:
+                    gui_log(f"[MONITOR] ⚠️ Erro no callback de '{nome}': {e}")
+
+    # ─── INSCRIÇÕES ─────────────────────────────────────────────────────────
+    def inscrever(self, nome, callback, evento="apareceu"):
+        """
+        Registra callback(nome, resultado) para quando o template aparecer
+        ("apareceu") ou sumir ("sumiu") da tela. Roda na thread do monitor.
+
+        Returns:
+            int: ID da inscrição (para cancelar_inscricao)
+        """
+        with self._condicao:
+            id_inscricao = self._proximo_id
+            self._proximo_id += 1
+            self._inscricoes[id_inscricao] = (nome, evento, callback)
+        return id_inscricao
+
+    def cancelar_inscricao(self, id_inscricao):
+        with self._condicao:
+            self._inscricoes.pop(id_inscricao, None)
+
+    # ─── CONSULTAS ──────────────────────────────────────────────────────────
+    def estado_atual(self, idade_maxima=None):
+        """
+        Último resultado do monitor (sem capturar nem esperar).
+
+        Args:
+            idade_maxima: Se informado, retorna None quando o último
+                          resultado for mais velho que isso (segundos)
+
+        Returns:
+            ResultadoTela ou None
+        """
+        with self._condicao:
+            if not self.buffer:
+                return None
+            resultado = self.buffer[-1]
+
+        if idade_maxima is not None and time.time() - resultado.timestamp > idade_maxima:
+            return None
+        return resultado
+
+    def aguardar(self, parar_em, timeout, desde=None, cancelar=None):
+        """
+        Espera até um resultado (capturado depois de 'desde') conter algum
+        template de parar_em, ou até o timeout.
+
+        Args:
+            parar_em: Templates que encerram a espera
+            timeout: Tempo máximo (segundos)
+            desde: Só considera capturas com timestamp >= desde (padrão: agora)
+            cancelar: Função sem argumentos - se retornar True, encerra a espera
+
+        Returns:
+            ResultadoTela: Resultado que encerrou a espera, ou o último
+                           resultado após 'desde' (None se não houve captura)
+        """
+        if desde is None:
+            desde = time.time()
+        limite = time.time() + timeout
+
+        with self._condicao:
+            while True:
+                recentes = [r for r in self.buffer if r.timestamp >= desde]
+                for resultado in recentes:
+                    if any(resultado.encontrado(nome) for nome in parar_em):
+                        return resultado
+
+                restante = limite - time.time()
+                if restante <= 0 or self._parar.is_set() or (cancelar and cancelar()):
+                    return recentes[-1] if recentes else None
+
+                # Acorda a cada nova captura (ou no máximo a cada 1s para checar cancelar)
+                self._condicao.wait(min(restante, 1.0))
+
+
+_monitor = None
+
+
+def iniciar_monitor(config=None):
+    """
+    Cria e inicia o monitor global conforme "monitor_tela" do config.json
+    (opt-in: sem "habilitado": true o monitor não é criado).
+
+    Formato:
+        "monitor_tela": {"habilitado": true, "intervalo": 0.5, "tamanho_buffer": 10}
+
+    Returns:
+        MonitorTela ou None se desabilitado/indisponível
+    """
+    global _monitor
+
+    cfg = config.get("monitor_tela", {}) if config else {}
+    if not OPENCV_DISPONIVEL or not cfg.get("habilitado", False):
+        return None
+
+    parar_monitor()
+    _monitor = MonitorTela(
+        intervalo=float(cfg.get("intervalo", 0.5)),
+        tamanho_buffer=int(cfg.get("tamanho_buffer", 10)),
+    )
+    _monitor.iniciar()
+    return _monitor
+
+
+def obter_monitor():
+    """Monitor global em execução (ou None)"""
+    if _monitor is not None and _monitor.em_execucao():
+        return _monitor
+    return None
+
+
+def parar_monitor():
+    """Para o monitor global (se estiver rodando)"""
+    global _monitor
+
+    if _monitor is not None:
+        _monitor.parar()
+    _monitor = None
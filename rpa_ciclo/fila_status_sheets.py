@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+fila_status_sheets.py
+=====================
+Fila write-behind para as escritas de "Status Oracle" no Google Sheets.
+
+Cada item processado gravava 2-3 células com um values().update() cada
+(PROCESSANDO..., Concluído, mensagens de erro), e o robô esperava o
+round-trip do Google (centenas de ms, às vezes segundos) entre um item e
+outro. Aqui:
+
+- enfileirar() só registra a célula e volta na hora (o robô não espera)
+- Escritas pendentes na MESMA célula são coalescidas (vale a última:
+  PROCESSANDO... seguido de Concluído vira uma escrita só)
+- Uma thread descarrega tudo com UM values().batchUpdate() a cada
+  intervalo_s ou quando juntar max_pendentes células
+- Pendências vão para disco (JSON, tmp + fsync + replace como o
+  CacheLocal) a cada enfileiramento e são recarregadas no início: fechar o
+  robô no meio não perde status
+- ao_confirmar (ex: cache.marcar_concluido) só roda depois que o Google
+  confirmou o lote com aquele valor na célula; se outro valor for
+  enfileirado na mesma célula antes, o retorno é cancelado
+- Falha no lote -> pendências ficam na fila e a thread tenta de novo com
+  espera crescente
+
+A thread usa o PRÓPRIO service (criado pela fábrica recebida): o cliente
+HTTP do googleapiclient não é thread-safe.
+
+Uso:
+    fila = FilaStatusSheets(lambda: build("sheets", "v4", credentials=creds),
+                            SPREADSHEET_ID, pasta=BASE_DIR).iniciar()
+    fila.enfileirar("Separação!T12", "PROCESSANDO...", urgente=True)
+    fila.enfileirar("Separação!T12", "Processo Oracle Concluído",
+                    ao_confirmar=lambda: cache.marcar_concluido(id_linha))
+    fila.descarregar(timeout=10)   # antes de reler a planilha
+    fila.encerrar()
+
+Data: 2026-10-18
+"""
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+# Intervalo máximo entre lotes (s)
+INTERVALO_PADRAO = 2.0
+
+# Células pendentes que disparam um lote antes do intervalo
+MAX_PENDENTES_PADRAO = 20
+
+# Espera após falha no lote (s): dobra a cada falha seguida até o máximo
+ESPERA_FALHA_INICIAL = 2.0
+ESPERA_FALHA_MAXIMA = 60.0
+
+# Espera máxima ao encerrar (s) - o que sobrar fica no arquivo
+TIMEOUT_ENCERRAR = 15
+
+# ============================================================================
+# FUNÇÕES AUXILIARES
+# ============================================================================
+
+def gui_log(mensagem):
+    """Log compatível com GUI (pode ser substituído externamente)"""
+    print(mensagem)
+
+
+# ============================================================================
+# FILA WRITE-BEHIND
+# ============================================================================
+
+class FilaStatusSheets:
+    """
+    Células pendentes (range -> valor) descarregadas em lote por uma thread.
+
+    Cada enfileiramento incrementa a versão da célula; depois de um lote,
+    só saem da fila as células cuja versão não mudou durante o envio (uma
+    escrita nova na mesma célula continua pendente para o próximo lote).
+    """
+
+    def __init__(self, criar_servico, spreadsheet_id, pasta=".", arquivo=None,
+                 intervalo=INTERVALO_PADRAO, max_pendentes=MAX_PENDENTES_PADRAO):
+        self.criar_servico = criar_servico
+        self.spreadsheet_id = spreadsheet_id
+        self.intervalo = max(0.1, float(intervalo))
+        self.max_pendentes = max(1, int(max_pendentes))
+        if arquivo is None:
+            arquivo = f"fila_status_{spreadsheet_id[-8:]}.json"
+        self.arquivo = os.path.join(str(pasta), arquivo)
+
+        self._pendentes = OrderedDict()  # range -> {"valor", "versao"}
+        self._callbacks = {}  # range -> [(versao, função)]
+        self._versao = 0
+        self._enviando = False
+        self._urgente = False
+        self._ativo = False
+        self._thread = None
+        self._servico = None
+        self._cond = threading.Condition()
+
+        self.enfileiradas = 0
+        self.coalescidas = 0
+        self.lotes = 0
+        self.celulas_enviadas = 0
+        self.falhas = 0
+
+    # ─── CICLO DE VIDA ──────────────────────────────────────────────────────
+    def iniciar(self):
+        """Recarrega pendências do disco e inicia a thread de envio"""
+        restantes = self._carregar()
+        if restantes:
+            gui_log(f"📤 [FILA SHEETS] {restantes} status pendentes da execução anterior recarregados")
+
+        self._ativo = True
+        self._thread = threading.Thread(target=self._loop, name="FilaStatusSheets", daemon=True)
+        self._thread.start()
+        return self
+
+    def encerrar(self, timeout=TIMEOUT_ENCERRAR):
+        """
+        Descarrega o que estiver pendente e para a thread.
+
+        Returns:
+            int: Células que ficaram pendentes (continuam no arquivo)
+        """
+        if self._thread is None:
+            return self.pendentes()
+
+        self.descarregar(timeout)
+        with self._cond:
+            self._ativo = False
+            self._cond.notify_all()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+        restantes = self.pendentes()
+        if restantes:
+            gui_log(f"⚠️ [FILA SHEETS] {restantes} status não enviados - ficam salvos para a próxima execução")
+        return restantes
+
+    # ─── API ────────────────────────────────────────────────────────────────
+    def enfileirar(self, range_celula, valor, ao_confirmar=None, urgente=False):
+        """
+        Registra a escrita de uma célula (não espera o Google).
+
+        Args:
+            range_celula: Range A1 de uma célula (ex: "Separação!T12")
+            valor: Valor a gravar (substitui escrita pendente na mesma célula)
+            ao_confirmar: Função chamada depois que o lote com esta escrita
+                          for confirmado (ex: remover do cache local). Nova
+                          escrita na mesma célula antes disso cancela o
+                          retorno
+            urgente: True -> envia já, sem esperar o intervalo (ex: trava
+                     PROCESSANDO... que outras instâncias precisam ver)
+        """
+        with self._cond:
+            self._versao += 1
+            if range_celula in self._pendentes:
+                self.coalescidas += 1
+                self._pendentes.move_to_end(range_celula)
+            self._pendentes[range_celula] = {"valor": valor, "versao": self._versao}
+            # Valor anterior substituído: o retorno dele não vale mais (ex:
+            # Concluído seguido de erro não pode tirar o item do cache)
+            self._callbacks.pop(range_celula, None)
+            if ao_confirmar is not None:
+                self._callbacks[range_celula] = [(self._versao, ao_confirmar)]
+            self.enfileiradas += 1
+
+            self._salvar()
+
+            if urgente:
+                self._urgente = True
+            if urgente or len(self._pendentes) >= self.max_pendentes:
+                self._cond.notify_all()
+
+    def descarregar(self, timeout=10):
+        """
+        Pede o envio imediato e espera a fila esvaziar.
+
+        Returns:
+            bool: True se tudo foi confirmado dentro do timeout
+        """
+        limite = time.time() + timeout
+        with self._cond:
+            self._urgente = True
+            self._cond.notify_all()
+            while self._pendentes or self._enviando:
+                restante = limite - time.time()
+                if restante <= 0 or self._thread is None:
+                    return False
+                self._cond.wait(restante)
+        return True
+
+    def pendentes(self):
+        with self._cond:
+            return len(self._pendentes)
+
+    def estatisticas(self):
+        with self._cond:
+            return {
+                "enfileiradas": self.enfileiradas,
+                "coalescidas": self.coalescidas,
+                "lotes": self.lotes,
+                "celulas_enviadas": self.celulas_enviadas,
+                "falhas": self.falhas,
+                "pendentes": len(self._pendentes),
+            }
+
+    # ─── THREAD DE ENVIO ────────────────────────────────────────────────────
+    def _loop(self):
+        espera_falha = 0.0
+        while True:
+            with self._cond:
+                # Espera: intervalo (ou espera pós-falha) / lote cheio / urgente / encerrar
+                limite = time.time() + (espera_falha or self.intervalo)
+                while self._ativo and not (espera_falha == 0 and self._urgente):
+                    if not espera_falha and len(self._pendentes) >= self.max_pendentes:
+                        break
+                    restante = limite - time.time()
+                    if restante <= 0:
+                        break
+                    self._cond.wait(restante)
+
+                if not self._pendentes:
+                    self._urgente = False
+                    if not self._ativo:
+                        return
+                    continue
+
+                lote = [(r, dados["valor"], dados["versao"]) for r, dados in self._pendentes.items()]
+                self._urgente = False
+                self._enviando = True
+
+            try:
+                self._enviar_lote(lote)
+                ok = True
+            except Exception as e:
+                ok = False
+                self.falhas += 1
+                self._servico = None  # recriar (conexão pode ter caído)
+                gui_log(f"⚠️ [FILA SHEETS] Falha ao enviar {len(lote)} status: {e}")
+
+            confirmados = []
+            with self._cond:
+                self._enviando = False
+                if ok:
+                    for range_celula, _, versao in lote:
+                        atual = self._pendentes.get(range_celula)
+                        if atual is not None and atual["versao"] == versao:
+                            del self._pendentes[range_celula]
+                        # Só o retorno da versão que foi gravada neste lote
+                        callbacks = self._callbacks.get(range_celula, [])
+                        confirmados.extend(f for v, f in callbacks if v == versao)
+                        callbacks = [(v, f) for v, f in callbacks if v > versao]
+                        if callbacks:
+                            self._callbacks[range_celula] = callbacks
+                        else:
+                            self._callbacks.pop(range_celula, None)
+                    self.lotes += 1
+                    self.celulas_enviadas += len(lote)
+                    self._salvar()
+                self._cond.notify_all()
+
+                if not ok and not self._ativo:
+                    # Encerrando com o Google fora: o resto fica no arquivo
+                    return
+
+            espera_falha = 0.0 if ok else min(max(espera_falha * 2, ESPERA_FALHA_INICIAL), ESPERA_FALHA_MAXIMA)
+
+            for funcao in confirmados:
+                try:
+                    funcao()
+                except Exception as e:
+                    gui_log(f"⚠️ [FILA SHEETS] Erro no retorno de confirmação: {e}")
+
+    def _enviar_lote(self, lote):
+        if self._servico is None:
+            self._servico = self.criar_servico()
+
+        self._servico.spreadsheets().values().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={
+                "valueInputOption": "RAW",
+                "data": [{"range": r, "values": [[valor]]} for r, valor, _ in lote],
+            }
+        ).execute()
+
+    # ─── PERSISTÊNCIA ───────────────────────────────────────────────────────
+    def _salvar(self):
+        """Grava as pendências (chamado com o lock; arquivo pequeno)"""
+        try:
+            if not self._pendentes:
+                if os.path.exists(self.arquivo):
+                    os.remove(self.arquivo)
+                return
+
+            json_str = json.dumps(
+                {r: dados["valor"] for r, dados in self._pendentes.items()},
+                indent=2, ensure_ascii=False
+            )
+            temp_arquivo = self.arquivo + ".tmp"
+            with open(temp_arquivo, 'w', encoding='utf-8') as f:
+                f.write(json_str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_arquivo, self.arquivo)
+        except Exception as e:
+            gui_log(f"[ERRO] Falha ao salvar fila de status: {e}")
+
+    def _carregar(self):
+        if not os.path.exists(self.arquivo):
+            return 0
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except Exception as e:
+            gui_log(f"⚠️ [FILA SHEETS] Erro ao ler {self.arquivo}: {e}")
+            return 0
+
+        with self._cond:
+            for range_celula, valor in dados.items():
+                if range_celula not in self._pendentes:
+                    self._versao += 1
+                    self._pendentes[range_celula] = {"valor": valor, "versao": self._versao}
+            return len(self._pendentes)
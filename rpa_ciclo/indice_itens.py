@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+indice_itens.py
+===============
+Índice local dos códigos de ITEM válidos (cadastro da Bancada) para
+ajustar leituras de OCR ao código real mais próximo.
+
+O corrigir_confusao_ocr tenta adivinhar trocas A↔4, B↔8, O↔0 com regras
+fixas. Aqui a leitura é comparada com os códigos que EXISTEM (coluna ITEM
+do último out/bancada-*.xlsx) por distância de edição, com um índice de
+deleções simétricas (códigos curtos: a BK-tree quase não poda e ficava na
+casa de dezenas de ms por consulta; aqui são poucas consultas em dict):
+- leitura já é um código válido -> usa direto
+- um único código a distância 1-2 -> ajusta para ele
+- vários códigos empatados -> ambíguo (não ajusta, reporta os candidatos)
+
+Para não reler o .xlsx (grande) a cada execução, os códigos ficam num
+cache texto ao lado do snapshot (out/indice_itens.txt), refeito quando o
+snapshot muda.
+
+Uso:
+    indice = carregar_indice(pasta_out)
+    ajuste = indice.ajustar("E2O29A")
+    ajuste.codigo, ajuste.distancia, ajuste.ambiguo, ajuste.candidatos
+
+Data: 2026-10-18
+"""
+
+import os
+import glob
+import threading
+
+try:
+    import openpyxl
+    OPENPYXL_DISPONIVEL = True
+except ImportError:
+    OPENPYXL_DISPONIVEL = False
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+# Distância de edição máxima aceita para ajustar uma leitura
+DISTANCIA_MAXIMA = 2
+
+# Coluna dos códigos no snapshot da Bancada
+COLUNA_ITEM = "ITEM"
+
+# Snapshots da Bancada (salvos por salvar_excel_bancada)
+PADRAO_SNAPSHOT = "bancada-*.xlsx"
+
+# Cache dos códigos (um por linha; 1ª linha = snapshot de origem e mtime)
+ARQUIVO_CACHE = "indice_itens.txt"
+
+# ============================================================================
+# FUNÇÕES AUXILIARES
+# ============================================================================
+
+def gui_log(mensagem):
+    """Log compatível com GUI (pode ser substituído externamente)"""
+    print(mensagem)
+
+
+def normalizar_codigo(texto):
+    """Maiúsculas, sem espaços (mesma normalização do validador)"""
+    return str(texto).upper().strip().replace(" ", "")
+
+
+def distancia_edicao(a, b):
+    """Distância de Levenshtein (inserção, remoção e troca custam 1)"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        atual = [i]
+        for j, cb in enumerate(b, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        anterior = atual
+    return anterior[-1]
+
+
+# ============================================================================
+# ÍNDICE POR DISTÂNCIA DE EDIÇÃO
+# ============================================================================
+
+class ResultadoAjuste:
+    """Resultado do ajuste de uma leitura ao código válido mais próximo"""
+
+    def __init__(self, lido, codigo, distancia, candidatos):
+        self.lido = lido
+        self.codigo = codigo  # código ajustado (None se ambíguo ou sem candidato)
+        self.distancia = distancia  # distância do melhor candidato (None se nenhum)
+        self.candidatos = candidatos  # [(distância, código)] empatados na menor distância
+
+    @property
+    def ambiguo(self):
+        return len(self.candidatos) > 1
+
+    @property
+    def ajustado(self):
+        """True se o código válido é diferente do que foi lido"""
+        return self.codigo is not None and self.codigo != self.lido
+
+    def __repr__(self):
+        if self.codigo is not None:
+            return f"ResultadoAjuste('{self.lido}' -> '{self.codigo}', distância={self.distancia})"
+        return f"ResultadoAjuste('{self.lido}', candidatos={[c for _, c in self.candidatos]})"
+
+
+class IndiceItens:
+    """
+    Conjunto de códigos válidos + índice de deleções simétricas.
+
+    Cada código é registrado com todas as suas variantes com até
+    DISTANCIA_MAXIMA caracteres removidos. Uma leitura a distância <= N de
+    um código compartilha com ele pelo menos uma variante, então a busca
+    são poucas consultas em dicionário (as deleções da leitura) e a
+    confirmação por distância de edição só nos candidatos encontrados.
+    """
+
+    def __init__(self, codigos, origem=None, distancia_max=DISTANCIA_MAXIMA):
+        self.origem = origem
+        self.distancia_max = distancia_max
+        self.codigos = set()
+        self._delecoes = {}  # variante -> [códigos]
+
+        for codigo in codigos:
+            self.adicionar(codigo)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    @staticmethod
+    def _variantes(texto, distancia_max):
+        """O texto e todas as versões com até distancia_max caracteres removidos"""
+        variantes = {texto}
+        nivel = {texto}
+        for _ in range(distancia_max):
+            nivel = {v[:i] + v[i + 1:] for v in nivel for i in range(len(v))}
+            variantes |= nivel
+        return variantes
+
+    def adicionar(self, codigo):
+        codigo = normalizar_codigo(codigo)
+        if not codigo or codigo in self.codigos:
+            return
+        self.codigos.add(codigo)
+
+        for variante in self._variantes(codigo, self.distancia_max):
+            self._delecoes.setdefault(variante, []).append(codigo)
+
+    def contem(self, codigo):
+        return normalizar_codigo(codigo) in self.codigos
+
+    def buscar(self, texto, distancia_max=None):
+        """
+        Códigos a até distancia_max edições do texto.
+
+        Returns:
+            list: [(distância, código)] ordenada pela distância
+        """
+        if distancia_max is None or distancia_max > self.distancia_max:
+            distancia_max = self.distancia_max
+
+        texto = normalizar_codigo(texto)
+        if not texto:
+            return []
+
+        candidatos = set()
+        for variante in self._variantes(texto, distancia_max):
+            candidatos.update(self._delecoes.get(variante, ()))
+
+        encontrados = []
+        for codigo in candidatos:
+            d = distancia_edicao(texto, codigo)
+            if d <= distancia_max:
+                encontrados.append((d, codigo))
+        return sorted(encontrados)
+
+    def ajustar(self, texto, distancia_max=None):
+        """
+        Ajusta uma leitura ao código válido mais próximo.
+
+        Returns:
+            ResultadoAjuste: codigo = leitura (se válida), o único candidato
+                             mais próximo, ou None (ambíguo / sem candidato)
+        """
+        lido = normalizar_codigo(texto)
+        if lido in self.codigos:
+            return ResultadoAjuste(lido, lido, 0, [(0, lido)])
+
+        encontrados = self.buscar(lido, distancia_max)
+        if not encontrados:
+            return ResultadoAjuste(lido, None, None, [])
+
+        menor = encontrados[0][0]
+        candidatos = [(d, c) for d, c in encontrados if d == menor]
+        codigo = candidatos[0][1] if len(candidatos) == 1 else None
+        return ResultadoAjuste(lido, codigo, menor, candidatos)
+
+
+# ============================================================================
+# SNAPSHOT DA BANCADA
+# ============================================================================
+
+def snapshot_mais_recente(pasta_out):
+    """Caminho do out/bancada-*.xlsx mais recente (ou None)"""
+    arquivos = glob.glob(os.path.join(str(pasta_out), PADRAO_SNAPSHOT))
+    return max(arquivos, key=os.path.getmtime) if arquivos else None
+
+
+def ler_codigos_snapshot(caminho_xlsx):
+    """Lê só a coluna ITEM do snapshot (openpyxl em modo somente leitura)"""
+    livro = openpyxl.load_workbook(caminho_xlsx, read_only=True, data_only=True)
+    try:
+        linhas = livro.active.iter_rows(values_only=True)
+        cabecalho = [str(c).strip().upper() if c is not None else "" for c in next(linhas, [])]
+        if COLUNA_ITEM not in cabecalho:
+            return []
+        indice_coluna = cabecalho.index(COLUNA_ITEM)
+
+        codigos = set()
+        for linha in linhas:
+            if indice_coluna < len(linha) and linha[indice_coluna] not in (None, "", "nan"):
+                codigos.add(normalizar_codigo(linha[indice_coluna]))
+        return sorted(codigos)
+    finally:
+        livro.close()
+
+
+def _ler_cache(caminho_cache, caminho_xlsx):
+    """Códigos do cache texto, se ele foi gerado a partir deste snapshot"""
+    if not os.path.isfile(caminho_cache):
+        return None
+
+    assinatura = f"{os.path.basename(caminho_xlsx)}|{os.path.getmtime(caminho_xlsx)}"
+    with open(caminho_cache, "r", encoding="utf-8") as f:
+        if f.readline().strip() != assinatura:
+            return None
+        return [linha.strip() for linha in f if linha.strip()]
+
+
+def _gravar_cache(caminho_cache, caminho_xlsx, codigos):
+    assinatura = f"{os.path.basename(caminho_xlsx)}|{os.path.getmtime(caminho_xlsx)}"
+    temp = caminho_cache + ".tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        f.write(assinatura + "\n")
+        f.write("\n".join(codigos))
+    os.replace(temp, caminho_cache)
+
+
+# ============================================================================
+# ÍNDICE GLOBAL
+# ============================================================================
+
+_indice = None
+_lock_indice = threading.Lock()
+
+
+def carregar_indice(pasta_out, caminho_xlsx=None):
+    """
+    Monta o índice a partir do snapshot mais recente da Bancada.
+
+    Args:
+        pasta_out: Pasta out/ com os bancada-*.xlsx
+        caminho_xlsx: Snapshot específico (None = o mais recente)
+
+    Returns:
+        IndiceItens ou None se não houver snapshot legível
+    """
+    global _indice
+
+    if caminho_xlsx is None:
+        caminho_xlsx = snapshot_mais_recente(pasta_out)
+    if caminho_xlsx is None or not os.path.isfile(caminho_xlsx):
+        return None
+
+    caminho_cache = os.path.join(str(pasta_out), ARQUIVO_CACHE)
+    try:
+        codigos = _ler_cache(caminho_cache, caminho_xlsx)
+        if codigos is None:
+            if not OPENPYXL_DISPONIVEL:
+                gui_log("⚠️ [ÍNDICE] openpyxl não disponível - índice de itens não carregado")
+                return None
+            codigos = ler_codigos_snapshot(caminho_xlsx)
+            _gravar_cache(caminho_cache, caminho_xlsx, codigos)
+    except Exception as e:
+        gui_log(f"⚠️ [ÍNDICE] Erro ao ler snapshot {caminho_xlsx}: {e}")
+        return None
+
+    indice = IndiceItens(codigos, origem=caminho_xlsx)
+    with _lock_indice:
+        _indice = indice
+    return indice
+
+
+def obter_indice():
+    """Índice carregado (None se ainda não houver)"""
+    with _lock_indice:
+        return _indice
+
+
+def ajustar_item(texto, distancia_max=None):
+    """
+    Ajusta uma leitura de OCR de ITEM com o índice carregado.
+
+    Returns:
+        ResultadoAjuste ou None se não houver índice
+    """
+    indice = obter_indice()
+    if indice is None:
+        return None
+    return indice.ajustar(texto, distancia_max)
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+leitor_separacao.py
+===================
+Leitura da aba "Separação" só com as colunas que o robô usa.
+
+A busca de linhas (etapa 5 do ciclo e buscar_linhas_novas do RPA_Oracle)
+lia Separação!A1:AC inteira - 29 colunas de cada linha - a cada 30s,
+para usar só Status, Status Oracle, Item, origem/destino, Quantidade,
+Referência e ID. Aqui:
+
+- O cabeçalho é lido UMA vez e as colunas necessárias são localizadas
+  pelo nome (a posição na planilha pode mudar sem mexer no código)
+- Cada leitura é um values().batchGet() só dessas colunas
+  (majorDimension=COLUMNS: cada coluna vem como uma lista, sem repetir
+  células vazias das colunas que não interessam)
+- Colunas vizinhas vão num único range (ex: Status Oracle e ID juntas)
+- O resultado volta no MESMO formato de antes (headers completos + linhas
+  com a largura do cabeçalho), então índices e letras de coluna usados
+  para escrever o status continuam iguais; as colunas não lidas vêm ""
+- Coluna necessária que não está no cabeçalho -> leitura completa (A1:AC)
+
+Leitura incremental (marca d'água baixa): linhas do topo que já estão num
+estado final não voltam a ser processadas. O que é "final" depende de
+quem lê (o RPA_Oracle só pega Status Oracle vazio; o ciclo também refaz
+erros de OCR/salvamento), então cada chamador passa o próprio eh_final.
+O leitor guarda a primeira linha que NÃO é final (ou a primeira linha
+vazia, que ainda pode ser preenchida) e as próximas leituras começam nela,
+então o custo de cada busca acompanha só a cauda pendente, não o histórico
+da aba. A cada resync_s (e quando o cabeçalho é relido) a leitura é
+completa de novo, para pegar edições manuais acima da marca.
+
+Uso:
+    leitor = LeitorSeparacao(service, SPREADSHEET_ID, incremental=True,
+                             eh_final=lambda row, headers: ...)
+    headers, dados, primeira = leitor.ler()  # dados[0] = linha `primeira` da planilha
+    for i, row in enumerate(dados, start=primeira - 2):   # i + 2 = linha
+
+Data: 2026-10-18
+"""
+
+import time
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+ABA_PADRAO = "Separação"
+
+# Última coluna lida (o ID está em AC)
+ULTIMA_COLUNA_PADRAO = "AC"
+
+# Colunas usadas pela busca e pelo processamento das linhas
+COLUNAS_PADRAO = (
+    "Status",
+    "Status Oracle",
+    "Item",
+    "Sub.Origem",
+    "End. Origem",
+    "Sub. Destino",
+    "End. Destino",
+    "Quantidade",
+    "Cód Referencia",
+    "ID",
+)
+
+# Status Oracle finais do eh_final padrão (status_final)
+STATUS_FINAIS = (
+    "Processo Oracle Concluído",
+    "Quantidade Zero",
+    "PD",
+)
+
+# Trecho que torna o status final em qualquer posição (ex: "REVER - qtd")
+TRECHOS_FINAIS = ("REVER",)
+
+# Intervalo entre leituras completas na leitura incremental (s)
+RESYNC_PADRAO = 600
+
+# Primeira linha de dados (linha 1 = cabeçalho)
+PRIMEIRA_LINHA_DADOS = 2
+
+# ============================================================================
+# FUNÇÕES AUXILIARES
+# ============================================================================
+
+def gui_log(mensagem):
+    """Log compatível com GUI (pode ser substituído externamente)"""
+    print(mensagem)
+
+
+def status_final(status_oracle):
+    """True se o Status Oracle está em STATUS_FINAIS / contém TRECHOS_FINAIS"""
+    status = str(status_oracle).strip()
+    if status in STATUS_FINAIS:
+        return True
+    return any(trecho in status.upper() for trecho in TRECHOS_FINAIS)
+
+
+def final_por_status(row, headers):
+    """eh_final padrão: pelo Status Oracle da linha (status_final)"""
+    return status_final(row[headers.index("Status Oracle")])
+
+
+def letra_coluna(indice):
+    """Índice 0-based -> letra da coluna (0=A, 25=Z, 26=AA)"""
+    letras = ""
+    indice += 1
+    while indice > 0:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def agrupar_contiguas(indices):
+    """[19, 20, 28, 2, 3, 4] -> [(2, 4), (19, 20), (28, 28)]"""
+    grupos = []
+    for indice in sorted(set(indices)):
+        if grupos and indice == grupos[-1][1] + 1:
+            grupos[-1] = (grupos[-1][0], indice)
+        else:
+            grupos.append((indice, indice))
+    return grupos
+
+
+# ============================================================================
+# LEITOR
+# ============================================================================
+
+class LeitorSeparacao:
+    """
+    Cabeçalho resolvido uma vez + batchGet só das colunas necessárias.
+
+    Com incremental=True, cada leitura começa na marca (primeira linha
+    ainda não final da leitura anterior, segundo eh_final(row, headers)) e
+    a cada resync_s a leitura volta a ser completa (cabeçalho + todas as
+    linhas).
+
+    Não é thread-safe (usa o service recebido): cada thread que lê a
+    planilha deve ter o próprio leitor com o próprio service.
+    """
+
+    def __init__(self, service, spreadsheet_id, aba=ABA_PADRAO, colunas=COLUNAS_PADRAO,
+                 ultima_coluna=ULTIMA_COLUNA_PADRAO, incremental=False, resync_s=RESYNC_PADRAO,
+                 eh_final=final_por_status):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.aba = aba
+        self.colunas = tuple(colunas)
+        self.ultima_coluna = ultima_coluna
+        # A marca depende do Status Oracle de cada linha
+        self.incremental = incremental and "Status Oracle" in self.colunas
+        self.resync_s = resync_s
+        self.eh_final = eh_final
+
+        self.headers = None
+        self._grupos = None  # [(início, fim)] de índices contíguos; None = leitura completa
+        self.marca = PRIMEIRA_LINHA_DADOS  # primeira linha ainda não final
+        self._ultimo_resync = 0.0
+        self.leituras = 0
+        self.leituras_completas = 0
+        self.linhas_lidas = 0
+
+    def invalidar(self):
+        """Força reler o cabeçalho (e todas as linhas) na próxima leitura"""
+        self.headers = None
+        self._grupos = None
+        self.marca = PRIMEIRA_LINHA_DADOS
+
+    def resolver_cabecalho(self):
+        """Lê a linha 1 e localiza as colunas necessárias"""
+        res = self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{self.aba}!A1:{self.ultima_coluna}1"
+        ).execute()
+        valores = res.get("values", [])
+        headers = valores[0] if valores else []
+
+        faltando = [nome for nome in self.colunas if nome not in headers]
+        if faltando:
+            gui_log(f"⚠️ [LEITOR] Colunas não encontradas no cabeçalho: {', '.join(faltando)} - leitura completa")
+            self._grupos = None
+        else:
+            self._grupos = agrupar_contiguas(headers.index(nome) for nome in self.colunas)
+            ranges = ", ".join(self._range_grupo(inicio, fim, PRIMEIRA_LINHA_DADOS) for inicio, fim in self._grupos)
+            gui_log(f"📑 [LEITOR] {len(self.colunas)} de {len(headers)} colunas por batchGet: {ranges}")
+
+        self.headers = headers
+        self.marca = PRIMEIRA_LINHA_DADOS
+        return headers
+
+    def _range_grupo(self, inicio, fim, primeira):
+        return f"{self.aba}!{letra_coluna(inicio)}{primeira}:{letra_coluna(fim)}"
+
+    def ler(self):
+        """
+        Lê as linhas de dados: todas (linha 2 em diante) ou, no modo
+        incremental, a partir da marca.
+
+        Returns:
+            tuple: (headers, dados, primeira) - dados[k] é a linha
+                   primeira+k da planilha, com len(headers) células (colunas
+                   não lidas = ""). ([], [], 2) se a planilha estiver vazia
+        """
+        if self.incremental and self.headers is not None and time.time() - self._ultimo_resync >= self.resync_s:
+            gui_log(f"📑 [LEITOR] Resync completo (marca estava na linha {self.marca})")
+            self.invalidar()
+
+        if self.headers is None:
+            self.resolver_cabecalho()
+        if not self.headers:
+            self.headers = None  # planilha vazia: tentar o cabeçalho de novo depois
+            return [], [], PRIMEIRA_LINHA_DADOS
+
+        self.leituras += 1
+        if self._grupos is None:
+            return self._ler_completo()
+
+        primeira = self.marca if self.incremental else PRIMEIRA_LINHA_DADOS
+        try:
+            res = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[self._range_grupo(inicio, fim, primeira) for inicio, fim in self._grupos],
+                majorDimension="COLUMNS"
+            ).execute()
+        except Exception:
+            # Cabeçalho pode ter mudado (coluna inserida/removida): resolver de novo
+            self.invalidar()
+            raise
+
+        # Colunas lidas: índice no cabeçalho -> valores a partir da linha `primeira`
+        colunas = {}
+        for (inicio, _), faixa in zip(self._grupos, res.get("valueRanges", [])):
+            for deslocamento, valores in enumerate(faixa.get("values", [])):
+                colunas[inicio + deslocamento] = valores
+
+        total_linhas = max((len(valores) for valores in colunas.values()), default=0)
+        largura = len(self.headers)
+        dados = [[""] * largura for _ in range(total_linhas)]
+        for indice, valores in colunas.items():
+            for k, valor in enumerate(valores):
+                dados[k][indice] = valor
+        self.linhas_lidas += total_linhas
+
+        if self.incremental:
+            if primeira == PRIMEIRA_LINHA_DADOS:
+                self._ultimo_resync = time.time()
+            self._avancar_marca(dados, primeira)
+        return self.headers, dados, primeira
+
+    def _avancar_marca(self, dados, primeira):
+        """Marca -> primeira linha lida que não é final (ou que está vazia)"""
+        for k, row in enumerate(dados):
+            # Linha vazia pode ser preenchida depois: a marca para nela
+            if not any(row) or not self.eh_final(row, self.headers):
+                self.marca = primeira + k
+                return
+        # Tudo final: a próxima leitura começa depois da última linha lida
+        self.marca = primeira + len(dados)
+
+    def _ler_completo(self):
+        """Leitura antiga (todas as colunas até ultima_coluna)"""
+        self.leituras_completas += 1
+        res = self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{self.aba}!A1:{self.ultima_coluna}"
+        ).execute()
+        valores = res.get("values", [])
+        if not valores:
+            return [], [], PRIMEIRA_LINHA_DADOS
+        self.headers = valores[0]
+        self.linhas_lidas += len(valores) - 1
+        return valores[0], valores[1:], PRIMEIRA_LINHA_DADOS
+
+    def ler_linhas_completas(self, numeros):
+        """
+        Linhas inteiras (todas as colunas) de algumas linhas da planilha.
+
+        Args:
+            numeros: Números das linhas na planilha (1-based, como no Sheets)
+
+        Returns:
+            dict: número -> lista de valores (pode ser mais curta que o cabeçalho)
+        """
+        numeros = list(numeros)
+        if not numeros:
+            return {}
+        res = self.service.spreadsheets().values().batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[f"{self.aba}!A{n}:{self.ultima_coluna}{n}" for n in numeros]
+        ).execute()
+        linhas = {}
+        for numero, faixa in zip(numeros, res.get("valueRanges", [])):
+            valores = faixa.get("values", [])
+            linhas[numero] = valores[0] if valores else []
+        return linhas
@@ -53,28 +53,20 @@ except ImportError:
     print("[WARN] OpenCV não disponível - usando pyautogui para detecção")
 
 # =================== OCR COM TESSERACT ===================
+# Motor persistente (tesserocr) com fallback para pytesseract - ver motor_ocr.py
 try:
-    import pytesseract
+    import motor_ocr
     from PIL import ImageGrab, ImageEnhance
 
-    # Configurar caminho do Tesseract (compatível com executável)
-    if getattr(sys, 'frozen', False):
-        # Se estiver rodando como .exe
-        tesseract_path = os.path.join(sys._MEIPASS, 'tesseract', 'tesseract.exe')
-    else:
-        # Se estiver rodando como script Python
-        tesseract_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-
-    if os.path.isfile(tesseract_path):
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
-        PYTESSERACT_DISPONIVEL = True
-        print(f"[OK] Tesseract OCR habilitado: {tesseract_path}")
+    PYTESSERACT_DISPONIVEL = motor_ocr.disponivel()
+    if PYTESSERACT_DISPONIVEL:
+        backend = "tesserocr" if motor_ocr.TESSEROCR_DISPONIVEL else "pytesseract"
+        print(f"[OK] Tesseract OCR habilitado ({backend}): {motor_ocr.caminho_tesseract()}")
     else:
-        PYTESSERACT_DISPONIVEL = False
-        print(f"[WARN] Tesseract não encontrado em: {tesseract_path}")
+        print(f"[WARN] Tesseract não encontrado em: {motor_ocr.caminho_tesseract()}")
 except ImportError as e:
     PYTESSERACT_DISPONIVEL = False
-    print(f"[WARN] pytesseract não disponível: {e}")
+    print(f"[WARN] Motor OCR não disponível: {e}")
 
 # =================== DETECTAR MODO TESTE ===================
 def detectar_modo_teste():
@@ -129,12 +121,26 @@ except ImportError as e:
     GOOGLE_SHEETS_BANCADA_DISPONIVEL = False
     print(f"[WARN] Google Sheets (bancada) não disponível: {e}")
 
+# Espera por mudança do clipboard (número de sequência do Windows)
+import clipboard_eventos
+
+# Escritas de "Status Oracle" em lote (values.batchUpdate em thread própria)
+import fila_status_sheets
+from fila_status_sheets import FilaStatusSheets
+
+# Leitura da aba Separação só com as colunas usadas (values.batchGet)
+import leitor_separacao
+from leitor_separacao import LeitorSeparacao
+
 # Importar validador híbrido (substitui OCR)
 try:
     from validador_hibrido import (
         validar_campo_oracle_hibrido,
         validar_campos_oracle_completo,
-        detectar_erro_oracle
+        detectar_erro_oracle,
+        configurar_leitura_lote,
+        configurar_camadas,
+        estatisticas_camadas
     )
     VALIDADOR_HIBRIDO_DISPONIVEL = True
     print("[OK] Validador Híbrido importado com sucesso")
@@ -142,6 +148,41 @@ except ImportError as e:
     VALIDADOR_HIBRIDO_DISPONIVEL = False
     print(f"[WARN] Validador Híbrido não disponível: {e}")
 
+# Importar gravador assíncrono das imagens de debug
+try:
+    import artefatos_debug
+    from artefatos_debug import obter_gravador
+    ARTEFATOS_DEBUG_DISPONIVEL = True
+except ImportError as e:
+    ARTEFATOS_DEBUG_DISPONIVEL = False
+    print(f"[WARN] Gravador de debug não disponível: {e}")
+
+# Importar detector de telas (uma captura para todos os templates)
+try:
+    import detector_tela
+    from detector_tela import analisar_tela, aguardar_deteccao
+    DETECTOR_TELA_DISPONIVEL = detector_tela.OPENCV_DISPONIVEL
+    print("[OK] Detector de telas importado com sucesso")
+except ImportError as e:
+    DETECTOR_TELA_DISPONIVEL = False
+    print(f"[WARN] Detector de telas não disponível: {e}")
+
+# Importar pool de processos da visão/OCR (opcional - config "pool_visao")
+try:
+    import pool_visao
+    POOL_VISAO_DISPONIVEL = True
+except ImportError as e:
+    POOL_VISAO_DISPONIVEL = False
+    print(f"[WARN] Pool de visão não disponível: {e}")
+
+# Importar índice de códigos de item (ajuste de leituras de OCR)
+try:
+    import indice_itens
+    INDICE_ITENS_DISPONIVEL = True
+except ImportError as e:
+    INDICE_ITENS_DISPONIVEL = False
+    print(f"[WARN] Índice de itens não disponível: {e}")
+
 # =================== CONFIGURAÇÕES GLOBAIS ===================
 BASE_DIR = Path(__file__).parent.resolve() if not getattr(sys, 'frozen', False) else Path(sys.executable).parent
 CONFIG_FILE = BASE_DIR / "config.json"
@@ -163,6 +204,12 @@ _ciclo_atual = 0
 _data_inicio_ciclo = None
 _dados_inseridos_oracle = False  # Rastreia se dados foram inseridos no Oracle neste ciclo
 _telegram_notifier = None  # Instância do notificador Telegram
+_idade_maxima_monitor = 1.5  # Resultado do monitor de tela mais velho que isso é ignorado (s)
+_cabecalhos_ocr = {}  # Header -> {"left", "top", "height"} na região do OCR (resolvido uma vez por sessão)
+_fila_status = None  # FilaStatusSheets da etapa 5 (escritas de Status Oracle em lote)
+_spreadsheet_id_oracle = None  # Planilha Oracle da etapa 5 (escrita direta sem a fila)
+TIMEOUT_LOCK_SHEETS = 15  # Espera máxima pela confirmação da trava PROCESSANDO... (s)
+_leitor_separacao = None  # LeitorSeparacao da etapa 5 (marca da leitura incremental entre ciclos)
 
 # ─── CACHE LOCAL ANTI-DUPLICAÇÃO (IGUAL AO RPA_ORACLE) ──────────────────────
 class CacheLocal:
@@ -174,6 +221,9 @@ class CacheLocal:
         self.arquivo = os.path.join(data_path, arquivo)
         self.dados = self._carregar()
         self.lock = threading.Lock()
+        # Serializa as gravações: marcar_concluido também roda na thread da
+        # fila de status, e a gravação mais nova precisa ser a última no disco
+        self.lock_salvar = threading.Lock()
         # Criar arquivo vazio se não existir
         if not os.path.exists(self.arquivo) and not self.dados:
             self._salvar()
@@ -190,29 +240,29 @@ class CacheLocal:
         return {}
 
     def _salvar(self):
-        """Salva cache no disco SEM lock para evitar deadlock (igual RPA_Oracle)"""
+        """Salva cache no disco (chamar FORA do self.lock: o snapshot é feito sob ele)"""
+        # Temporário próprio da thread (duas threads nunca escrevem no mesmo .tmp)
+        temp_arquivo = f"{self.arquivo}.{threading.get_ident()}.tmp"
         try:
-            # Converter dados para JSON string primeiro (para detectar erros de serialização)
-            json_str = json.dumps(self.dados, indent=2, ensure_ascii=False)
-
-            # Salvar em arquivo temporário primeiro
-            temp_arquivo = self.arquivo + ".tmp"
-            with open(temp_arquivo, 'w', encoding='utf-8') as f:
-                f.write(json_str)
-                f.flush()
-                os.fsync(f.fileno())  # Garantir que foi escrito no disco
-
-            # Substituir arquivo original pelo temporário
-            if os.path.exists(self.arquivo):
+            with self.lock_salvar:
+                # Converter dados para JSON string primeiro (para detectar erros de serialização)
+                # Snapshot sob o lock: outra thread pode estar alterando self.dados
+                with self.lock:
+                    json_str = json.dumps(self.dados, indent=2, ensure_ascii=False)
+
+                # Salvar em arquivo temporário primeiro
+                with open(temp_arquivo, 'w', encoding='utf-8') as f:
+                    f.write(json_str)
+                    f.flush()
+                    os.fsync(f.fileno())  # Garantir que foi escrito no disco
+
+                # Substituir arquivo original pelo temporário
                 os.replace(temp_arquivo, self.arquivo)
-            else:
-                os.rename(temp_arquivo, self.arquivo)
 
         except Exception as e:
             gui_log(f"[ERRO] Falha ao salvar cache: {e}")
             # Tentar limpar arquivo temporário se existir
             try:
-                temp_arquivo = self.arquivo + ".tmp"
                 if os.path.exists(temp_arquivo):
                     os.remove(temp_arquivo)
             except:
@@ -520,7 +570,47 @@ def corrigir_confusao_ocr(texto):
 
     return texto
 
-def verificar_campo_ocr(x, y, largura, altura, valor_esperado, nome_campo="Campo", salvar_debug=False):
+def carregar_indice_itens(caminho_xlsx=None):
+    """
+    Monta (em segundo plano) o índice de códigos de ITEM a partir do
+    snapshot da Bancada em out/ (None = o mais recente).
+    """
+    if not INDICE_ITENS_DISPONIVEL:
+        return
+
+    def _carregar():
+        indice = indice_itens.carregar_indice(BASE_DIR / "out", caminho_xlsx)
+        if indice is not None:
+            gui_log(f"📇 [ÍNDICE] {len(indice):,} códigos de item carregados de {Path(indice.origem).name}")
+
+    threading.Thread(target=_carregar, daemon=True).start()
+
+def corrigir_item_ocr(texto):
+    """
+    Ajusta a leitura de OCR de um ITEM ao código válido mais próximo (índice
+    da Bancada). Sem índice carregado, usa corrigir_confusao_ocr().
+
+    Returns:
+        str: Código ajustado (ou a leitura, se ambígua / sem candidato)
+    """
+    if not texto:
+        return texto
+
+    ajuste = indice_itens.ajustar_item(texto) if INDICE_ITENS_DISPONIVEL else None
+    if ajuste is None:
+        return corrigir_confusao_ocr(texto)
+
+    if ajuste.ajustado:
+        gui_log(f"🔧 [OCR ÍNDICE] '{ajuste.lido}' → '{ajuste.codigo}' (distância {ajuste.distancia})")
+        return ajuste.codigo
+    if ajuste.ambiguo:
+        gui_log(f"⚠️ [OCR ÍNDICE] '{ajuste.lido}' ambíguo: {[c for _, c in ajuste.candidatos]}")
+    return texto
+
+def _eh_campo_item(nome_campo):
+    return str(nome_campo).strip().lower() in ("item", "campo_item")
+
+def verificar_campo_ocr(x, y, largura, altura, valor_esperado, nome_campo="Campo", salvar_debug=False, perfil=None):
     """
     Captura região da tela e usa OCR para verificar se o valor está correto.
 
@@ -528,14 +618,16 @@ def verificar_campo_ocr(x, y, largura, altura, valor_esperado, nome_campo="Campo
         x, y: Coordenadas do canto superior esquerdo do campo
         largura, altura: Dimensões da região a capturar
         valor_esperado: Texto que deveria estar no campo
-        nome_campo: Nome do campo para logs
+        nome_campo: Nome do campo para logs (também escolhe o perfil em "perfis_ocr")
         salvar_debug: Se True, salva screenshot para debug (apenas em modo teste)
+        perfil: Perfil de OCR (whitelist, psm, oem, escala). None = perfil do
+                config para nome_campo, ou reconhecimento genérico
 
     Returns:
         tuple: (sucesso: bool, texto_lido: str, confianca: float)
     """
     if not PYTESSERACT_DISPONIVEL:
-        gui_log("⚠️ [OCR] pytesseract não disponível, pulando validação visual")
+        gui_log("⚠️ [OCR] Motor OCR não disponível, pulando validação visual")
         return (True, "", 0.0)
 
     try:
@@ -551,23 +643,63 @@ def verificar_campo_ocr(x, y, largura, altura, valor_esperado, nome_campo="Campo
         enhancer = ImageEnhance.Contrast(screenshot_processado)
         screenshot_processado = enhancer.enhance(2.0)
 
-        # Extrair texto com pytesseract
-        texto = pytesseract.image_to_string(screenshot_processado, config='--psm 7').strip()
+        # Um único reconhecimento: texto + confiança por palavra
+        if perfil is None:
+            perfil = motor_ocr.perfil_campo(nome_campo)
+        resultado_ocr = motor_ocr.reconhecer(screenshot_processado, psm=7, perfil=perfil)
+        if resultado_ocr is None:
+            return (True, "", 0.0)
 
-        # Tentar obter confiança (se disponível)
-        try:
-            ocr_data = pytesseract.image_to_data(screenshot_processado, output_type=pytesseract.Output.DICT)
-            confiancas = [int(c) for c in ocr_data['conf'] if c != -1]
-            confianca = sum(confiancas) / len(confiancas) if confiancas else 0
-        except:
-            confianca = 0
+        texto = resultado_ocr.texto
+        if _eh_campo_item(nome_campo):
+            texto = corrigir_item_ocr(texto)
 
-        return (True, texto, confianca)
+        return (True, texto, resultado_ocr.confianca)
 
     except Exception as e:
         gui_log(f"⚠️ [OCR] Erro ao ler campo {nome_campo}: {e}")
         return (False, "", 0.0)
 
+def verificar_campos_ocr(campos, salvar_debug=False):
+    """
+    Versão em LOTE de verificar_campo_ocr(): uma captura, uma composição com
+    todos os recortes e UM reconhecimento para todos os campos.
+
+    Args:
+        campos: dict nome -> (x, y, largura, altura) (ex: coords_validacao)
+        salvar_debug: Se True, salva a faixa capturada (apenas em modo teste)
+
+    Returns:
+        dict: nome -> (sucesso: bool, texto_lido: str, confianca: float)
+    """
+    if not PYTESSERACT_DISPONIVEL:
+        gui_log("⚠️ [OCR] Motor OCR não disponível, pulando validação visual")
+        return {nome: (True, "", 0.0) for nome in campos}
+
+    try:
+        imagem = None
+        if salvar_debug and MODO_TESTE:
+            esquerda = min(c[0] for c in campos.values())
+            topo = min(c[1] for c in campos.values())
+            direita = max(c[0] + c[2] for c in campos.values())
+            base = max(c[1] + c[3] for c in campos.values())
+            imagem = ImageGrab.grab(bbox=(esquerda, topo, direita, base))
+            imagem.save("debug_ocr_campos_lote.png")
+            gui_log("[DEBUG] Screenshot salvo: debug_ocr_campos_lote.png")
+
+        resultados = motor_ocr.reconhecer_campos(campos, imagem=imagem)
+        if not resultados:
+            return {nome: (True, "", 0.0) for nome in campos}
+
+        return {
+            nome: (True, corrigir_item_ocr(r.texto) if _eh_campo_item(nome) else r.texto, r.confianca)
+            for nome, r in resultados.items()
+        }
+
+    except Exception as e:
+        gui_log(f"⚠️ [OCR] Erro ao ler campos em lote: {e}")
+        return {nome: (False, "", 0.0) for nome in campos}
+
 def validar_campos_oracle_ocr(coords, item, quantidade, referencia, sub_o, end_o, sub_d, end_d, salvar_debug=False):
     """
     Valida visualmente se os campos do Oracle foram preenchidos (NÃO VAZIOS) usando OCR.
@@ -575,6 +707,10 @@ def validar_campos_oracle_ocr(coords, item, quantidade, referencia, sub_o, end_o
     SIMPLIFICADO: Apenas verifica se os campos contêm ALGUM texto, sem comparar valores.
     Isso evita falsos positivos de OCR (£ vs E, o vs 0, 4 vs A, etc).
 
+    A etapa 5 NÃO usa esta função (usa validador_hibrido, com as coordenadas
+    de campos_oracle_validacao): o cache dos headers (_cabecalhos_ocr /
+    "ocr_cabecalhos") só vale para esta validação avulsa.
+
     Args:
         coords: Dicionário com coordenadas dos campos
         item, quantidade, referencia, sub_o, end_o, sub_d, end_d: Valores esperados (apenas para referência COD)
@@ -586,7 +722,7 @@ def validar_campos_oracle_ocr(coords, item, quantidade, referencia, sub_o, end_o
             - tipo_erro: "COD_VAZIO" se COD com campos DESTINO vazios, "" se passou
     """
     if not PYTESSERACT_DISPONIVEL:
-        gui_log("⚠️ [OCR] pytesseract não disponível, pulando validação visual")
+        gui_log("⚠️ [OCR] Motor OCR não disponível, pulando validação visual")
         return (True, "")
 
     gui_log("🔍 [OCR] Iniciando validação visual - APENAS verificando se campos NÃO estão VAZIOS...")
@@ -595,6 +731,8 @@ def validar_campos_oracle_ocr(coords, item, quantidade, referencia, sub_o, end_o
     gui_log("    ✓ Detecta campos vazios que deveriam estar preenchidos")
     gui_log("    ✓ Para referência COD: valida campos DESTINO preenchidos")
 
+    global _cabecalhos_ocr
+
     try:
         # Detectar se é referência COD (precisa validar campos DESTINO)
         eh_cod = referencia and referencia.upper().strip().startswith("COD")
@@ -612,8 +750,18 @@ def validar_campos_oracle_ocr(coords, item, quantidade, referencia, sub_o, end_o
         LARGURA_TOTAL = 1236
         ALTURA_TOTAL = 130
 
+        headers_validacao = ["Item", "Quantidade", "Referência", "Subinvent.", "Endereço", "Para Subinv.", "Para Loc."]
+
+        # Headers já resolvidos (sessão ou config): OCR só da faixa de valores abaixo deles
+        layout_em_cache = all(h in _cabecalhos_ocr for h in headers_validacao)
+        if layout_em_cache:
+            topo_faixa = min(c["top"] + c["height"] for c in _cabecalhos_ocr.values())
+            gui_log(f"[OCR] ♻️ Headers em cache - lendo só a faixa de valores (y >= {topo_faixa})")
+        else:
+            topo_faixa = 0
+
         # Capturar imagem
-        screenshot = ImageGrab.grab(bbox=(X_INICIO, Y_INICIO, X_INICIO + LARGURA_TOTAL, Y_INICIO + ALTURA_TOTAL))
+        screenshot = ImageGrab.grab(bbox=(X_INICIO, Y_INICIO + topo_faixa, X_INICIO + LARGURA_TOTAL, Y_INICIO + ALTURA_TOTAL))
         if salvar_debug:
             screenshot.save("debug_ocr_campos.png")
 
@@ -625,11 +773,15 @@ def validar_campos_oracle_ocr(coords, item, quantidade, referencia, sub_o, end_o
 
         # OCR com detecção de posição
         import pandas as pd
-        ocr_data = pytesseract.image_to_data(screenshot_processado, config='--psm 6', output_type=pytesseract.Output.DICT)
-        df_ocr = pd.DataFrame(ocr_data)
+        resultado_ocr = motor_ocr.reconhecer(screenshot_processado, psm=6)
+        if resultado_ocr is None:
+            gui_log("⚠️ [OCR] Motor OCR não iniciou, pulando validação visual")
+            return (True, "")
+        df_ocr = pd.DataFrame(resultado_ocr.como_dict())
         df_ocr = df_ocr[df_ocr['conf'] != -1]
-        df_ocr['text'] = df_ocr['text'].str.strip()
+        df_ocr['text'] = df_ocr['text'].astype(str).str.strip()
         df_ocr = df_ocr[df_ocr['text'] != '']
+        df_ocr['top'] = df_ocr['top'] + topo_faixa  # coordenadas da região inteira
 
         gui_log(f"[OCR] 📊 Total de palavras detectadas: {len(df_ocr)}")
 
@@ -639,16 +791,27 @@ def validar_campos_oracle_ocr(coords, item, quantidade, referencia, sub_o, end_o
         gui_log(f"[OCR] Exemplo de textos: {textos_formatados}...")
 
         # ════════════════════════════════════════════════════════════════════
-        # FUNÇÃO AUXILIAR: Buscar header no OCR
+        # LAYOUT DOS HEADERS (resolvido uma vez e reaproveitado)
         # ════════════════════════════════════════════════════════════════════
+        if not layout_em_cache:
+            textos_norm = df_ocr['text'].str.upper().str.replace(" ", "", regex=False)
+            for header_nome in headers_validacao:
+                texto_norm = header_nome.upper().replace(" ", "")
+                # Busca aproximada: um contido no outro (primeira ocorrência)
+                achados = df_ocr[[texto_norm in t or t in texto_norm for t in textos_norm]]
+                if len(achados) > 0:
+                    primeiro = achados.iloc[0]
+                    _cabecalhos_ocr[header_nome] = {
+                        "left": int(primeiro['left']), "top": int(primeiro['top']), "height": int(primeiro['height'])
+                    }
+
+            if all(h in _cabecalhos_ocr for h in headers_validacao):
+                gui_log(f"[OCR] 💾 Layout dos headers salvo para as próximas validações: "
+                        f"{ {h: (c['left'], c['top']) for h, c in _cabecalhos_ocr.items()} }")
+
         def encontrar_header(df, texto_header):
-            """Busca header no DataFrame OCR (busca aproximada)"""
-            texto_norm = texto_header.upper().replace(" ", "")
-            for _, row in df.iterrows():
-                texto_lido = str(row['text']).upper().replace(" ", "")
-                if texto_norm in texto_lido or texto_lido in texto_norm:
-                    return row
-            return None
+            """Posição do header no layout resolvido (None se não encontrado)"""
+            return _cabecalhos_ocr.get(texto_header)
 
         # ════════════════════════════════════════════════════════════════════
         # VALIDAÇÃO HÍBRIDA: Campos essenciais + Validação por maioria
@@ -755,12 +918,10 @@ def validar_campos_oracle_ocr(coords, item, quantidade, referencia, sub_o, end_o
                 ]
 
                 # Filtrar textos que não sejam parte do header
-                textos_validos = []
-                for _, row in valores_abaixo.iterrows():
-                    texto = str(row['text']).strip().upper()
-                    # Ignorar se for parte do header
-                    if texto not in ['PARA', 'SUBINV', 'SUBINV.', 'LOC', 'LOC.']:
-                        textos_validos.append(row['text'])
+                partes_header = ['PARA', 'SUBINV', 'SUBINV.', 'LOC', 'LOC.']
+                textos_validos = valores_abaixo[
+                    ~valores_abaixo['text'].str.strip().str.upper().isin(partes_header)
+                ]['text'].tolist()
 
                 if len(textos_validos) > 0:
                     gui_log(f"  ✅ '{header_nome}': OK (valores: {textos_validos[:2]})")
@@ -825,6 +986,11 @@ def validar_campos_oracle_ocr(coords, item, quantidade, referencia, sub_o, end_o
             for erro in erros_finais:
                 gui_log(f"   - {erro}")
 
+            # Layout em cache pode ter ficado velho (janela movida): resolver de novo na próxima
+            if layout_em_cache:
+                gui_log("[OCR] 🔄 Descartando layout dos headers em cache (será resolvido na próxima validação)")
+                _cabecalhos_ocr = {}
+
             # Detectar tipo de erro
             tipo_erro = "COD_VAZIO" if eh_cod and any("vazio" in e.lower() for e in erros_finais) else "OUTRO"
             return (False, tipo_erro)
@@ -992,6 +1158,63 @@ def aguardar_com_pausa(segundos, mensagem="Aguardando", evitar_hibernar=False):
 
     return True
 
+def resultado_monitor_tela():
+    """
+    Último resultado do monitor de tela em segundo plano, se estiver rodando
+    e o resultado for recente (config "monitor_tela" -> "idade_maxima").
+
+    Returns:
+        ResultadoTela ou None (None = sem monitor, fazer a detecção na hora)
+    """
+    if not DETECTOR_TELA_DISPONIVEL:
+        return None
+
+    monitor = detector_tela.obter_monitor()
+    if monitor is None:
+        return None
+
+    return monitor.estado_atual(idade_maxima=_idade_maxima_monitor)
+
+def aguardar_telas(nomes, timeout, parar_em=None):
+    """
+    Espera algum template de parar_em aparecer (ou timeout) e retorna o
+    ResultadoTela com todos os templates de nomes.
+
+    Com o monitor de tela rodando, só espera o evento (sem capturar nesta
+    thread). Sem monitor, usa detector_tela.aguardar_deteccao().
+    """
+    if parar_em is None:
+        parar_em = nomes
+
+    monitor = detector_tela.obter_monitor()
+    if monitor is not None and all(nome in monitor.nomes for nome in nomes):
+        resultado = monitor.aguardar(parar_em, timeout, cancelar=lambda: not _rpa_running)
+        if resultado is not None:
+            return resultado
+
+    return aguardar_deteccao(nomes, timeout=timeout, parar_em=parar_em)
+
+def aguardar_estado_tela(timeout, parar_em=None, confianca_minima=None):
+    """
+    Espera a tela do Oracle chegar a um estado conhecido e o classifica
+    (formulário, qtd negativa, erro de produto, timeout, queda de rede ou
+    desconhecido). Um único timeout no lugar da soma das verificações.
+
+    Args:
+        timeout: Tempo máximo em segundos
+        parar_em: Templates que encerram a espera (None = qualquer estado conhecido)
+        confianca_minima: dict estado -> score mínimo (ex: qtd negativa a 0.8
+                          onde a detecção leva a apertar ENTER)
+
+    Returns:
+        detector_tela.EstadoOracle
+    """
+    nomes = [nome for _, nome in detector_tela.ESTADOS_ORACLE]
+    resultado = aguardar_telas(nomes, timeout, parar_em=parar_em)
+    estado = detector_tela.classificar_estado(resultado, confianca_minima)
+    gui_log(f"🖼️ [ESTADO] {estado.estado} (confiança {estado.confianca:.2%}) | {resultado}")
+    return estado
+
 def aguardar_salvamento_concluido(timeout_travamento=120, intervalo_check=0.5):
     """
     Aguarda o salvamento ser concluído após Ctrl+S.
@@ -1045,15 +1268,21 @@ def aguardar_salvamento_concluido(timeout_travamento=120, intervalo_check=0.5):
         gui_log(f"🛑 [SALVAMENTO] RPA PARADO pelo usuário após {tempo_total:.1f}s")
         return False, "RPA_PARADO", tempo_total
 
+    gui_log("🔍 [SALVAMENTO] Verificando tela (tentativa 1/2)...")
+    if DETECTOR_TELA_DISPONIVEL:
+        # Uma captura por tentativa para queda de rede + tela de transferência
+        resultado_tela = aguardar_telas(["queda_rede", "tela_transferencia"], timeout=3)
+        tela_correta = resultado_tela.encontrado("tela_transferencia")
+    else:
+        resultado_tela = None
+        tela_correta = detectar_imagem_opencv(caminho_tela_transferencia, confidence=0.8, timeout=3)
+
     # Verificar queda de rede
-    if verificar_queda_rede():
+    if verificar_queda_rede(resultado_tela):
         tempo_total = time.time() - tempo_inicio
         gui_log(f"❌ [SALVAMENTO] QUEDA DE REDE detectada após {tempo_total:.1f}s")
         return False, "QUEDA_REDE", tempo_total
 
-    gui_log("🔍 [SALVAMENTO] Verificando tela (tentativa 1/2)...")
-    tela_correta = detectar_imagem_opencv(caminho_tela_transferencia, confidence=0.8, timeout=3)
-
     if tela_correta:
         tempo_total = time.time() - tempo_inicio
         gui_log(f"✅ [SALVAMENTO] Tela correta detectada! Salvamento confirmado em {tempo_total:.1f}s")
@@ -1064,7 +1293,16 @@ def aguardar_salvamento_concluido(timeout_travamento=120, intervalo_check=0.5):
     # ═══════════════════════════════════════════════════════════════
     gui_log("⚠️ [SALVAMENTO] Tela não detectada na tentativa 1")
     gui_log("⏳ [SALVAMENTO] Aguardando mais 30 segundos...")
-    time.sleep(30)
+    monitor = detector_tela.obter_monitor() if DETECTOR_TELA_DISPONIVEL else None
+    if monitor is not None:
+        # Monitor em segundo plano: encerra a espera assim que a tela voltar
+        # (ou a rede cair / RPA parar), sem esperar os 30s inteiros
+        resultado_espera = monitor.aguardar(["queda_rede", "tela_transferencia"], timeout=30,
+                                            cancelar=lambda: not _rpa_running)
+        if resultado_espera is not None and resultado_espera.encontrados():
+            gui_log(f"[SALVAMENTO] 🖼️ Monitor detectou: {', '.join(resultado_espera.encontrados())}")
+    else:
+        time.sleep(30)
 
     # Verificar se RPA foi parado
     if not _rpa_running:
@@ -1072,15 +1310,21 @@ def aguardar_salvamento_concluido(timeout_travamento=120, intervalo_check=0.5):
         gui_log(f"🛑 [SALVAMENTO] RPA PARADO pelo usuário após {tempo_total:.1f}s")
         return False, "RPA_PARADO", tempo_total
 
+    gui_log("🔍 [SALVAMENTO] Verificando tela (tentativa 2/2)...")
+    if DETECTOR_TELA_DISPONIVEL:
+        # Uma captura por tentativa para queda de rede + tela de transferência
+        resultado_tela = aguardar_telas(["queda_rede", "tela_transferencia"], timeout=3)
+        tela_correta = resultado_tela.encontrado("tela_transferencia")
+    else:
+        resultado_tela = None
+        tela_correta = detectar_imagem_opencv(caminho_tela_transferencia, confidence=0.8, timeout=3)
+
     # Verificar queda de rede
-    if verificar_queda_rede():
+    if verificar_queda_rede(resultado_tela):
         tempo_total = time.time() - tempo_inicio
         gui_log(f"❌ [SALVAMENTO] QUEDA DE REDE detectada após {tempo_total:.1f}s")
         return False, "QUEDA_REDE", tempo_total
 
-    gui_log("🔍 [SALVAMENTO] Verificando tela (tentativa 2/2)...")
-    tela_correta = detectar_imagem_opencv(caminho_tela_transferencia, confidence=0.8, timeout=3)
-
     if tela_correta:
         tempo_total = time.time() - tempo_inicio
         gui_log(f"✅ [SALVAMENTO] Tela correta detectada! Salvamento confirmado em {tempo_total:.1f}s")
@@ -1091,6 +1335,7 @@ def aguardar_salvamento_concluido(timeout_travamento=120, intervalo_check=0.5):
     # ═══════════════════════════════════════════════════════════════
     tempo_total = time.time() - tempo_inicio
     gui_log(f"❌ [SALVAMENTO] FALHOU - Tela não voltou ao estado correto após {tempo_total:.1f}s")
+    salvar_debug_tela(resultado_tela)
 
     # Notificar via Telegram
     try:
@@ -1099,36 +1344,41 @@ def aguardar_salvamento_concluido(timeout_travamento=120, intervalo_check=0.5):
                 f"TELA DIVERGENTE\n\n"
                 f"A tela não voltou ao estado esperado após salvamento.\n"
                 f"Tempo esperado: {tempo_total:.1f}s\n\n"
-                f"Verifique os arquivos debug_*.png para análise."
+                f"Verifique os arquivos debug_* para análise."
             )
     except:
         pass
 
     return False, "TRAVADO", tempo_total
 
-def detectar_imagem_opencv(caminho_imagem, confidence=0.8, timeout=5, salvar_debug=True):
+def detectar_imagem_opencv(caminho_imagem, confidence=0.8, timeout=5, salvar_debug=True, modo=None):
     """
     Detecta imagem na tela usando OpenCV com MULTI-ESCALA
     Procura a imagem mesmo se estiver em tamanho diferente
 
+    Para verificar VÁRIAS telas de uma vez (uma única captura), prefira
+    detector_tela.analisar_tela() / aguardar_deteccao().
+
     Args:
         caminho_imagem: Caminho da imagem a ser detectada
         confidence: Confiança mínima (0.0 a 1.0)
         timeout: Tempo máximo de tentativas em segundos
         salvar_debug: Se True, salva screenshots para debug
+        modo: "normal" (BGR resolução cheia) ou "rapido" (cinza reduzido +
+              confirmação em resolução cheia). None = config "deteccao_imagens"
 
     Returns:
         bool: True se encontrou a imagem, False caso contrário
     """
-    if not OPENCV_DISPONIVEL:
+    if not OPENCV_DISPONIVEL or not DETECTOR_TELA_DISPONIVEL:
         return False
 
     if not os.path.isfile(caminho_imagem):
         return False
 
     try:
-        # Carregar a imagem de referência
-        template = cv2.imread(caminho_imagem)
+        # Carregar a imagem de referência (cache do processo - lida uma única vez)
+        template = detector_tela.carregar_template(caminho_imagem)
         if template is None:
             return False
 
@@ -1138,109 +1388,57 @@ def detectar_imagem_opencv(caminho_imagem, confidence=0.8, timeout=5, salvar_deb
         gui_log(f"[OPENCV] 🔍 Iniciando detecção de: {nome_imagem}")
         gui_log(f"[OPENCV]    Dimensões template: {template_w}x{template_h}")
         gui_log(f"[OPENCV]    Confiança mínima: {confidence:.2%}")
+        gui_log(f"[OPENCV]    Modo: {modo or detector_tela.MODO_MATCHING}")
 
         inicio = time.time()
         tentativa = 0
         ultima_screenshot = None
         ultimo_template_usado = None
         melhor_score_global = 0
+        reaproveitados_inicio = detector_tela.ESTATISTICAS["reaproveitados"]
 
         while time.time() - inicio < timeout:
             tentativa += 1
 
-            # Capturar screenshot da tela
-            screenshot = ImageGrab.grab()
-            screenshot_np = np.array(screenshot)
-            screenshot_bgr = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
+            # Capturar screenshot da tela (uma captura por tentativa)
+            screenshot_bgr = detector_tela.capturar_tela()
 
             screen_h, screen_w = screenshot_bgr.shape[:2]
 
             if tentativa == 1:
                 gui_log(f"[OPENCV]    Dimensões tela: {screen_w}x{screen_h}")
+                if template_w > screen_w or template_h > screen_h:
+                    gui_log(f"[OPENCV] ⚠️ Template maior que a tela ({template_w}x{template_h}) - será redimensionado")
 
             # Guardar screenshot para debug
-            ultima_screenshot = screenshot_bgr.copy()
-
-            # Verificar se template é maior que a tela
-            if template_w > screen_w or template_h > screen_h:
-                # Redimensionar template para caber na tela
-                scale = min(screen_w / template_w, screen_h / template_h) * 0.95
-                new_w = int(template_w * scale)
-                new_h = int(template_h * scale)
-                template_scaled = cv2.resize(template, (new_w, new_h))
-                if tentativa == 1:
-                    gui_log(f"[OPENCV] ⚠️ Template redimensionado: {template_w}x{template_h} -> {new_w}x{new_h}")
-            else:
-                template_scaled = template
-
-            ultimo_template_usado = template_scaled.copy()
-
-            # Fazer o template matching
-            result = cv2.matchTemplate(screenshot_bgr, template_scaled, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-
-            if max_val > melhor_score_global:
-                melhor_score_global = max_val
-
-            # Se a confiança for maior que o threshold
-            if max_val >= confidence:
-                gui_log(f"[OPENCV] ✅ Imagem detectada! Confiança: {max_val:.2%} (tentativa {tentativa})")
-
-                # Salvar debug apenas em caso de SUCESSO (se habilitado)
-                if salvar_debug:
-                    try:
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        debug_path_tela = f"debug_tela_atual_SUCESSO_{timestamp}.png"
-                        cv2.imwrite(debug_path_tela, ultima_screenshot)
-                        gui_log(f"[DEBUG] ✅ Tela salva em: {debug_path_tela}")
-                    except:
-                        pass
+            ultima_screenshot = screenshot_bgr
+
+            # Template matching multi-escala (variantes cacheadas + região/último acerto)
+            variantes = detector_tela.obter_variantes(caminho_imagem, screen_w, screen_h)
+            deteccao = detector_tela.localizar_no_frame(screenshot_bgr, caminho_imagem, confidence, modo=modo)
+            escalas_usadas = dict(variantes["escalas"])
+            escalas_usadas[variantes["base"][0]] = variantes["base"][1]
+            ultimo_template_usado = escalas_usadas.get(deteccao["escala"], template)
+
+            if deteccao["score"] > melhor_score_global:
+                melhor_score_global = deteccao["score"]
+
+            if deteccao["encontrado"]:
+                gui_log(f"[OPENCV] ✅ Imagem detectada (escala {deteccao['escala']:.1f})! Confiança: {deteccao['score']:.2%} (tentativa {tentativa})")
+
+                # Salvar debug de SUCESSO (em segundo plano, se habilitado)
+                if salvar_debug and ARTEFATOS_DEBUG_DISPONIVEL:
+                    debug_path_tela = obter_gravador().salvar(
+                        "debug_tela_atual_SUCESSO", ultima_screenshot, chave=nome_imagem, falha=False,
+                        score=deteccao["score"]
+                    )
+                    if debug_path_tela:
+                        gui_log(f"[DEBUG] ✅ Tela será salva em: {debug_path_tela}")
 
                 return True
 
-            # Se não encontrou mas template é diferente do tamanho da tela, tentar multi-escala
-            if max_val < confidence and (template_w != screen_w or template_h != screen_h):
-                # Tentar diferentes escalas
-                melhor_score = max_val
-                melhor_escala = 1.0
-
-                for escala in [0.7, 0.8, 0.9, 1.0, 1.1, 1.2]:
-                    new_w = int(template_w * escala)
-                    new_h = int(template_h * escala)
-
-                    # Pular se ficar maior que a tela
-                    if new_w > screen_w or new_h > screen_h:
-                        continue
-
-                    template_test = cv2.resize(template, (new_w, new_h))
-                    result_test = cv2.matchTemplate(screenshot_bgr, template_test, cv2.TM_CCOEFF_NORMED)
-                    _, max_val_test, _, _ = cv2.minMaxLoc(result_test)
-
-                    if max_val_test > melhor_score:
-                        melhor_score = max_val_test
-                        melhor_escala = escala
-                        ultimo_template_usado = template_test.copy()
-
-                    if max_val_test >= confidence:
-                        gui_log(f"[OPENCV] ✅ Imagem detectada (escala {escala:.1f})! Confiança: {max_val_test:.2%}")
-
-                        # Salvar debug apenas em caso de SUCESSO (se habilitado)
-                        if salvar_debug:
-                            try:
-                                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                debug_path_tela = f"debug_tela_atual_SUCESSO_{timestamp}.png"
-                                cv2.imwrite(debug_path_tela, ultima_screenshot)
-                                gui_log(f"[DEBUG] ✅ Tela salva em: {debug_path_tela}")
-                            except:
-                                pass
-
-                        return True
-
-                if melhor_score > melhor_score_global:
-                    melhor_score_global = melhor_score
-
-                if tentativa == 1 or tentativa % 5 == 0:
-                    gui_log(f"[OPENCV] Tentativa {tentativa}: Melhor score = {melhor_score:.2%} (esperado >= {confidence:.2%})")
+            if tentativa == 1 or tentativa % 5 == 0:
+                gui_log(f"[OPENCV] Tentativa {tentativa}: Melhor score = {deteccao['score']:.2%} (esperado >= {confidence:.2%})")
 
             # Aguardar um pouco antes da próxima tentativa
             time.sleep(0.3)
@@ -1250,49 +1448,18 @@ def detectar_imagem_opencv(caminho_imagem, confidence=0.8, timeout=5, salvar_deb
         # ═══════════════════════════════════════════════════════════════
         gui_log(f"[OPENCV] ❌ Imagem NÃO detectada após {timeout}s")
         gui_log(f"[OPENCV] 📊 Melhor confiança alcançada: {melhor_score_global:.2%} (esperado >= {confidence:.2%})")
-
-        if salvar_debug and ultima_screenshot is not None:
-            try:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-                # Salvar tela capturada
-                debug_path_tela = f"debug_tela_atual_{timestamp}.png"
-                cv2.imwrite(debug_path_tela, ultima_screenshot)
-                gui_log(f"[DEBUG] 💾 Tela capturada salva: {debug_path_tela}")
-
-                # Salvar template usado
-                if ultimo_template_usado is not None:
-                    debug_path_template = f"debug_template_usado_{timestamp}.png"
-                    cv2.imwrite(debug_path_template, ultimo_template_usado)
-                    gui_log(f"[DEBUG] 💾 Template usado salvo: {debug_path_template}")
-
-                # Criar imagem comparativa lado a lado
-                try:
-                    # Redimensionar para mesma altura
-                    h1, w1 = ultima_screenshot.shape[:2]
-                    h2, w2 = ultimo_template_usado.shape[:2]
-
-                    if h1 > h2:
-                        scale = h1 / h2
-                        new_w2 = int(w2 * scale)
-                        template_resized = cv2.resize(ultimo_template_usado, (new_w2, h1))
-                        comparacao = np.hstack([ultima_screenshot, template_resized])
-                    else:
-                        scale = h2 / h1
-                        new_w1 = int(w1 * scale)
-                        screen_resized = cv2.resize(ultima_screenshot, (new_w1, h2))
-                        comparacao = np.hstack([screen_resized, ultimo_template_usado])
-
-                    debug_path_comp = f"debug_comparacao_{timestamp}.png"
-                    cv2.imwrite(debug_path_comp, comparacao)
-                    gui_log(f"[DEBUG] 💾 Comparação salva: {debug_path_comp}")
-                except Exception as e:
-                    gui_log(f"[DEBUG] ⚠️ Erro ao criar comparação: {e}")
-
-                gui_log(f"[DEBUG] 📁 Verifique os arquivos debug_*.png na pasta do executável")
-
-            except Exception as e:
-                gui_log(f"[DEBUG] ⚠️ Erro ao salvar debug: {e}")
+        reaproveitados = detector_tela.ESTATISTICAS["reaproveitados"] - reaproveitados_inicio
+        if reaproveitados:
+            gui_log(f"[OPENCV] ♻️ {reaproveitados}/{tentativa} tentativas com tela inalterada (resultado reaproveitado)")
+
+        if salvar_debug and ARTEFATOS_DEBUG_DISPONIVEL and ultima_screenshot is not None:
+            # Tela + template usado + comparação lado a lado (gravados em segundo plano)
+            caminhos = obter_gravador().salvar_falha_deteccao(ultima_screenshot, ultimo_template_usado, chave=nome_imagem,
+                                                              score=melhor_score_global)
+            for caminho in caminhos:
+                gui_log(f"[DEBUG] 💾 Será salvo: {caminho}")
+            if caminhos:
+                gui_log(f"[DEBUG] 📁 Verifique os arquivos debug_* em {obter_gravador().pasta}")
 
         return False
 
@@ -1302,13 +1469,33 @@ def detectar_imagem_opencv(caminho_imagem, confidence=0.8, timeout=5, salvar_deb
         gui_log(f"[OPENCV] Stack: {traceback.format_exc()}")
         return False
 
-def verificar_e_fechar_modal_qtd_negativa(timeout=3, fazer_ctrl_s=False):
+def salvar_debug_tela(resultado_tela, prefixo="debug_tela_atual"):
+    """
+    Salva o frame analisado pelo detector_tela (para investigar falhas)
+
+    Args:
+        resultado_tela: ResultadoTela retornado por analisar_tela/aguardar_deteccao
+        prefixo: Prefixo do arquivo gerado
+    """
+    if resultado_tela is None or resultado_tela.frame is None or not ARTEFATOS_DEBUG_DISPONIVEL:
+        return
+
+    gui_log(f"[DEBUG] 📊 Scores: {resultado_tela}")
+    melhor_score = max((d["score"] for d in resultado_tela.deteccoes.values()), default=None)
+    debug_path_tela = obter_gravador().salvar(prefixo, resultado_tela.frame, chave=prefixo, falha=True,
+                                              score=melhor_score)
+    if debug_path_tela:
+        gui_log(f"[DEBUG] 💾 Tela capturada será salva: {debug_path_tela}")
+
+def verificar_e_fechar_modal_qtd_negativa(timeout=3, fazer_ctrl_s=False, resultado_tela=None):
     """
     Verifica se o modal de quantidade negativa apareceu e fecha com ENTER
 
     Args:
         timeout: Tempo máximo para procurar o modal (padrão: 3 segundos)
         fazer_ctrl_s: Se True, faz Ctrl+S após fechar modal (padrão: False)
+        resultado_tela: ResultadoTela já capturado (opcional). Se informado,
+                        apenas consulta o resultado, sem nova captura
 
     Returns:
         bool: True se modal foi detectado e fechado, False caso contrário
@@ -1318,13 +1505,16 @@ def verificar_e_fechar_modal_qtd_negativa(timeout=3, fazer_ctrl_s=False):
     """
     global _rpa_running
 
-    caminho = os.path.join(base_path, "informacoes", "qtd_negativa.png")
+    if resultado_tela is not None:
+        encontrado = resultado_tela.encontrado("qtd_negativa")
+    else:
+        caminho = os.path.join(base_path, "informacoes", "qtd_negativa.png")
 
-    if not os.path.isfile(caminho):
-        return False
+        if not os.path.isfile(caminho):
+            return False
 
-    # Tentar detectar com OpenCV (múltiplas tentativas durante timeout)
-    encontrado = detectar_imagem_opencv(caminho, confidence=0.75, timeout=timeout)
+        # Tentar detectar com OpenCV (múltiplas tentativas durante timeout)
+        encontrado = detectar_imagem_opencv(caminho, confidence=0.75, timeout=timeout)
 
     if encontrado:
         gui_log("✅ [QTD NEG] Modal de confirmação detectado!")
@@ -1364,38 +1554,58 @@ def tratar_erro_oracle():
     else:
         gui_log("[QTD NEG] ✅ Nenhum modal de confirmação detectado")
 
-def verificar_erro_produto(service, range_str, linha_atual):
+def gravar_status_sheets(service, range_str, valor):
+    """
+    Grava uma célula de Status Oracle: pela fila da etapa 5 ou, sem fila
+    (fora da etapa 5 / fila não iniciada), direto com values().update().
+    """
+    if _fila_status is not None:
+        _fila_status.enfileirar(range_str, valor)
+        return
+    if _spreadsheet_id_oracle is None:
+        raise RuntimeError("planilha Oracle ainda não configurada (etapa 5 não iniciada)")
+    service.spreadsheets().values().update(
+        spreadsheetId=_spreadsheet_id_oracle,
+        range=range_str,
+        valueInputOption="RAW",
+        body={"values": [[valor]]}
+    ).execute()
+
+
+def verificar_erro_produto(service, range_str, linha_atual, resultado_tela=None):
     """
     Verifica se há erro de produto (ErroProduto.png) que PARA a aplicação
     Usa OpenCV para detecção mais confiável
 
+    Args:
+        resultado_tela: ResultadoTela já capturado (opcional). Se informado,
+                        apenas consulta o resultado, sem nova captura
+
     Returns:
         bool: True se detectou erro de produto (aplicação deve parar)
     """
     global _rpa_running
 
-    erro_produto_path = os.path.join(base_path, "informacoes", "ErroProduto.png")
+    if resultado_tela is not None:
+        encontrado = resultado_tela.encontrado("erro_produto")
+    else:
+        erro_produto_path = os.path.join(base_path, "informacoes", "ErroProduto.png")
 
-    if not os.path.isfile(erro_produto_path):
-        return False
+        if not os.path.isfile(erro_produto_path):
+            return False
 
-    # Detectar com OpenCV (timeout de 3 segundos, confidence 0.8 igual RPA_Oracle)
-    encontrado = detectar_imagem_opencv(erro_produto_path, confidence=0.8, timeout=3)
+        # Detectar com OpenCV (timeout de 3 segundos, confidence 0.8 igual RPA_Oracle)
+        encontrado = detectar_imagem_opencv(erro_produto_path, confidence=0.8, timeout=3)
 
     if encontrado:
         gui_log("⚠️ [ERRO PRODUTO] DETECTADO erro de produto!")
 
         # Atualizar status no Sheets
         try:
-            service.spreadsheets().values().update(
-                spreadsheetId=SPREADSHEET_ID,
-                range=range_str,
-                valueInputOption="RAW",
-                body={"values": [["PD"]]}
-            ).execute()
+            gravar_status_sheets(service, range_str, "PD")
             gui_log(f"[ERRO] Linha {linha_atual} marcada como 'PD' (pendente) por erro detectado.")
-        except:
-            pass
+        except Exception as err_up:
+            gui_log(f"[ERRO] ⚠️ Erro ao marcar linha {linha_atual} como 'PD' no Sheets: {err_up}")
 
         _rpa_running = False
         gui_log("🛑 [ERRO PRODUTO] Detectado - Robô parado!")
@@ -1404,23 +1614,34 @@ def verificar_erro_produto(service, range_str, linha_atual):
 
     return False
 
-def verificar_queda_rede():
+def verificar_queda_rede(resultado_tela=None):
     """
     Verifica se houve queda de rede/internet
     Se detectar queda_rede.png, PARA o robô imediatamente
 
+    Args:
+        resultado_tela: ResultadoTela já capturado (opcional). Se informado,
+                        apenas consulta o resultado, sem nova captura
+
     Returns:
         bool: True se detectou queda de rede (aplicação deve parar)
     """
     global _rpa_running
 
-    caminho_queda_rede = os.path.join(base_path, "informacoes", "queda_rede.png")
+    if resultado_tela is None:
+        # Monitor em segundo plano: consulta instantânea, sem bloquear
+        resultado_tela = resultado_monitor_tela()
 
-    if not os.path.isfile(caminho_queda_rede):
-        return False
+    if resultado_tela is not None:
+        encontrado = resultado_tela.encontrado("queda_rede")
+    else:
+        caminho_queda_rede = os.path.join(base_path, "informacoes", "queda_rede.png")
+
+        if not os.path.isfile(caminho_queda_rede):
+            return False
 
-    # Detectar com OpenCV (timeout curto - 1s)
-    encontrado = detectar_imagem_opencv(caminho_queda_rede, confidence=0.8, timeout=1)
+        # Detectar com OpenCV (timeout curto - 1s)
+        encontrado = detectar_imagem_opencv(caminho_queda_rede, confidence=0.8, timeout=1)
 
     if encontrado:
         gui_log("=" * 70)
@@ -1440,16 +1661,32 @@ def verificar_queda_rede():
 
     return False
 
-def verificar_tempo_oracle_rapido():
+def verificar_tempo_oracle_rapido(resultado_tela=None):
     """
     Verificação RÁPIDA de timeout do Oracle (sem logs detalhados).
     Usada em loops e pontos frequentes.
 
+    Args:
+        resultado_tela: ResultadoTela já capturado (opcional). Se informado,
+                        apenas consulta o resultado, sem nova captura
+
     Returns:
         bool: True se detectou timeout do Oracle (aplicação deve parar)
     """
     global _rpa_running
 
+    if resultado_tela is None:
+        # Monitor em segundo plano: consulta instantânea, sem bloquear
+        resultado_tela = resultado_monitor_tela()
+
+    if resultado_tela is not None:
+        if resultado_tela.encontrado("tempo_oracle"):
+            gui_log("⏱️⏱️⏱️ [TIMEOUT ORACLE] DETECTADO! Sistema Oracle expirou!")
+            gui_log("🛑 PARANDO A APLICAÇÃO - O sistema Oracle deve ser REABERTO!")
+            _rpa_running = False
+            return True
+        return False
+
     # Procurar em ambos os caminhos
     caminho_raiz = os.path.join(base_path, "tempo_oracle.png")
     caminho_info = os.path.join(base_path, "informacoes", "tempo_oracle.png")
@@ -1458,7 +1695,10 @@ def verificar_tempo_oracle_rapido():
 
     if os.path.isfile(caminho_tempo_oracle):
         try:
-            encontrado = pyautogui.locateOnScreen(caminho_tempo_oracle, confidence=0.8)
+            if DETECTOR_TELA_DISPONIVEL:
+                encontrado = detector_tela.localizar_na_tela(caminho_tempo_oracle, confidence=0.8)
+            else:
+                encontrado = pyautogui.locateOnScreen(caminho_tempo_oracle, confidence=0.8)
             if encontrado:
                 gui_log("⏱️⏱️⏱️ [TIMEOUT ORACLE] DETECTADO! Sistema Oracle expirou!")
                 gui_log("🛑 PARANDO A APLICAÇÃO - O sistema Oracle deve ser REABERTO!")
@@ -1469,7 +1709,7 @@ def verificar_tempo_oracle_rapido():
 
     return False
 
-def verificar_tempo_oracle(service, range_str, linha_atual):
+def verificar_tempo_oracle(service, range_str, linha_atual, resultado_tela=None):
     """
     Verifica se há timeout do Oracle (tempo_oracle.png) que PARA a aplicação
 
@@ -1477,6 +1717,8 @@ def verificar_tempo_oracle(service, range_str, linha_atual):
         service: Serviço do Google Sheets
         range_str: Range da célula Status Oracle
         linha_atual: Número da linha atual
+        resultado_tela: ResultadoTela já capturado (opcional). Se informado,
+                        apenas consulta o resultado, sem nova captura
 
     Returns:
         bool: True se detectou timeout do Oracle (aplicação deve parar)
@@ -1489,6 +1731,28 @@ def verificar_tempo_oracle(service, range_str, linha_atual):
 
     caminho_tempo_oracle = caminho_raiz if os.path.isfile(caminho_raiz) else caminho_info
 
+    if resultado_tela is not None:
+        gui_log(f"[TEMPO_ORACLE] Consultando captura única (score={resultado_tela.score('tempo_oracle'):.2%})")
+        if not resultado_tela.encontrado("tempo_oracle"):
+            gui_log("[TEMPO_ORACLE] ✅ Nenhum timeout detectado (imagem não encontrada)")
+            return False
+
+        gui_log(f"[TEMPO_ORACLE] 📍 Localização: {resultado_tela.posicao('tempo_oracle')}")
+        gui_log("⏱️ [TIMEOUT ORACLE] Detectado TIMEOUT DO ORACLE!")
+        gui_log("🛑 O sistema Oracle deve ser REABERTO!")
+        salvar_debug_tela(resultado_tela, "debug_tempo_oracle_tela")
+
+        try:
+            gravar_status_sheets(service, range_str, "Timeout Oracle - Reabrir sistema")
+            gui_log(f"[TEMPO_ORACLE] ✅ Linha {linha_atual} marcada como 'Timeout Oracle - Reabrir sistema'")
+        except Exception as err_up:
+            gui_log(f"[TEMPO_ORACLE] ⚠️ Erro ao marcar linha {linha_atual} no Sheets: {err_up}")
+
+        _rpa_running = False
+        gui_log("[TEMPO_ORACLE] 🔄 AÇÃO NECESSÁRIA: Reabra o sistema Oracle e execute novamente")
+        notificar_parada_telegram("TIMEOUT", f"Sistema Oracle expirou - Linha {linha_atual}")
+        return True
+
     gui_log(f"[TEMPO_ORACLE] Verificando tempo_oracle.png...")
     gui_log(f"[TEMPO_ORACLE] Caminho raiz: {caminho_raiz} - Existe: {os.path.isfile(caminho_raiz)}")
     gui_log(f"[TEMPO_ORACLE] Caminho info: {caminho_info} - Existe: {os.path.isfile(caminho_info)}")
@@ -1499,25 +1763,31 @@ def verificar_tempo_oracle(service, range_str, linha_atual):
             gui_log("[TEMPO_ORACLE] ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
             gui_log("[TEMPO_ORACLE] Iniciando verificação de timeout do Oracle...")
 
-            # Salvar screenshot ANTES de procurar (para debug)
+            # Capturar a tela uma vez: usada na busca e (se o gravador aceitar) no debug
+            frame_tela = None
             try:
-                screenshot_path = "debug_tempo_oracle_tela.png"
-                from PIL import ImageGrab
-                screenshot = ImageGrab.grab()
-                screenshot.save(screenshot_path)
-                gui_log(f"[TEMPO_ORACLE] 📸 Screenshot salvo: {screenshot_path}")
+                if DETECTOR_TELA_DISPONIVEL:
+                    frame_tela = detector_tela.capturar_tela()
+                    if ARTEFATOS_DEBUG_DISPONIVEL:
+                        screenshot_path = obter_gravador().salvar("debug_tempo_oracle_tela", frame_tela,
+                                                                  chave="tempo_oracle", falha=False)
+                        if screenshot_path:
+                            gui_log(f"[TEMPO_ORACLE] 📸 Screenshot será salvo: {screenshot_path}")
             except Exception as e_screenshot:
-                gui_log(f"[TEMPO_ORACLE] ⚠️ Não conseguiu salvar screenshot: {e_screenshot}")
+                gui_log(f"[TEMPO_ORACLE] ⚠️ Não conseguiu capturar screenshot: {e_screenshot}")
 
             gui_log(f"[TEMPO_ORACLE] 🔍 Procurando imagem na tela (confidence=0.8)...")
             gui_log(f"[TEMPO_ORACLE] 📂 Caminho da imagem: {caminho_tempo_oracle}")
 
             encontrado = None
             try:
-                encontrado = pyautogui.locateOnScreen(caminho_tempo_oracle, confidence=0.8)
+                if DETECTOR_TELA_DISPONIVEL:
+                    encontrado = detector_tela.localizar_na_tela(caminho_tempo_oracle, confidence=0.8, frame=frame_tela)
+                else:
+                    encontrado = pyautogui.locateOnScreen(caminho_tempo_oracle, confidence=0.8)
                 gui_log(f"[TEMPO_ORACLE] 🔎 Resultado da busca: {encontrado}")
             except Exception as e_locate:
-                gui_log(f"[TEMPO_ORACLE] ⚠️ Exceção no locateOnScreen: {type(e_locate).__name__}: {e_locate}")
+                gui_log(f"[TEMPO_ORACLE] ⚠️ Exceção na busca da imagem: {type(e_locate).__name__}: {e_locate}")
                 import traceback
                 gui_log(f"[TEMPO_ORACLE] Traceback:\n{traceback.format_exc()}")
 
@@ -1539,12 +1809,7 @@ def verificar_tempo_oracle(service, range_str, linha_atual):
                 # Marcar linha como "Timeout Oracle - Reabrir sistema" no Google Sheets
                 try:
                     gui_log(f"[TEMPO_ORACLE] 📝 Marcando linha {linha_atual} como 'Timeout Oracle - Reabrir sistema'...")
-                    service.spreadsheets().values().update(
-                        spreadsheetId=SPREADSHEET_ID,
-                        range=range_str,
-                        valueInputOption="RAW",
-                        body={"values": [["Timeout Oracle - Reabrir sistema"]]}
-                    ).execute()
+                    gravar_status_sheets(service, range_str, "Timeout Oracle - Reabrir sistema")
                     gui_log(f"[TEMPO_ORACLE] ✅ Linha {linha_atual} marcada como 'Timeout Oracle - Reabrir sistema'")
                 except Exception as err_up:
                     gui_log(f"[TEMPO_ORACLE] ⚠️ Erro ao marcar linha {linha_atual} no Sheets: {err_up}")
@@ -1640,6 +1905,58 @@ def etapa_03_selecionar_funcionario(config):
     tempo_espera = config["tempos_espera"]["entre_cliques"]
     return aguardar_com_pausa(tempo_espera, "Aguardando confirmação")
 
+# Lista de mensagens de erro que permitem retry na etapa 5
+# IMPORTANTE: "Tela incorreta" NÃO está aqui porque PARA o robô
+# Mas permite retry na PRÓXIMA EXECUÇÃO (não adiciona ao cache)
+MENSAGENS_ERRO_RETRY = [
+    # Erros gerais
+    "Campo vazio encontrado",
+    "Transação não autorizada",
+    "Não concluído no Oracle",
+
+    # Erros de dados
+    "Erro Oracle: dados faltantes por item não cadastrado",
+    "Dados não conferem",
+    "OCR - Dados não conferem",
+
+    # Erros de validação
+    "Erro validação: valor divergente",
+    "Erro OCR",
+    "Erro OCR - Tentar novamente",
+    "CAMPO_VAZIO",
+
+    # Erros de salvamento
+    "Sistema travado no Ctrl+S",
+    "Timeout salvamento",
+    "Erro salvamento"
+]
+
+
+def linha_final_etapa5(row, headers):
+    """
+    True se a etapa 5 nunca vai pegar esta linha (marca da leitura
+    incremental). Espelha o filtro da etapa 5: quantidade zero e REVER são
+    ignorados; Status Oracle vazio, PROCESSANDO..., timeout e erros com
+    retry continuam pendentes; o resto (Concluído, PD, Tela incorreta...)
+    é final.
+    """
+    if "Quantidade" in headers:
+        try:
+            if float(row[headers.index("Quantidade")]) == 0:
+                return True
+        except (ValueError, IndexError):
+            pass
+
+    status_oracle = row[headers.index("Status Oracle")].strip()
+    if "REVER" in status_oracle.upper():
+        return True
+    if status_oracle in ("", "PROCESSANDO...", "Timeout Oracle - Reabrir sistema"):
+        return False
+    if "tela incorreta" in status_oracle.lower():
+        return True
+    return not any(erro in status_oracle for erro in MENSAGENS_ERRO_RETRY)
+
+
 def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
     """Etapa 5: Processar linhas do Google Sheets no Oracle
 
@@ -1647,7 +1964,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
         config: Configurações do RPA
         primeiro_ciclo: Se True, após 2 tentativas sem itens, pula para Bancada
     """
-    global _dados_inseridos_oracle
+    global _dados_inseridos_oracle, _fila_status, _leitor_separacao, _spreadsheet_id_oracle
     _dados_inseridos_oracle = False  # Resetar flag no início
 
     gui_log("🤖 ETAPA 5: Processamento no Oracle")
@@ -1672,6 +1989,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
             gui_log(f"⚠️ Planilha Oracle não configurada, usando padrão (PROD)")
 
         SHEET_NAME = "Separação"
+        _spreadsheet_id_oracle = SPREADSHEET_ID
 
         token_path = os.path.join(BASE_DIR, "token.json")
         creds_path = os.path.join(base_path, "CredenciaisOracle.json")
@@ -1690,6 +2008,31 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
 
         service = build("sheets", "v4", credentials=creds)
 
+        # Escritas de "Status Oracle" em lote, sem o robô esperar o Google
+        # (a thread da fila cria o próprio service: o cliente HTTP não é thread-safe)
+        cfg_fila = config.get("fila_status_sheets", {})
+        _fila_status = FilaStatusSheets(
+            lambda: build("sheets", "v4", credentials=creds),
+            SPREADSHEET_ID,
+            pasta=BASE_DIR,
+            intervalo=cfg_fila.get("intervalo_s", 2.0),
+            max_pendentes=cfg_fila.get("max_pendentes", 20),
+        ).iniciar()
+
+        # Leitura da aba só com as colunas usadas (cabeçalho resolvido uma vez).
+        # O leitor sobrevive entre ciclos para manter a marca da leitura incremental
+        cfg_leitura = config.get("leitura_separacao", {})
+        if _leitor_separacao is None or _leitor_separacao.spreadsheet_id != SPREADSHEET_ID:
+            _leitor_separacao = LeitorSeparacao(
+                service, SPREADSHEET_ID, aba=SHEET_NAME,
+                incremental=cfg_leitura.get("incremental", True),
+                resync_s=cfg_leitura.get("resync_s", 600),
+                eh_final=linha_final_etapa5,
+            )
+        else:
+            _leitor_separacao.service = service
+        leitor = _leitor_separacao
+
         # Inicializar cache anti-duplicação
         cache = CacheLocal()  # Usa "processados.json" por padrão
         gui_log(f"💾 Cache carregado: {len(cache.dados)} itens processados anteriormente")
@@ -1748,22 +2091,20 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
 
             tentativas_verificacao += 1
 
+            # Status pendentes precisam estar na planilha antes de relê-la
+            if not _fila_status.descarregar(timeout=15):
+                gui_log(f"⚠️ [FILA SHEETS] {_fila_status.pendentes()} status ainda não enviados - lendo planilha assim mesmo")
+
             # Buscar linhas para processar (Status = "CONCLUÍDO" e Status Oracle vazio)
-            # IMPORTANTE: Buscar até coluna AC (ID está na coluna AC)
-            res = service.spreadsheets().values().get(
-                spreadsheetId=SPREADSHEET_ID,
-                range=f"{SHEET_NAME}!A1:AC"
-            ).execute()
-
-            valores = res.get("values", [])
-            if not valores:
+            # IMPORTANTE: só as colunas usadas (ID está na coluna AC), via batchGet
+            # (incremental: a partir da primeira linha ainda não finalizada)
+            headers, dados, primeira_linha = leitor.ler()
+            if not headers:
                 gui_log("⚠️ Nenhuma linha encontrada no Google Sheets")
                 if not aguardar_com_pausa(30, "Aguardando novas linhas no Google Sheets"):
                     return False
                 continue
 
-            headers, dados = valores[0], valores[1:]
-
             # Log de debug para verificar se ID está nos headers
             if "ID" in headers:
                 idx_id = headers.index("ID")
@@ -1775,7 +2116,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
             # Filtrar linhas para processar
             # 🔒 TRAVA 4: Ignorar linhas com "PROCESSANDO..." APENAS se estiverem no cache
             linhas_processar = []
-            for i, row in enumerate(dados):
+            for i, row in enumerate(dados, start=primeira_linha - 2):  # i + 2 = linha na planilha
                 if len(row) < len(headers):
                     row += [''] * (len(headers) - len(row))
                 idx_status_oracle = headers.index("Status Oracle")
@@ -1795,31 +2136,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                 processar = False
                 motivo = ""
 
-                # Lista de mensagens de erro que permitem retry
-                # IMPORTANTE: "Tela incorreta" NÃO está aqui porque PARA o robô
-                # Mas permite retry na PRÓXIMA EXECUÇÃO (não adiciona ao cache)
-                mensagens_erro_retry = [
-                    # Erros gerais
-                    "Campo vazio encontrado",
-                    "Transação não autorizada",
-                    "Não concluído no Oracle",
-
-                    # Erros de dados
-                    "Erro Oracle: dados faltantes por item não cadastrado",
-                    "Dados não conferem",
-                    "OCR - Dados não conferem",
-
-                    # Erros de validação
-                    "Erro validação: valor divergente",
-                    "Erro OCR",
-                    "Erro OCR - Tentar novamente",
-                    "CAMPO_VAZIO",
-
-                    # Erros de salvamento
-                    "Sistema travado no Ctrl+S",
-                    "Timeout salvamento",
-                    "Erro salvamento"
-                ]
+                # Mensagens de erro que permitem retry: MENSAGENS_ERRO_RETRY
 
                 # ═══════════════════════════════════════════════════════════════
                 # 🚫 FILTRO: Ignorar linhas com Quantidade = 0 (Quantidade Zero)
@@ -1860,12 +2177,12 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                     processar = False
                     gui_log(f"⏭️ [SKIP] Linha {i+2} (ID: {id_linha_temp}) com erro de tela incorreta - CORREÇÃO MANUAL NECESSÁRIA")
                     gui_log(f"⚠️ Tela incorreta requer intervenção manual. Não será reprocessada automaticamente.")
-                elif status_oracle in mensagens_erro_retry:
+                elif status_oracle in MENSAGENS_ERRO_RETRY:
                     # Match exato
                     processar = True
                     motivo = f"Retry de erro: {status_oracle}"
                     gui_log(f"🔄 [RETRY] Linha {i+2} (ID: {id_linha_temp}) com erro '{status_oracle}' - será reprocessada")
-                elif any(erro in status_oracle for erro in mensagens_erro_retry):
+                elif any(erro in status_oracle for erro in MENSAGENS_ERRO_RETRY):
                     # 🔧 CORREÇÃO: Match parcial (CONTÉM alguma palavra-chave de erro)
                     processar = True
                     motivo = f"Retry de erro (parcial): {status_oracle}"
@@ -1884,12 +2201,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                             coluna_letra = indice_para_coluna(idx_status_oracle)
                             range_str = f"{SHEET_NAME}!{coluna_letra}{i+2}"
 
-                            service.spreadsheets().values().update(
-                                spreadsheetId=SPREADSHEET_ID,
-                                range=range_str,
-                                valueInputOption="RAW",
-                                body={"values": [["Processo Oracle Concluído"]]}
-                            ).execute()
+                            _fila_status.enfileirar(range_str, "Processo Oracle Concluído")
                             gui_log(f"✅ Status atualizado no Sheets: 'Processo Oracle Concluído' (linha {i+2})")
                         except Exception as e_update:
                             gui_log(f"❌ ERRO ao atualizar status de item em cache (linha {i+2}): {e_update}")
@@ -1945,6 +2257,10 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                 # Usar ID (coluna AC) como identificador único
                 id_linha = linha.get("ID", "").strip()
 
+                # Contexto das imagens de debug (vai para o índice do debug_artefatos)
+                if ARTEFATOS_DEBUG_DISPONIVEL:
+                    artefatos_debug.definir_contexto(item=item, linha=i, id=id_linha or None)
+
                 # Log de debug para ver o ID encontrado
                 gui_log(f"🔍 Linha {i}: ID encontrado = '{id_linha}'")
 
@@ -1996,12 +2312,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                         idx_status_oracle = headers.index("Status Oracle")
                         coluna_letra = indice_para_coluna(idx_status_oracle)
                         range_str = f"{SHEET_NAME}!{coluna_letra}{i}"
-                        service.spreadsheets().values().update(
-                            spreadsheetId=SPREADSHEET_ID,
-                            range=range_str,
-                            valueInputOption="RAW",
-                            body={"values": [["Timeout Oracle - Reabrir sistema"]]}
-                        ).execute()
+                        _fila_status.enfileirar(range_str, "Timeout Oracle - Reabrir sistema")
                         gui_log(f"✅ Linha {i} marcada como 'Timeout Oracle - Reabrir sistema'")
                     except:
                         pass
@@ -2021,12 +2332,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                         gui_log(f"[CACHE SKIP] Range: {range_str}")
                         gui_log(f"[CACHE SKIP] Spreadsheet ID: {SPREADSHEET_ID}")
 
-                        service.spreadsheets().values().update(
-                            spreadsheetId=SPREADSHEET_ID,
-                            range=range_str,
-                            valueInputOption="RAW",
-                            body={"values": [["Processo Oracle Concluído"]]}
-                        ).execute()
+                        _fila_status.enfileirar(range_str, "Processo Oracle Concluído")
                         gui_log(f"✅ Status atualizado no Sheets: 'Processo Oracle Concluído' (linha {i})")
 
                         # Notificar skip no Telegram
@@ -2063,12 +2369,11 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                         gui_log(f"🔄 [RETRY] Linha {i} com erro OCR - REPROCESSANDO")
 
                     gui_log(f"🔒 [LOCK] Marcando linha {i} como 'PROCESSANDO...' (coluna {coluna_letra})")
-                    service.spreadsheets().values().update(
-                        spreadsheetId=SPREADSHEET_ID,
-                        range=range_str,
-                        valueInputOption="RAW",
-                        body={"values": [["PROCESSANDO..."]]}
-                    ).execute()
+                    # A trava só vale depois de chegar na planilha: enviar já e esperar a
+                    # confirmação (também impede que seja coalescida com o status final)
+                    _fila_status.enfileirar(range_str, "PROCESSANDO...", urgente=True)
+                    if not _fila_status.descarregar(timeout=TIMEOUT_LOCK_SHEETS):
+                        raise TimeoutError(f"trava não confirmada pelo Google em {TIMEOUT_LOCK_SHEETS}s")
                     gui_log(f"✅ [LOCK] Linha {i} bloqueada com sucesso")
                 except Exception as e_lock:
                     gui_log(f"⚠️ [LOCK] Erro ao marcar linha {i} como PROCESSANDO: {e_lock}")
@@ -2078,12 +2383,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                 # REGRA 3: Validar campos vazios
                 if not item or not sub_o or not end_o or not sub_d or not end_d:
                     gui_log(f"⚠️ Linha {i} PULADA - Campo vazio encontrado")
-                    service.spreadsheets().values().update(
-                        spreadsheetId=SPREADSHEET_ID,
-                        range=f"{SHEET_NAME}!T{i}",
-                        valueInputOption="RAW",
-                        body={"values": [["Campo vazio encontrado"]]}
-                    ).execute()
+                    _fila_status.enfileirar(f"{SHEET_NAME}!T{i}", "Campo vazio encontrado")
                     continue
 
                 # REGRA 1: Validar quantidade = 0 (IMPORTANTE: quantidade negativa é PERMITIDA)
@@ -2091,12 +2391,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                     qtd_float = float(str(quantidade).replace(",", ".").replace(" ", ""))
                     if qtd_float == 0:
                         gui_log(f"⚠️ Linha {i} PULADA - Quantidade Zero")
-                        service.spreadsheets().values().update(
-                            spreadsheetId=SPREADSHEET_ID,
-                            range=f"{SHEET_NAME}!T{i}",
-                            valueInputOption="RAW",
-                            body={"values": [["Quantidade Zero"]]}
-                        ).execute()
+                        _fila_status.enfileirar(f"{SHEET_NAME}!T{i}", "Quantidade Zero")
                         continue
                     # ✅ QUANTIDADE NEGATIVA É PERMITIDA - Oracle apenas pede confirmação
                     if qtd_float < 0:
@@ -2112,32 +2407,36 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                 # REGRA 2: Validar combinação proibida: origem proibida → RAWCENTR
                 if sub_o_upper in subs_proibidos and sub_d_upper == "RAWCENTR":
                     gui_log(f"⚠️ Linha {i} PULADA - Transação não autorizada: {sub_o} → {sub_d}")
-                    service.spreadsheets().values().update(
-                        spreadsheetId=SPREADSHEET_ID,
-                        range=f"{SHEET_NAME}!T{i}",
-                        valueInputOption="RAW",
-                        body={"values": [["Transação não autorizada"]]}
-                    ).execute()
+                    _fila_status.enfileirar(f"{SHEET_NAME}!T{i}", "Transação não autorizada")
                     continue
 
                 # REGRA 4: Validar origem proibida → destino deve ser igual à origem
                 if sub_o_upper in subs_proibidos and sub_o_upper != sub_d_upper:
                     gui_log(f"⚠️ Linha {i} PULADA - Transação não autorizada: {sub_o} → {sub_d} (origem proibida deve ir para si mesma)")
-                    service.spreadsheets().values().update(
-                        spreadsheetId=SPREADSHEET_ID,
-                        range=f"{SHEET_NAME}!T{i}",
-                        valueInputOption="RAW",
-                        body={"values": [["Transação não autorizada"]]}
-                    ).execute()
+                    _fila_status.enfileirar(f"{SHEET_NAME}!T{i}", "Transação não autorizada")
                     continue
 
                 gui_log(f"▶ Linha {i}: {item} | Qtd={quantidade} | Ref={referencia}")
 
+                # 🖼️ ESTADO DO ORACLE (uma classificação no lugar das perguntas em sequência)
+                # (MODO_TESTE não verifica a tela de transferência)
+                estado_tela = None
+                resultado_tela = None
+                if DETECTOR_TELA_DISPONIVEL and not MODO_TESTE:
+                    estado_tela = aguardar_estado_tela(timeout=5)
+                    resultado_tela = estado_tela.resultado
+
                 # 🌐 VERIFICAR QUEDA DE REDE NO INÍCIO DO PROCESSAMENTO
-                if verificar_queda_rede():
+                if verificar_queda_rede(resultado_tela):
                     gui_log("❌ QUEDA DE REDE detectada no início do processamento da linha!")
                     return False
 
+                # ⏱️ TIMEOUT DO ORACLE NO INÍCIO DO PROCESSAMENTO
+                if estado_tela is not None and estado_tela.estado == detector_tela.ESTADO_TEMPO_ORACLE:
+                    verificar_tempo_oracle(service, range_str, i, resultado_tela)
+                    gui_log("⏱️ TIMEOUT DETECTADO no início do processamento da linha!")
+                    return False
+
                 # 🔒 TRAVA 5: TIMEOUT DE SEGURANÇA - Registrar início do processamento
                 inicio_processamento = time.time()
                 TIMEOUT_PROCESSAMENTO = 60  # 60 segundos por linha
@@ -2158,21 +2457,20 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                         gui_log(f"⚠️ Imagem de validação não encontrada: {caminho_tela_transferencia}")
                         gui_log("⚠️ CONTINUANDO sem verificação de tela (imagem não existe)")
                     else:
-                        tela_correta = detectar_imagem_opencv(caminho_tela_transferencia, confidence=0.8, timeout=5)
+                        if resultado_tela is not None:
+                            tela_correta = resultado_tela.encontrado("tela_transferencia")
+                        else:
+                            tela_correta = detectar_imagem_opencv(caminho_tela_transferencia, confidence=0.8, timeout=5)
 
                         if not tela_correta:
+                            salvar_debug_tela(resultado_tela)
                             gui_log("❌ TELA DE TRANSFERÊNCIA NÃO DETECTADA!")
                             gui_log("❌ A tela atual NÃO corresponde à tela esperada de Transferência Subinventory")
                             gui_log("🛑 PARANDO ROBÔ - Verifique se está na tela correta do Oracle")
 
                             # Atualizar status no Sheets
                             try:
-                                service.spreadsheets().values().update(
-                                    spreadsheetId=SPREADSHEET_ID,
-                                    range=range_str,
-                                    valueInputOption="RAW",
-                                    body={"values": [["Tela incorreta - verificar Oracle"]]}
-                                ).execute()
+                                _fila_status.enfileirar(range_str, "Tela incorreta - verificar Oracle")
                                 gui_log(f"✅ Status atualizado no Sheets: 'Tela incorreta - verificar Oracle'")
                             except Exception as e_tela:
                                 gui_log(f"⚠️ Erro ao atualizar status: {e_tela}")
@@ -2217,7 +2515,23 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                     gui_log(f"📊 Contexto: Linha {i}, Item: {item}, Referência: {referencia}")
                     gui_log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
-                    erro_detectado = verificar_erro_produto(service, range_str, i)
+                    # Estado do Oracle após o item: espera só pelos estados anômalos
+                    # (o formulário continua visível no caminho normal)
+                    estado_tela = None
+                    resultado_tela = None
+                    if DETECTOR_TELA_DISPONIVEL:
+                        estado_tela = aguardar_estado_tela(timeout=3, parar_em=detector_tela.TEMPLATES_ANOMALOS)
+                        resultado_tela = estado_tela.resultado
+
+                        if estado_tela.estado == detector_tela.ESTADO_QUEDA_REDE:
+                            verificar_queda_rede(resultado_tela)
+                            gui_log("❌ QUEDA DE REDE detectada após preencher o item!")
+                            return False
+
+                    if estado_tela is None or estado_tela.estado == detector_tela.ESTADO_ERRO_PRODUTO:
+                        erro_detectado = verificar_erro_produto(service, range_str, i, resultado_tela)
+                    else:
+                        erro_detectado = False
 
                     gui_log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
                     gui_log(f"🔍 RESULTADO VERIFICAÇÃO: {erro_detectado}")
@@ -2242,7 +2556,10 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                     gui_log(f"📊 Contexto: Linha {i}, Item: {item}, Referência: {referencia}")
                     gui_log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
-                    timeout_detectado = verificar_tempo_oracle(service, range_str, i)
+                    if estado_tela is None or estado_tela.estado == detector_tela.ESTADO_TEMPO_ORACLE:
+                        timeout_detectado = verificar_tempo_oracle(service, range_str, i, resultado_tela)
+                    else:
+                        timeout_detectado = False
 
                     gui_log("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
                     gui_log(f"🔍 RESULTADO VERIFICAÇÃO TIMEOUT: {timeout_detectado}")
@@ -2390,8 +2707,26 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                     # ═══════════════════════════════════════════════════════════════
                     gui_log("[QTD NEG] 🔍 Verificando modal após sair do campo quantidade...")
                     caminho_modal = os.path.join(base_path, "informacoes", "qtd_negativa.png")
+                    estado_tela = None
+                    resultado_tela = None
+                    if DETECTOR_TELA_DISPONIVEL:
+                        # Estado do Oracle após a quantidade (modal, timeout ou queda de rede).
+                        # Modal a 0.8 como antes (CONFIDENCE_TEMPLATES usa 0.75): aqui a
+                        # detecção fecha o "modal" com ENTER
+                        estado_tela = aguardar_estado_tela(
+                            timeout=3, parar_em=detector_tela.TEMPLATES_ANOMALOS,
+                            confianca_minima={detector_tela.ESTADO_QTD_NEGATIVA: 0.8})
+                        resultado_tela = estado_tela.resultado
+
+                        if estado_tela.estado == detector_tela.ESTADO_QUEDA_REDE:
+                            verificar_queda_rede(resultado_tela)
+                            gui_log("❌ QUEDA DE REDE detectada após preencher quantidade!")
+                            return False
                     if os.path.isfile(caminho_modal):
-                        modal_encontrado = detectar_imagem_opencv(caminho_modal, confidence=0.8, timeout=3)
+                        if estado_tela is not None:
+                            modal_encontrado = estado_tela.estado == detector_tela.ESTADO_QTD_NEGATIVA
+                        else:
+                            modal_encontrado = detectar_imagem_opencv(caminho_modal, confidence=0.8, timeout=3)
                         if modal_encontrado:
                             gui_log("✅ [QTD NEG] Modal detectado ao sair do campo!")
                             time.sleep(0.5)
@@ -2406,15 +2741,10 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                     # ═══════════════════════════════════════════════════════════════
                     # 🔍 VERIFICAR TIMEOUT (APÓS PREENCHER QUANTIDADE)
                     # ═══════════════════════════════════════════════════════════════
-                    if verificar_tempo_oracle_rapido():
+                    if verificar_tempo_oracle_rapido(resultado_tela):
                         gui_log("⏱️ TIMEOUT DETECTADO após preencher quantidade. Parando RPA.")
                         try:
-                            service.spreadsheets().values().update(
-                                spreadsheetId=SPREADSHEET_ID,
-                                range=range_str,
-                                valueInputOption="RAW",
-                                body={"values": [["Timeout Oracle - Reabrir sistema"]]}
-                            ).execute()
+                            _fila_status.enfileirar(range_str, "Timeout Oracle - Reabrir sistema")
                         except:
                             pass
                         return False
@@ -2559,12 +2889,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
 
                             # Marcar no Sheets com mensagem específica (NÃO adicionar ao cache)
                             try:
-                                service.spreadsheets().values().update(
-                                    spreadsheetId=SPREADSHEET_ID,
-                                    range=range_str,
-                                    valueInputOption="RAW",
-                                    body={"values": [[mensagem_status]]}
-                                ).execute()
+                                _fila_status.enfileirar(range_str, mensagem_status)
                                 gui_log(f"✅ Status atualizado: '{mensagem_status}'")
 
                                 # Notificar erro no Telegram
@@ -2739,12 +3064,7 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                             else:
                                 mensagem_status = f"Erro salvamento ({tempo_save:.0f}s) - {tipo_save}"
 
-                            service.spreadsheets().values().update(
-                                spreadsheetId=SPREADSHEET_ID,
-                                range=range_str,
-                                valueInputOption="RAW",
-                                body={"values": [[mensagem_status]]}
-                            ).execute()
+                            _fila_status.enfileirar(range_str, mensagem_status)
                             gui_log(f"✅ Status atualizado no Sheets: '{mensagem_status}'")
                         except Exception as e_timeout:
                             gui_log(f"⚠️ Erro ao atualizar status no Sheets: {e_timeout}")
@@ -2775,16 +3095,12 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
                         return False
 
                     try:
-                        service.spreadsheets().values().update(
-                            spreadsheetId=SPREADSHEET_ID,
-                            range=f"{SHEET_NAME}!T{i}",
-                            valueInputOption="RAW",
-                            body={"values": [["Processo Oracle Concluído"]]}
-                        ).execute()
-
-                        # ✅ Marcar como concluído no cache (remove do cache)
-                        cache.marcar_concluido(id_linha)
-                        gui_log(f"✅ Linha {i} processada e salva no Oracle + Sheets atualizado")
+                        # ✅ Remove do cache só depois que o Google confirmar a escrita
+                        _fila_status.enfileirar(
+                            f"{SHEET_NAME}!T{i}", "Processo Oracle Concluído",
+                            ao_confirmar=lambda id_concluido=id_linha: cache.marcar_concluido(id_concluido)
+                        )
+                        gui_log(f"✅ Linha {i} processada e salva no Oracle (status enviado em lote ao Sheets)")
 
                         # Notificar sucesso no Telegram
                         if _telegram_notifier:
@@ -2820,6 +3136,13 @@ def etapa_05_executar_rpa_oracle(config, primeiro_ciclo=False):
         import traceback
         gui_log(traceback.format_exc())
         return False
+    finally:
+        if _fila_status is not None:
+            fila, _fila_status = _fila_status, None
+            fila.encerrar()
+            est = fila.estatisticas()
+            gui_log(f"📤 [FILA SHEETS] {est['enfileiradas']} status, {est['coalescidas']} coalescidos, "
+                    f"{est['lotes']} lotes, {est['falhas']} falhas")
 
 def etapa_06_navegacao_pos_oracle(config):
     """Etapa 6: Navegação após RPA_Oracle - Fechar janelas e abrir Bancada
@@ -3178,40 +3501,48 @@ def salvar_excel_bancada(df):
         gui_log(f"Stack trace: {traceback.format_exc()}")
         return None
 
-def monitorar_clipboard_inteligente(max_tempo=15*60, intervalo_check=5, estabilidade_segundos=30):
+def monitorar_clipboard_inteligente(max_tempo=15*60, intervalo_check=5, estabilidade_segundos=30, marca=None):
     """
     Monitora o clipboard de forma inteligente e detecta quando Oracle terminou de copiar.
 
+    Em vez de ler (e calcular o hash de) todo o clipboard a cada verificação,
+    espera pela próxima escrita (número de sequência do clipboard - ver
+    clipboard_eventos.py) e só lê o conteúdo quando ele muda.
+
     Args:
         max_tempo: Tempo máximo de espera (padrão: 15 minutos)
-        intervalo_check: Intervalo entre verificações (padrão: 5 segundos)
+        intervalo_check: Intervalo máximo entre verificações (padrão: 5 segundos)
         estabilidade_segundos: Tempo sem mudança para considerar completo (padrão: 30 segundos)
+        marca: Marca do clipboard tirada antes da cópia (clipboard_eventos.marcar());
+               None = marca agora e lê o conteúdo atual na primeira verificação
 
     Returns:
         str: Conteúdo do clipboard ou string vazia se falhar
     """
-    try:
-        import pyperclip
-    except ImportError:
+    if not clipboard_eventos.PYPERCLIP_DISPONIVEL:
         gui_log("❌ pyperclip não disponível")
         return ""
 
-    import hashlib
-
     gui_log("=" * 60)
     gui_log("🔍 MONITORAMENTO INTELIGENTE DO CLIPBOARD")
     gui_log("=" * 60)
     gui_log(f"⏱️ Tempo máximo: {max_tempo//60} minutos")
-    gui_log(f"🔄 Verificação a cada: {intervalo_check} segundos")
+    gui_log(f"🔄 Verificação a cada: {intervalo_check} segundos (ou assim que o clipboard mudar)")
     gui_log(f"✅ Estabilidade requerida: {estabilidade_segundos} segundos")
     gui_log("")
 
+    # Sem número de sequência, cada consulta copia o clipboard inteiro:
+    # nesse caso consultar só no intervalo de verificação
+    intervalo_consulta = None if clipboard_eventos.SEQUENCIA_DISPONIVEL else intervalo_check
+
     inicio = time.time()
-    ultimo_hash = ""
+    ler_agora = marca is None
+    if marca is None:
+        marca = clipboard_eventos.marcar()
+    texto_atual = ""
     ultimo_tamanho = 0
-    tempo_sem_mudanca = 0
+    ultima_mudanca = time.time()
     verificacoes = 0
-    ultimo_movimento_mouse = time.time()
 
     while (time.time() - inicio) < max_tempo:
         if not _rpa_running:
@@ -3219,21 +3550,21 @@ def monitorar_clipboard_inteligente(max_tempo=15*60, intervalo_check=5, estabili
             return ""
 
         verificacoes += 1
-        tempo_decorrido = int(time.time() - inicio)
 
         # NOTA: Movimento de mouse agora é feito pela thread em background (a cada 1s)
         # Removido daqui para evitar conflito
 
-        # Ler clipboard atual
-        texto_atual = pyperclip.paste() or ""
-        tamanho_atual = len(texto_atual)
-
-        # Calcular hash para detectar mudanças
-        hash_atual = hashlib.md5(texto_atual.encode('utf-8')).hexdigest() if texto_atual else ""
+        # Aguardar a próxima escrita no clipboard (até intervalo_check)
+        mudou = ler_agora or clipboard_eventos.aguardar_mudanca(
+            marca, intervalo_check, parar=lambda: not _rpa_running, intervalo=intervalo_consulta)
+        ler_agora = False
+        tempo_decorrido = int(time.time() - inicio)
 
-        # Detectar mudança
-        if hash_atual != ultimo_hash:
-            # Clipboard mudou!
+        if mudou:
+            # Clipboard mudou! Nova marca ANTES de ler para não perder escritas
+            marca = clipboard_eventos.marcar()
+            texto_atual = marca.conteudo if marca.conteudo is not None else clipboard_eventos.ler()
+            tamanho_atual = len(texto_atual)
             linhas = texto_atual.count('\n')
             kb = tamanho_atual / 1024
 
@@ -3246,26 +3577,25 @@ def monitorar_clipboard_inteligente(max_tempo=15*60, intervalo_check=5, estabili
                 gui_log(f"🔍 [{tempo_decorrido}s] Aguardando modal 'Exportação em andamento' abrir...")
 
             # Resetar contador de estabilidade
-            tempo_sem_mudanca = 0
-            ultimo_hash = hash_atual
+            ultima_mudanca = time.time()
             ultimo_tamanho = tamanho_atual
         else:
             # Clipboard não mudou
-            tempo_sem_mudanca += intervalo_check
+            tempo_sem_mudanca = int(time.time() - ultima_mudanca)
 
-            if tamanho_atual > 50:  # Tem dados
-                gui_log(f"⏳ [{tempo_decorrido}s] Clipboard estável: {tamanho_atual:,} chars | Estável por {tempo_sem_mudanca}s")
+            if ultimo_tamanho > 50:  # Tem dados
+                gui_log(f"⏳ [{tempo_decorrido}s] Clipboard estável: {ultimo_tamanho:,} chars | Estável por {tempo_sem_mudanca}s")
 
                 # VERIFICAR SE ESTABILIZOU (dados completos!)
                 if tempo_sem_mudanca >= estabilidade_segundos:
                     linhas = texto_atual.count('\n')
-                    kb = tamanho_atual / 1024
+                    kb = ultimo_tamanho / 1024
 
                     gui_log("=" * 60)
                     gui_log("✅ CÓPIA COMPLETA DETECTADA!")
                     gui_log("🎉 Modal 'Exportação em andamento' fechou - dados finalizados!")
                     gui_log(f"⏱️ Tempo total: {tempo_decorrido} segundos ({tempo_decorrido//60}m {tempo_decorrido%60}s)")
-                    gui_log(f"📊 Tamanho final: {tamanho_atual:,} caracteres ({kb:.2f} KB)")
+                    gui_log(f"📊 Tamanho final: {ultimo_tamanho:,} caracteres ({kb:.2f} KB)")
                     gui_log(f"📋 Total de linhas: {linhas:,}")
                     gui_log(f"🔄 Verificações realizadas: {verificacoes}")
                     gui_log(f"💾 Economizou: {(max_tempo - tempo_decorrido)//60} minutos de espera!")
@@ -3274,14 +3604,11 @@ def monitorar_clipboard_inteligente(max_tempo=15*60, intervalo_check=5, estabili
                     return texto_atual
             else:
                 # Clipboard ainda vazio
-                if verificacoes % 10 == 0:  # Log a cada 30s (10 * 3s)
+                if verificacoes % 10 == 0:  # Log a cada 10 verificações
                     gui_log(f"⏳ [{tempo_decorrido}s] Modal 'Exportação em andamento' visível - aguardando dados...")
 
-        # Aguardar próxima verificação
-        time.sleep(intervalo_check)
-
     # Timeout atingido
-    texto_final = pyperclip.paste() or ""
+    texto_final = clipboard_eventos.ler()
     tamanho_final = len(texto_final)
 
     gui_log("=" * 60)
@@ -3352,9 +3679,11 @@ def etapa_07_executar_rpa_bancada(config):
             return False
 
         # PASSO 5: Limpar clipboard ANTES de copiar
+        # (a marca registra o clipboard limpo: a escrita do Oracle é detectada
+        # mesmo que aconteça antes do monitoramento começar)
         gui_log("🧹 [5/9] Limpando clipboard...")
         pyperclip.copy('')
-        time.sleep(0.3)
+        marca_clipboard = clipboard_eventos.marcar()
 
         # PASSO 6: Abrir menu via Shift+F10
         gui_log("⌨️ [6/9] Abrindo menu de contexto (Shift+F10)...")
@@ -3401,7 +3730,8 @@ def etapa_07_executar_rpa_bancada(config):
         texto_copiado = monitorar_clipboard_inteligente(
             max_tempo=15 * 60,        # Máximo 15 minutos
             intervalo_check=3,        # Verificar a cada 3 segundos (mais rápido)
-            estabilidade_segundos=30  # Considerar completo após 30s sem mudança
+            estabilidade_segundos=30,  # Considerar completo após 30s sem mudança
+            marca=marca_clipboard
         )
 
         if not texto_copiado or len(texto_copiado) < 50:
@@ -3459,6 +3789,8 @@ def etapa_07_executar_rpa_bancada(config):
 
         if arquivo_excel:
             gui_log(f"✅ Excel salvo: {arquivo_excel}")
+            # Índice de itens (OCR) a partir do snapshot novo
+            carregar_indice_itens(arquivo_excel)
         else:
             gui_log("⚠️ Falha ao salvar Excel local, mas continuando...")
 
@@ -3952,7 +4284,7 @@ def main(modo_continuo=True):
     Args:
         modo_continuo: Se True, executa em loop contínuo (padrão: True)
     """
-    global _rpa_running, _ciclo_atual, _telegram_notifier
+    global _rpa_running, _ciclo_atual, _telegram_notifier, _idade_maxima_monitor, _cabecalhos_ocr
     _rpa_running = True
 
     # Inicializar Telegram
@@ -3989,6 +4321,80 @@ def main(modo_continuo=True):
     try:
         config = carregar_config()
 
+        # Gravador das imagens de debug (config "debug_imagens")
+        if ARTEFATOS_DEBUG_DISPONIVEL:
+            artefatos_debug.gui_log = gui_log
+            gravador = artefatos_debug.configurar_gravador(config, pasta_base=BASE_DIR)
+            gui_log(f"🖼️ [DEBUG] Imagens de debug: {'habilitadas' if gravador.habilitado else 'desabilitadas'} "
+                    f"({gravador.formato}, somente falhas: {gravador.somente_falhas}, pasta: {gravador.pasta})")
+
+        # Logs do motor OCR na GUI + perfis por campo (config "perfis_ocr")
+        if PYTESSERACT_DISPONIVEL:
+            motor_ocr.gui_log = gui_log
+            total_perfis = motor_ocr.configurar_perfis(config)
+            if total_perfis:
+                gui_log(f"🔤 [OCR] {total_perfis} perfis de campo carregados: {', '.join(motor_ocr.PERFIS_CAMPOS)}")
+            cache_ocr = motor_ocr.configurar_cache(config)
+            if cache_ocr.habilitado:
+                gui_log(f"🔤 [OCR] Cache de resultados: até {cache_ocr.tamanho_maximo // 1024} KB")
+
+        # Leitura dos campos do Oracle em lote (config "leitura_clipboard_lote")
+        # e validação em camadas (config "validacao_camadas")
+        if VALIDADOR_HIBRIDO_DISPONIVEL:
+            configurar_leitura_lote(config)
+            configurar_camadas(config)
+
+        # Logs da fila de status e do leitor da Separação na GUI
+        fila_status_sheets.gui_log = gui_log
+        leitor_separacao.gui_log = gui_log
+
+        # Pool de processos para template matching e OCR (config "pool_visao")
+        if POOL_VISAO_DISPONIVEL:
+            pool_visao.gui_log = gui_log
+            pool = pool_visao.configurar_pool(config, pasta_base=BASE_DIR)
+            if pool is not None:
+                gui_log(f"🧵 [POOL] Pool de visão com {pool.processos} processos (timeout {pool.timeout}s)")
+
+        # Índice de códigos de item (último snapshot da Bancada em out/)
+        if INDICE_ITENS_DISPONIVEL:
+            indice_itens.gui_log = gui_log
+        carregar_indice_itens()
+
+        # Layout dos headers do OCR fixado no config (senão, resolvido na primeira validação)
+        posicoes_headers = config.get("ocr_cabecalhos", {}).get("posicoes", {})
+        _cabecalhos_ocr = {
+            header: {"left": int(pos[0]), "top": int(pos[1]), "height": int(pos[2])}
+            for header, pos in posicoes_headers.items()
+            if isinstance(pos, (list, tuple)) and len(pos) == 3
+        }
+        if _cabecalhos_ocr:
+            gui_log(f"🔤 [OCR] Layout dos headers carregado do config: {', '.join(_cabecalhos_ocr)}")
+
+        # Regiões de busca dos templates (config "deteccao_imagens")
+        if DETECTOR_TELA_DISPONIVEL:
+            detector_tela.gui_log = gui_log
+            detector_tela.configurar_deteccao(config, pasta_base=BASE_DIR)
+            if detector_tela.REGIOES_TEMPLATES:
+                gui_log(f"🖼️ [DETECTOR] Regiões de busca configuradas: {', '.join(detector_tela.REGIOES_TEMPLATES)}")
+
+        # Pré-carregar templates de informacoes/ (lidos e redimensionados uma única vez)
+        if DETECTOR_TELA_DISPONIVEL:
+            try:
+                screen_w, screen_h = pyautogui.size()
+                total = detector_tela.precarregar_templates(screen_w=screen_w, screen_h=screen_h)
+                gui_log(f"🖼️ [DETECTOR] {total} templates pré-carregados para {screen_w}x{screen_h}")
+            except Exception as e:
+                gui_log(f"⚠️ [DETECTOR] Erro ao pré-carregar templates: {e}")
+
+        # Monitor de tela em segundo plano (config "monitor_tela")
+        if DETECTOR_TELA_DISPONIVEL and not MODO_TESTE:
+            _idade_maxima_monitor = float(config.get("monitor_tela", {}).get("idade_maxima", _idade_maxima_monitor))
+            monitor = detector_tela.iniciar_monitor(config)
+            if monitor:
+                gui_log(f"🖼️ [MONITOR] Monitor de tela iniciado (intervalo {monitor.intervalo}s)")
+            else:
+                gui_log("🖼️ [MONITOR] Monitor de tela desabilitado - detecção sob demanda")
+
         if modo_continuo:
             gui_log("🔄 Modo contínuo ativado - execução ininterrupta")
             gui_log("⚠️ O RPA Oracle aguardará automaticamente se não houver nada para processar")
@@ -4113,6 +4519,27 @@ def main(modo_continuo=True):
         gui_log(traceback.format_exc())
     finally:
         _rpa_running = False
+        # Parar monitor de tela
+        if DETECTOR_TELA_DISPONIVEL:
+            detector_tela.parar_monitor()
+        # Encerrar pool de visão (processos filhos + memória compartilhada)
+        if POOL_VISAO_DISPONIVEL:
+            pool_visao.encerrar_pool()
+        # Quantos campos cada camada da validação decidiu
+        if VALIDADOR_HIBRIDO_DISPONIVEL:
+            stats_camadas = estatisticas_camadas()
+            if stats_camadas["validacoes"]:
+                gui_log(f"📊 [CAMADAS] {stats_camadas['validacoes']} validações | campos decididos: "
+                        f"pixels={stats_camadas['pixels']}, ocr={stats_camadas['ocr']}, "
+                        f"clipboard={stats_camadas['clipboard']} | encerradas pelo estado: {stats_camadas['estado']}")
+        # Liberar motor OCR
+        if PYTESSERACT_DISPONIVEL:
+            stats_cache = motor_ocr.estatisticas_cache()
+            if stats_cache["acertos"] or stats_cache["falhas"]:
+                gui_log(f"🔤 [OCR] Cache: {stats_cache['acertos']} acertos, {stats_cache['falhas']} falhas "
+                        f"({stats_cache['taxa_acerto']:.0f}%), {stats_cache['entradas']} entradas, "
+                        f"{stats_cache['removidos']} removidas")
+            motor_ocr.fechar_motor()
         # Remover hook do teclado
         try:
             keyboard.unhook_all()
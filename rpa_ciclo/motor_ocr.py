@@ -0,0 +1,661 @@
+# -*- coding: utf-8 -*-
+"""
+motor_ocr.py
+============
+Motor de OCR PERSISTENTE para as validações visuais.
+
+Antes, verificar_campo_ocr chamava pytesseract.image_to_string e depois
+pytesseract.image_to_data na MESMA imagem: cada chamada abre um
+tesseract.exe novo, grava arquivos temporários e recarrega o modelo do
+idioma. Esse custo dominava a latência do OCR.
+
+Aqui existe um único motor por processo:
+- tesserocr (API do Tesseract em memória, modelo carregado UMA vez)
+- pytesseract como fallback (um subprocesso por chamada, mas só UMA
+  chamada image_to_data por imagem)
+
+Um único reconhecimento devolve o texto e a confiança de cada palavra.
+
+Perfis por campo ("perfis_ocr" no config.json) restringem o alfabeto
+(whitelist), o psm, o modo do motor (oem) e a ampliação de cada campo -
+quantidade só tem dígitos e sinal, item é letra + dígitos, etc.
+
+Resultados ficam num cache LRU pelo hash do recorte pré-processado (mais
+psm/whitelist/oem/ampliação): a revalidação depois de fechar um modal
+costuma reconhecer de novo exatamente os mesmos pixels, e aí o resultado
+volta sem passar pelo Tesseract. O cache é limitado por memória
+("cache_ocr" no config.json).
+
+Uso:
+    resultado = reconhecer(imagem_pil, psm=7)
+    resultado = reconhecer(imagem_pil, perfil=perfil_campo("campo_quantidade"))
+    resultado.texto, resultado.confianca, resultado.palavras
+
+Data: 2026-10-18
+"""
+
+import os
+import sys
+import copy
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+
+try:
+    from PIL import Image, ImageEnhance, ImageGrab
+    PIL_DISPONIVEL = True
+except ImportError:
+    PIL_DISPONIVEL = False
+
+try:
+    from tesserocr import PyTessBaseAPI, RIL, iterate_level
+    TESSEROCR_DISPONIVEL = True
+except ImportError:
+    TESSEROCR_DISPONIVEL = False
+
+try:
+    import pytesseract
+    PYTESSERACT_DISPONIVEL = True
+except ImportError:
+    PYTESSERACT_DISPONIVEL = False
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+# Idioma do modelo Tesseract
+IDIOMA_PADRAO = "eng"
+
+# Page segmentation mode padrão (7 = uma linha de texto)
+PSM_PADRAO = 7
+
+# Modo do motor padrão (3 = o que estiver disponível no tessdata)
+OEM_PADRAO = 3
+
+# Perfis por campo: nome do campo -> {"whitelist", "psm", "oem", "escala"}
+# Preenchidos via configurar_perfis() a partir do config.json
+PERFIS_CAMPOS = {}
+
+# Lote de campos: ampliação dos recortes (campos de 22px ficam pequenos
+# para o Tesseract) e margem branca em volta de cada recorte na composição
+ESCALA_LOTE = 2
+MARGEM_LOTE = 10
+
+# Cache de resultados (hash do recorte -> ResultadoOCR), limitado por memória
+CACHE_HABILITADO_PADRAO = True
+CACHE_TAMANHO_MAXIMO_KB_PADRAO = 512
+
+# ============================================================================
+# FUNÇÕES AUXILIARES
+# ============================================================================
+
+def gui_log(mensagem):
+    """Log compatível com GUI (pode ser substituído externamente)"""
+    print(mensagem)
+
+
+def caminho_tesseract():
+    """
+    Pasta da instalação do Tesseract (compatível com executável).
+
+    Returns:
+        str: Pasta com tesseract.exe e tessdata/
+    """
+    if getattr(sys, 'frozen', False):
+        # Executável: tesseract/ empacotado em _internal/
+        return os.path.join(sys._MEIPASS, 'tesseract')
+    # Script Python: instalação padrão
+    return r"C:\Program Files\Tesseract-OCR"
+
+
+def configurar_perfis(config):
+    """
+    Aplica os perfis de "perfis_ocr" do config.json.
+
+    Formato:
+        "perfis_ocr": {
+            "habilitado": true,
+            "campos": {
+                "campo_quantidade": {"whitelist": "0123456789-", "psm": 7, "oem": 1, "escala": 2},
+                ...
+            }
+        }
+
+    Returns:
+        int: Quantidade de perfis carregados
+    """
+    perfis = config.get("perfis_ocr", {}) if config else {}
+
+    PERFIS_CAMPOS.clear()
+    if not perfis.get("habilitado", True):
+        return 0
+
+    for nome_campo, perfil in perfis.get("campos", {}).items():
+        if isinstance(perfil, dict):
+            PERFIS_CAMPOS[nome_campo] = {
+                "whitelist": str(perfil.get("whitelist", "")),
+                "psm": int(perfil.get("psm", PSM_PADRAO)),
+                "oem": int(perfil.get("oem", OEM_PADRAO)),
+                "escala": max(1, int(perfil.get("escala", 1))),
+            }
+
+    return len(PERFIS_CAMPOS)
+
+
+def perfil_campo(nome_campo):
+    """
+    Perfil do campo pelo nome da chave ("campo_quantidade") ou pelo nome
+    exibido ("Quantidade"). None se o campo não tiver perfil.
+    """
+    if nome_campo in PERFIS_CAMPOS:
+        return PERFIS_CAMPOS[nome_campo]
+
+    # "Referência" -> "campo_referencia"
+    sem_acento = unicodedata.normalize("NFKD", str(nome_campo)).encode("ascii", "ignore").decode()
+    return PERFIS_CAMPOS.get("campo_" + sem_acento.strip().lower())
+
+
+def _confianca_palavra(valor):
+    """Confiança do pytesseract vem como int, float ou str ('-1' = não é palavra)"""
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return -1.0
+
+
+# ============================================================================
+# RESULTADO
+# ============================================================================
+
+class ResultadoOCR:
+    """Texto + palavras (com confiança e posição) de UM reconhecimento"""
+
+    def __init__(self, texto, palavras):
+        self.texto = texto
+        self.palavras = palavras  # [{"text", "conf", "left", "top", "width", "height", "linha"}]
+
+    @property
+    def confianca(self):
+        """Média da confiança das palavras (0 se não houver palavras)"""
+        confiancas = [p["conf"] for p in self.palavras if p["conf"] >= 0]
+        return sum(confiancas) / len(confiancas) if confiancas else 0.0
+
+    def como_dict(self):
+        """
+        Palavras no formato de pytesseract.image_to_data(output_type=DICT)
+        (uma lista por coluna) - pronto para pandas.DataFrame.
+        """
+        colunas = ["text", "conf", "left", "top", "width", "height"]
+        return {coluna: [p[coluna] for p in self.palavras] for coluna in colunas}
+
+    def __repr__(self):
+        return f"ResultadoOCR('{self.texto}', palavras={len(self.palavras)}, confiança={self.confianca:.0f})"
+
+
+# ============================================================================
+# CACHE DE RESULTADOS
+# ============================================================================
+
+class CacheOCR:
+    """
+    LRU de ResultadoOCR por hash do conteúdo da imagem.
+
+    O limite é em bytes (estimativa do texto + palavras de cada resultado),
+    não em número de entradas: um resultado de bloco com dezenas de
+    palavras pesa bem mais que o de um campo de uma palavra.
+    """
+
+    # Estimativa de memória por entrada / por palavra (dict + strings + ints)
+    CUSTO_ENTRADA = 200
+    CUSTO_PALAVRA = 400
+
+    def __init__(self, tamanho_maximo_kb=CACHE_TAMANHO_MAXIMO_KB_PADRAO, habilitado=CACHE_HABILITADO_PADRAO):
+        self.habilitado = habilitado
+        self.tamanho_maximo = int(tamanho_maximo_kb * 1024)
+        self._entradas = OrderedDict()  # chave -> (ResultadoOCR, custo)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.removidos = 0
+
+    @staticmethod
+    def chave(imagem, *parametros):
+        """Hash dos pixels (modo, tamanho, bytes) + parâmetros do reconhecimento"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{imagem.mode}|{imagem.size}|{parametros!r}".encode("utf-8"))
+        h.update(imagem.tobytes())
+        return h.digest()
+
+    def _custo(self, resultado):
+        return self.CUSTO_ENTRADA + len(resultado.texto) + self.CUSTO_PALAVRA * len(resultado.palavras)
+
+    def obter(self, chave):
+        """Cópia do resultado em cache (None se não houver)"""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+        # Cópia: quem chama pode ajustar as posições das palavras
+        return copy.deepcopy(entrada[0])
+
+    def guardar(self, chave, resultado):
+        custo = self._custo(resultado)
+        if custo > self.tamanho_maximo:
+            return
+
+        resultado = copy.deepcopy(resultado)
+        with self._lock:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            self._entradas[chave] = (resultado, custo)
+            self._bytes += custo
+
+            # Remover os menos usados até caber no limite
+            while self._bytes > self.tamanho_maximo:
+                _, (_, custo_removido) = self._entradas.popitem(last=False)
+                self._bytes -= custo_removido
+                self.removidos += 1
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estatisticas(self):
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": (self.acertos / total * 100) if total else 0.0,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "removidos": self.removidos,
+            }
+
+
+# ============================================================================
+# MOTORES
+# ============================================================================
+
+class MotorTesserocr:
+    """API do Tesseract em memória - o modelo é carregado uma única vez"""
+
+    nome = "tesserocr"
+
+    def __init__(self, idioma=IDIOMA_PADRAO, pasta_tesseract=None):
+        tessdata = os.path.join(pasta_tesseract, "tessdata") if pasta_tesseract else None
+        self._tessdata = tessdata if tessdata and os.path.isdir(tessdata) else None
+        self._idioma = idioma
+        self._apis = {}  # oem -> PyTessBaseAPI (o modo do motor só é escolhido no Init)
+        self._lock = threading.Lock()  # a API não é thread-safe
+        self._api_para(OEM_PADRAO)
+
+    def _api_para(self, oem):
+        api = self._apis.get(oem)
+        if api is None:
+            if self._tessdata:
+                api = PyTessBaseAPI(path=self._tessdata, lang=self._idioma, oem=oem)
+            else:
+                api = PyTessBaseAPI(lang=self._idioma, oem=oem)
+            self._apis[oem] = api
+        return api
+
+    def reconhecer(self, imagem, psm=PSM_PADRAO, whitelist="", oem=OEM_PADRAO):
+        with self._lock:
+            api = self._api_para(oem)
+            api.SetVariable("tessedit_char_whitelist", whitelist or "")
+            api.SetPageSegMode(psm)
+            api.SetImage(imagem)
+            api.Recognize()
+            texto = api.GetUTF8Text().strip()
+
+            palavras = []
+            linha = 0
+            iterador = api.GetIterator()
+            for palavra in iterate_level(iterador, RIL.WORD):
+                if palavra.IsAtBeginningOf(RIL.TEXTLINE):
+                    linha += 1
+                texto_palavra = (palavra.GetUTF8Text(RIL.WORD) or "").strip()
+                if not texto_palavra:
+                    continue
+                x1, y1, x2, y2 = palavra.BoundingBox(RIL.WORD)
+                palavras.append({
+                    "text": texto_palavra,
+                    "conf": float(palavra.Confidence(RIL.WORD)),
+                    "left": x1, "top": y1, "width": x2 - x1, "height": y2 - y1,
+                    "linha": linha,
+                })
+
+        return ResultadoOCR(texto, palavras)
+
+    def fechar(self):
+        with self._lock:
+            for api in self._apis.values():
+                api.End()
+            self._apis.clear()
+
+
+class MotorPytesseract:
+    """Fallback: um subprocesso tesseract por chamada (só image_to_data)"""
+
+    nome = "pytesseract"
+
+    def __init__(self, idioma=IDIOMA_PADRAO, pasta_tesseract=None):
+        self.idioma = idioma
+        if pasta_tesseract:
+            executavel = os.path.join(pasta_tesseract, "tesseract.exe")
+            if os.path.isfile(executavel):
+                pytesseract.pytesseract.tesseract_cmd = executavel
+
+    def reconhecer(self, imagem, psm=PSM_PADRAO, whitelist="", oem=OEM_PADRAO):
+        config = f"--psm {psm} --oem {oem}"
+        if whitelist:
+            config += f" -c tessedit_char_whitelist={whitelist}"
+        dados = pytesseract.image_to_data(imagem, lang=self.idioma, config=config,
+                                          output_type=pytesseract.Output.DICT)
+
+        palavras = []
+        linhas = {}  # (bloco, parágrafo, linha) -> [palavras]
+        for indice, texto_palavra in enumerate(dados["text"]):
+            texto_palavra = str(texto_palavra).strip()
+            conf = _confianca_palavra(dados["conf"][indice])
+            if not texto_palavra or conf < 0:
+                continue
+
+            chave_linha = (dados["block_num"][indice], dados["par_num"][indice], dados["line_num"][indice])
+            linhas.setdefault(chave_linha, []).append(texto_palavra)  # linhas chegam em ordem
+            palavras.append({
+                "text": texto_palavra,
+                "conf": conf,
+                "left": dados["left"][indice], "top": dados["top"][indice],
+                "width": dados["width"][indice], "height": dados["height"][indice],
+                "linha": len(linhas),
+            })
+
+        # Texto remontado a partir das palavras (mesma ordem do Tesseract)
+        texto = "\n".join(" ".join(itens) for itens in linhas.values())
+        return ResultadoOCR(texto, palavras)
+
+    def fechar(self):
+        pass
+
+
+# ============================================================================
+# MOTOR GLOBAL
+# ============================================================================
+
+_motor = None
+_lock_motor = threading.Lock()
+_cache = CacheOCR()
+
+# Executor remoto do OCR em lote (pool_visao): função (campos, imagem,
+# escala, margem) -> resultados ou None para reconhecer aqui mesmo
+_executor_remoto = None
+
+
+def definir_executor_remoto(funcao):
+    """Delega reconhecer_campos (ex: pool_visao). None = sempre local"""
+    global _executor_remoto
+    _executor_remoto = funcao
+
+
+def configurar_cache(config):
+    """
+    Configura o cache de resultados a partir do config.json.
+
+    Config:
+        "cache_ocr": {"habilitado": true, "tamanho_maximo_kb": 512}
+
+    Returns:
+        CacheOCR
+    """
+    global _cache
+
+    cfg = config.get("cache_ocr", {})
+    _cache = CacheOCR(
+        tamanho_maximo_kb=cfg.get("tamanho_maximo_kb", CACHE_TAMANHO_MAXIMO_KB_PADRAO),
+        habilitado=cfg.get("habilitado", CACHE_HABILITADO_PADRAO),
+    )
+    return _cache
+
+
+def estatisticas_cache():
+    """Acertos/falhas/ocupação do cache de resultados"""
+    return _cache.estatisticas()
+
+
+def _reconhecer_com_cache(motor, imagem, psm, whitelist="", oem=OEM_PADRAO, escala=1):
+    """
+    motor.reconhecer passando pelo cache.
+
+    A chave é calculada sobre a imagem ANTES da ampliação (hash menor) e
+    inclui a escala; o resultado guardado já está com as posições na
+    escala da imagem original.
+    """
+    chave = None
+    if _cache.habilitado:
+        chave = CacheOCR.chave(imagem, psm, whitelist, oem, escala, motor.nome)
+        resultado = _cache.obter(chave)
+        if resultado is not None:
+            return resultado
+
+    if escala > 1:
+        largura, altura = imagem.size
+        resultado = motor.reconhecer(imagem.resize((largura * escala, altura * escala), Image.LANCZOS),
+                                     psm, whitelist, oem)
+        for palavra in resultado.palavras:
+            for campo in ("left", "top", "width", "height"):
+                palavra[campo] //= escala
+    else:
+        resultado = motor.reconhecer(imagem, psm, whitelist, oem)
+
+    if chave is not None:
+        _cache.guardar(chave, resultado)
+    return resultado
+
+
+def disponivel():
+    """True se algum backend de OCR pode ser usado"""
+    if TESSEROCR_DISPONIVEL:
+        return True
+    if not PYTESSERACT_DISPONIVEL:
+        return False
+    # pytesseract precisa do tesseract.exe (empacotado ou instalado)
+    return os.path.isfile(os.path.join(caminho_tesseract(), "tesseract.exe"))
+
+
+def obter_motor(idioma=IDIOMA_PADRAO):
+    """
+    Motor de OCR do processo (criado na primeira chamada e reaproveitado).
+
+    Returns:
+        MotorTesserocr, MotorPytesseract ou None se nenhum backend existir
+    """
+    global _motor
+
+    with _lock_motor:
+        if _motor is not None:
+            return _motor
+
+        pasta = caminho_tesseract()
+        if TESSEROCR_DISPONIVEL:
+            try:
+                _motor = MotorTesserocr(idioma, pasta)
+            except Exception as e:
+                gui_log(f"⚠️ [OCR] tesserocr falhou ao iniciar ({e}) - usando pytesseract")
+
+        if _motor is None and PYTESSERACT_DISPONIVEL:
+            _motor = MotorPytesseract(idioma, pasta)
+
+        if _motor is not None:
+            gui_log(f"🔤 [OCR] Motor iniciado: {_motor.nome}")
+        return _motor
+
+
+def reconhecer(imagem, psm=PSM_PADRAO, perfil=None):
+    """
+    Reconhece uma imagem (PIL) com o motor do processo.
+
+    Args:
+        imagem: PIL.Image (já pré-processada)
+        psm: Page segmentation mode do Tesseract (7 = linha, 6 = bloco)
+        perfil: Perfil do campo (perfil_campo) - define whitelist, psm, oem
+                e ampliação. None = reconhecimento genérico
+
+    Returns:
+        ResultadoOCR (posições na escala da imagem original) ou None se não
+        houver motor de OCR
+    """
+    motor = obter_motor()
+    if motor is None:
+        return None
+
+    if perfil is None:
+        return _reconhecer_com_cache(motor, imagem, psm)
+
+    return _reconhecer_com_cache(motor, imagem, perfil["psm"], perfil["whitelist"],
+                                 perfil["oem"], perfil["escala"])
+
+
+def preprocessar(imagem):
+    """Escala de cinza + contraste 2x (mesmo tratamento do verificar_campo_ocr)"""
+    return ImageEnhance.Contrast(imagem.convert('L')).enhance(2.0)
+
+
+# ============================================================================
+# LOTE: TODOS OS CAMPOS EM UM RECONHECIMENTO
+# ============================================================================
+
+def montar_composicao(recortes, margem=MARGEM_LOTE):
+    """
+    Empilha os recortes (um por linha) numa única imagem branca.
+
+    Args:
+        recortes: Lista de (nome, PIL.Image em cinza, escala)
+        margem: Espaço branco (pixels) em volta de cada recorte
+
+    Returns:
+        tuple: (composição PIL.Image, [(nome, y_inicio, y_fim, escala)]) -
+               faixas verticais de cada campo na composição (margens incluídas)
+    """
+    ampliados = []
+    for nome, recorte, escala in recortes:
+        largura, altura = recorte.size
+        ampliados.append((nome, recorte.resize((max(1, largura * escala), max(1, altura * escala)), Image.LANCZOS),
+                          escala))
+
+    largura_total = max(img.size[0] for _, img, _ in ampliados) + 2 * margem
+    altura_total = sum(img.size[1] + 2 * margem for _, img, _ in ampliados)
+    composicao = Image.new('L', (largura_total, altura_total), 255)
+
+    faixas = []
+    y = 0
+    for nome, img, escala in ampliados:
+        composicao.paste(img, (margem, y + margem))
+        faixas.append((nome, y, y + img.size[1] + 2 * margem, escala))
+        y += img.size[1] + 2 * margem
+
+    return composicao, faixas
+
+
+def reconhecer_campos(campos, imagem=None, escala=ESCALA_LOTE, margem=MARGEM_LOTE):
+    """
+    OCR de VÁRIOS campos com UM reconhecimento.
+
+    Uma captura da faixa que contém os campos; cada campo é recortado,
+    pré-processado e empilhado numa composição com posições conhecidas.
+    As palavras reconhecidas voltam para o campo pela posição vertical.
+
+    Campos com perfil (perfis_ocr) são agrupados por alfabeto/modo do motor:
+    cada grupo é uma composição e um reconhecimento (a whitelist vale para
+    a imagem inteira). A ampliação do perfil substitui a escala padrão; o
+    psm do perfil só vale para um campo isolado (no lote é sempre 6).
+
+    Args:
+        campos: dict nome -> (x, y, largura, altura) em coordenadas da tela
+                (ex: config["campos_oracle_validacao"])
+        imagem: Captura da faixa já feita (PIL.Image), com origem no canto
+                superior esquerdo da união dos campos. Se None, captura agora
+        escala: Fator de ampliação dos recortes sem perfil
+        margem: Espaço branco em volta de cada recorte
+
+    Returns:
+        dict: nome -> ResultadoOCR (posições das palavras em coordenadas da
+              tela). Vazio se não houver motor de OCR ou campos válidos
+    """
+    campos = {nome: tuple(int(v) for v in coord) for nome, coord in campos.items()
+              if isinstance(coord, (list, tuple)) and len(coord) == 4}
+    if not campos or not PIL_DISPONIVEL or not disponivel():
+        return {}
+
+    esquerda = min(x for x, _, _, _ in campos.values())
+    topo = min(y for _, y, _, _ in campos.values())
+    direita = max(x + w for x, _, w, _ in campos.values())
+    base = max(y + h for _, y, _, h in campos.values())
+
+    if imagem is None:
+        imagem = ImageGrab.grab(bbox=(esquerda, topo, direita, base))
+
+    if _executor_remoto is not None:
+        resultados = _executor_remoto(campos, imagem, escala, margem)
+        if resultados is not None:
+            return resultados
+
+    motor = obter_motor()
+    if motor is None:
+        return {}
+
+    # Recortes agrupados por (whitelist, oem) - um reconhecimento por grupo
+    grupos = {}
+    for nome, (x, y, largura, altura) in campos.items():
+        recorte = preprocessar(imagem.crop((x - esquerda, y - topo, x - esquerda + largura, y - topo + altura)))
+        perfil = perfil_campo(nome)
+        if perfil is None:
+            grupos.setdefault(("", OEM_PADRAO), []).append((nome, recorte, escala))
+        else:
+            grupos.setdefault((perfil["whitelist"], perfil["oem"]), []).append((nome, recorte, perfil["escala"]))
+
+    palavras_campo = {nome: [] for nome in campos}
+
+    for (whitelist, oem), recortes in grupos.items():
+        composicao, faixas = montar_composicao(recortes, margem)
+        resultado = _reconhecer_com_cache(motor, composicao, 6, whitelist, oem)  # 6 = bloco: uma linha por campo
+
+        # Distribuir as palavras pelos campos (centro vertical dentro da faixa)
+        for palavra in resultado.palavras:
+            centro_y = palavra["top"] + palavra["height"] / 2
+            for nome, y_inicio, y_fim, escala_campo in faixas:
+                if y_inicio <= centro_y < y_fim:
+                    x, y, _, _ = campos[nome]
+                    palavras_campo[nome].append({
+                        "text": palavra["text"],
+                        "conf": palavra["conf"],
+                        "left": x + (palavra["left"] - margem) // escala_campo,
+                        "top": y + (palavra["top"] - y_inicio - margem) // escala_campo,
+                        "width": palavra["width"] // escala_campo,
+                        "height": palavra["height"] // escala_campo,
+                        "linha": 1,
+                    })
+                    break
+
+    return {
+        nome: ResultadoOCR(" ".join(p["text"] for p in sorted(palavras, key=lambda p: p["left"])), palavras)
+        for nome, palavras in palavras_campo.items()
+    }
+
+
+def fechar_motor():
+    """Libera o motor (chamar ao encerrar o RPA)"""
+    global _motor
+
+    with _lock_motor:
+        if _motor is not None:
+            _motor.fechar()
+            _motor = None
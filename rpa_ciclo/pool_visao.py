@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+pool_visao.py
+=============
+Pool OPCIONAL de processos para o trabalho pesado de imagem.
+
+Template matching (OpenCV), contagem de pixels (NumPy) e OCR rodavam na
+thread de automação e disputavam o GIL com a thread da GUI (Tk), a thread
+anti-hibernação (iniciar_movimento_mouse_continuo) e o hook do ESC. Com o
+pool, esse trabalho roda em outros processos (outros núcleos) e a thread de
+automação só espera o resultado (a espera não segura o GIL), então mouse e
+teclado não ficam com tempos irregulares.
+
+- Frames da tela vão por memória compartilhada (multiprocessing.shared_memory):
+  o frame é copiado UMA vez para um bloco reaproveitado e os processos leem
+  direto dele, sem serializar 6 MB por tarefa
+- A análise de vários templates é dividida entre os processos (um pedaço da
+  lista de templates por processo, todos lendo o mesmo bloco)
+- Resultados voltam por futures (concurrent.futures)
+- Falha ou timeout do pool -> a análise é feita localmente, como antes
+
+O detector_tela e o motor_ocr continuam com a mesma API: configurar_pool()
+registra o pool como executor remoto dos dois.
+
+Uso:
+    pool = configurar_pool(config, pasta_base=BASE_DIR)  # None se desabilitado
+    ...
+    encerrar_pool()
+
+Data: 2026-10-18
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as TimeoutFuturo
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import numpy as np
+    from multiprocessing import shared_memory
+    MEMORIA_COMPARTILHADA_DISPONIVEL = True
+except ImportError:
+    MEMORIA_COMPARTILHADA_DISPONIVEL = False
+
+# ============================================================================
+# CONFIGURAÇÕES
+# ============================================================================
+
+# Processos do pool (cada um carrega OpenCV, templates e o modelo do OCR)
+PROCESSOS_PADRAO = 2
+
+# Espera máxima por uma tarefa (s) - acima disso, faz localmente
+TIMEOUT_PADRAO = 10
+
+# ============================================================================
+# FUNÇÕES AUXILIARES
+# ============================================================================
+
+def gui_log(mensagem):
+    """Log compatível com GUI (pode ser substituído externamente)"""
+    print(mensagem)
+
+
+# ============================================================================
+# LADO DO PROCESSO TRABALHADOR
+# ============================================================================
+# Funções de módulo (precisam ser importáveis no processo filho - spawn)
+
+# Blocos de memória já anexados neste processo: nome -> SharedMemory
+_memorias_anexadas = {}
+
+
+def _inicializar_trabalhador(config, pasta_base):
+    """Configura detector e OCR no processo filho (mesmo config do principal)"""
+    import detector_tela
+    import motor_ocr
+
+    # Escalas aprendidas: lidas do JSON, mas só o processo principal grava
+    # (vários processos no mesmo .tmp/os.replace corrompem e sobrescrevem)
+    detector_tela.configurar_deteccao(config, pasta_base=None)
+    arquivo_escalas = config.get("deteccao_imagens", {}).get("arquivo_escalas", detector_tela.ARQUIVO_ESCALAS)
+    detector_tela.carregar_escalas(os.path.join(pasta_base, arquivo_escalas), somente_leitura=True)
+    motor_ocr.configurar_perfis(config)
+    motor_ocr.configurar_cache(config)
+
+
+def _aquecer():
+    """Tarefa vazia: força a criação do processo antes da primeira análise"""
+    return True
+
+
+def _frame_compartilhado(nome_memoria, forma, tipo):
+    """Frame como view do bloco compartilhado (sem cópia)"""
+    memoria = _memorias_anexadas.get(nome_memoria)
+    if memoria is None:
+        memoria = shared_memory.SharedMemory(name=nome_memoria)
+        _memorias_anexadas[nome_memoria] = memoria
+    return np.ndarray(forma, dtype=tipo, buffer=memoria.buf)
+
+
+def _tarefa_deteccao(nome_memoria, forma, tipo, nomes):
+    import detector_tela
+    frame = _frame_compartilhado(nome_memoria, forma, tipo)
+    return detector_tela.detectar_no_frame(frame, nomes)
+
+
+def _tarefa_ocr_campos(campos, imagem, escala, margem):
+    import motor_ocr
+    return motor_ocr.reconhecer_campos(campos, imagem=imagem, escala=escala, margem=margem)
+
+
+# ============================================================================
+# POOL (LADO DO PROCESSO PRINCIPAL)
+# ============================================================================
+
+class PoolVisao:
+    """
+    ProcessPoolExecutor + blocos de memória compartilhada reaproveitados.
+
+    Cada análise pega um bloco livre (ou cria um do tamanho do frame),
+    copia o frame, distribui os templates entre os processos e devolve o
+    bloco quando todos os pedaços terminam.
+    """
+
+    def __init__(self, config, pasta_base, processos=PROCESSOS_PADRAO, timeout=TIMEOUT_PADRAO):
+        self.config = config
+        self.pasta_base = str(pasta_base)
+        self.processos = max(1, int(processos))
+        self.timeout = timeout
+        self.ativo = False
+        self._executor = None
+        self._blocos_livres = []
+        self._blocos = []
+        self._lock = threading.Lock()
+        self.tarefas = 0
+        self.falhas = 0
+
+    # ─── CICLO DE VIDA ──────────────────────────────────────────────────────
+    def iniciar(self):
+        # spawn em todas as plataformas (igual ao Windows, onde o .exe roda)
+        contexto = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processos,
+            mp_context=contexto,
+            initializer=_inicializar_trabalhador,
+            initargs=(self.config, self.pasta_base),
+        )
+        # Criar os processos já (carregar OpenCV/OCR antes da primeira análise)
+        for _ in range(self.processos):
+            self._executor.submit(_aquecer)
+        self.ativo = True
+        return self
+
+    def encerrar(self):
+        self.ativo = False
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+        with self._lock:
+            for bloco in self._blocos:
+                try:
+                    bloco.close()
+                    bloco.unlink()
+                except Exception:
+                    pass
+            self._blocos.clear()
+            self._blocos_livres.clear()
+
+    def _desativar(self, motivo):
+        """Pool quebrado (processo morreu): volta tudo para o processo principal"""
+        if self.ativo:
+            self.ativo = False
+            gui_log(f"⚠️ [POOL] Pool de visão desativado ({motivo}) - análise local")
+
+    # ─── MEMÓRIA COMPARTILHADA ──────────────────────────────────────────────
+    def _obter_bloco(self, tamanho):
+        with self._lock:
+            for bloco in self._blocos_livres:
+                if bloco.size >= tamanho:
+                    self._blocos_livres.remove(bloco)
+                    return bloco
+        bloco = shared_memory.SharedMemory(create=True, size=tamanho)
+        with self._lock:
+            self._blocos.append(bloco)
+        return bloco
+
+    def _devolver_bloco(self, bloco):
+        with self._lock:
+            if bloco in self._blocos:
+                self._blocos_livres.append(bloco)
+
+    # ─── TAREFAS ────────────────────────────────────────────────────────────
+    def enviar_deteccao(self, frame, nomes):
+        """
+        Distribui os templates entre os processos, todos lendo o mesmo frame.
+
+        Returns:
+            list[Future]: um future por pedaço (cada um -> dict de deteccoes)
+        """
+        bloco = self._obter_bloco(frame.nbytes)
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=bloco.buf)[:] = frame
+
+        pedacos = [nomes[i::self.processos] for i in range(self.processos)]
+        pedacos = [pedaco for pedaco in pedacos if pedaco]
+        futuros = [self._executor.submit(_tarefa_deteccao, bloco.name, frame.shape, frame.dtype.str, pedaco)
+                   for pedaco in pedacos]
+
+        # O bloco só volta para a lista quando TODOS os pedaços terminarem
+        restantes = [len(futuros)]
+        lock_restantes = threading.Lock()
+
+        def concluido(_):
+            with lock_restantes:
+                restantes[0] -= 1
+                ultimo = restantes[0] == 0
+            if ultimo:
+                self._devolver_bloco(bloco)
+
+        for futuro in futuros:
+            futuro.add_done_callback(concluido)
+        return futuros
+
+    def enviar_ocr_campos(self, campos, imagem, escala, margem):
+        """OCR em lote num processo do pool (recorte pequeno: vai serializado)"""
+        return self._executor.submit(_tarefa_ocr_campos, campos, imagem, escala, margem)
+
+    def _resultado(self, futuro):
+        """Resultado do future ou None (timeout/erro -> quem chamou faz localmente)"""
+        try:
+            return futuro.result(timeout=self.timeout)
+        except TimeoutFuturo:
+            self.falhas += 1
+            gui_log(f"⚠️ [POOL] Tarefa excedeu {self.timeout}s - análise local")
+        except BrokenProcessPool as e:
+            self.falhas += 1
+            self._desativar(e)
+        except Exception as e:
+            self.falhas += 1
+            gui_log(f"⚠️ [POOL] Erro na tarefa ({e}) - análise local")
+        return None
+
+    def _falha_envio(self, erro):
+        self.falhas += 1
+        if isinstance(erro, BrokenProcessPool):
+            self._desativar(erro)
+        else:
+            gui_log(f"⚠️ [POOL] Erro ao enviar tarefa ({erro}) - análise local")
+
+    def executar_deteccao(self, frame, nomes):
+        """Executor remoto do detector_tela: (frame, nomes) -> deteccoes ou None"""
+        if not self.ativo or not nomes:
+            return None
+        try:
+            futuros = self.enviar_deteccao(frame, list(nomes))
+        except Exception as e:
+            self._falha_envio(e)
+            return None
+
+        self.tarefas += 1
+        deteccoes = {}
+        for futuro in futuros:
+            parcial = self._resultado(futuro)
+            if parcial is None:
+                return None
+            deteccoes.update(parcial)
+        return {nome: deteccoes[nome] for nome in nomes if nome in deteccoes}
+
+    def executar_ocr_campos(self, campos, imagem, escala, margem):
+        """Executor remoto do motor_ocr: OCR em lote ou None"""
+        if not self.ativo:
+            return None
+        try:
+            futuro = self.enviar_ocr_campos(campos, imagem, escala, margem)
+        except Exception as e:
+            self._falha_envio(e)
+            return None
+
+        self.tarefas += 1
+        return self._resultado(futuro)
+
+
+# ============================================================================
+# POOL GLOBAL
+# ============================================================================
+
+_pool = None
+
+
+def configurar_pool(config, pasta_base="."):
+    """
+    Cria o pool e registra-o no detector_tela e no motor_ocr.
+
+    Config:
+        "pool_visao": {"habilitado": false, "processos": 2, "timeout_s": 10}
+
+    Returns:
+        PoolVisao ou None se desabilitado/indisponível
+    """
+    global _pool
+
+    cfg = config.get("pool_visao", {})
+    if not cfg.get("habilitado", False):
+        return None
+    if not MEMORIA_COMPARTILHADA_DISPONIVEL:
+        gui_log("⚠️ [POOL] multiprocessing.shared_memory não disponível - análise local")
+        return None
+
+    encerrar_pool()
+
+    import detector_tela
+    import motor_ocr
+
+    try:
+        _pool = PoolVisao(
+            config, pasta_base,
+            processos=cfg.get("processos", PROCESSOS_PADRAO),
+            timeout=cfg.get("timeout_s", TIMEOUT_PADRAO),
+        ).iniciar()
+    except Exception as e:
+        gui_log(f"⚠️ [POOL] Não foi possível iniciar o pool de visão: {e}")
+        _pool = None
+        return None
+
+    detector_tela.definir_executor_remoto(_pool.executar_deteccao)
+    motor_ocr.definir_executor_remoto(_pool.executar_ocr_campos)
+    return _pool
+
+
+def obter_pool():
+    return _pool
+
+
+def encerrar_pool():
+    """Remove o pool do detector/OCR e encerra os processos"""
+    global _pool
+
+    if _pool is None:
+        return
+
+    import detector_tela
+    import motor_ocr
+
+    detector_tela.definir_executor_remoto(None)
+    motor_ocr.definir_executor_remoto(None)
+
+    pool, _pool = _pool, None
+    gui_log(f"🧵 [POOL] Encerrando pool de visão ({pool.tarefas} tarefas, {pool.falhas} falhas)")
+    pool.encerrar()
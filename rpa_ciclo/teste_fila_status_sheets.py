@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da fila write-behind de status (fila_status_sheets.py)
+
+Usa um service falso no lugar do Google Sheets (só registra os
+batchUpdate) para verificar:
+1. Escritas na mesma célula são coalescidas (vale a última)
+2. ao_confirmar só roda depois que o lote foi confirmado
+3. Falha no lote mantém a pendência e o retorno não roda
+4. Escrita nova durante o envio continua pendente para o próximo lote
+5. Pendências salvas em disco são recarregadas
+6. Valor substituído antes do envio não dispara o próprio ao_confirmar
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import fila_status_sheets
+from fila_status_sheets import FilaStatusSheets
+
+# Sem espera longa entre tentativas após falha
+fila_status_sheets.ESPERA_FALHA_INICIAL = 0.05
+fila_status_sheets.gui_log = lambda mensagem: None
+
+
+class ServicoFalso:
+    """spreadsheets().values().batchUpdate(...).execute() em memória"""
+
+    def __init__(self, falhas=0, liberar=None):
+        self.lotes = []  # [{range: valor}] na ordem de envio
+        self.falhas = falhas  # quantos envios falham antes de funcionar
+        self.liberar = liberar  # threading.Event: segura o envio até ser setado
+        self.enviando = threading.Event()
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def batchUpdate(self, spreadsheetId, body):
+        self._body = body
+        return self
+
+    def execute(self):
+        self.enviando.set()
+        if self.liberar is not None:
+            self.liberar.wait(5)
+        if self.falhas > 0:
+            self.falhas -= 1
+            raise ConnectionError("Google fora")
+        self.lotes.append({d["range"]: d["values"][0][0] for d in self._body["data"]})
+        return {}
+
+
+def aguardar(condicao, timeout=2.0):
+    """Espera condicao() ficar verdadeira (retornos rodam fora do lock)"""
+    limite = time.time() + timeout
+    while time.time() < limite:
+        if condicao():
+            return True
+        time.sleep(0.01)
+    return condicao()
+
+
+def criar_fila(pasta, servico):
+    return FilaStatusSheets(lambda: servico, "planilha-de-teste-123", pasta=pasta, intervalo=60)
+
+
+def caso_coalescencia(pasta):
+    servico = ServicoFalso()
+    fila = criar_fila(pasta, servico)
+    fila.enfileirar("Separação!T2", "PROCESSANDO...")
+    fila.enfileirar("Separação!T3", "PROCESSANDO...")
+    fila.enfileirar("Separação!T2", "Processo Oracle Concluído")
+
+    fila.iniciar()
+    ok = fila.descarregar(timeout=2)
+    fila.encerrar()
+
+    stats = fila.estatisticas()
+    return (ok and stats["coalescidas"] == 1 and stats["pendentes"] == 0
+            and servico.lotes == [{"Separação!T3": "PROCESSANDO...",
+                                   "Separação!T2": "Processo Oracle Concluído"}])
+
+
+def caso_retorno_apos_confirmar(pasta):
+    servico = ServicoFalso()
+    fila = criar_fila(pasta, servico)
+    confirmados = []
+    fila.enfileirar("Separação!T4", "Processo Oracle Concluído", ao_confirmar=lambda: confirmados.append("T4"))
+    antes = list(confirmados)
+
+    fila.iniciar()
+    fila.descarregar(timeout=2)
+    chamado = aguardar(lambda: confirmados == ["T4"])
+    fila.encerrar()
+    return antes == [] and chamado
+
+
+def caso_falha_mantem_pendente(pasta):
+    servico = ServicoFalso(falhas=1)
+    fila = criar_fila(pasta, servico)
+    confirmados = []
+    fila.enfileirar("Separação!T5", "Quantidade Zero", ao_confirmar=lambda: confirmados.append("T5"))
+
+    fila.iniciar()
+    # Primeira tentativa falha; a segunda (após a espera) confirma
+    ok = fila.descarregar(timeout=3)
+    chamado = aguardar(lambda: confirmados == ["T5"])
+    fila.encerrar()
+    return ok and chamado and fila.estatisticas()["falhas"] == 1 and len(servico.lotes) == 1
+
+
+def caso_escrita_durante_envio(pasta):
+    liberar = threading.Event()
+    servico = ServicoFalso(liberar=liberar)
+    fila = criar_fila(pasta, servico)
+    confirmados = []
+    fila.enfileirar("Separação!T6", "PROCESSANDO...", ao_confirmar=lambda: confirmados.append("v1"), urgente=True)
+    fila.iniciar()
+
+    # Lote 1 preso no envio: nova escrita na mesma célula
+    servico.enviando.wait(2)
+    fila.enfileirar("Separação!T6", "Processo Oracle Concluído", ao_confirmar=lambda: confirmados.append("v2"))
+    liberar.set()
+
+    # v1 foi substituído: o retorno dele é cancelado mesmo com o lote 1 confirmado
+    aguardar(lambda: len(servico.lotes) == 1)
+    ainda_pendente = fila.pendentes() == 1 and confirmados == []
+
+    ok = fila.descarregar(timeout=2)
+    chamado = aguardar(lambda: confirmados == ["v2"])
+    fila.encerrar()
+    return (ainda_pendente and ok and chamado
+            and [lote["Separação!T6"] for lote in servico.lotes] == ["PROCESSANDO...", "Processo Oracle Concluído"])
+
+
+def caso_recarrega_do_disco(pasta):
+    # Sem thread: a pendência só vai para o arquivo
+    fila = criar_fila(pasta, ServicoFalso())
+    fila.enfileirar("Separação!T7", "Processo Oracle Concluído")
+    sem_thread = fila.descarregar(timeout=0.2)
+
+    servico = ServicoFalso()
+    nova = criar_fila(pasta, servico).iniciar()
+    recarregadas = nova.pendentes()
+    ok = nova.descarregar(timeout=2)
+    nova.encerrar()
+    return (not sem_thread and recarregadas == 1 and ok
+            and servico.lotes == [{"Separação!T7": "Processo Oracle Concluído"}]
+            and not os.path.exists(nova.arquivo))
+
+
+def caso_valor_substituido(pasta):
+    servico = ServicoFalso()
+    fila = criar_fila(pasta, servico)
+    confirmados = []
+    fila.enfileirar("Separação!T8", "Processo Oracle Concluído", ao_confirmar=lambda: confirmados.append("concluido"))
+    fila.enfileirar("Separação!T8", "Erro Oracle: tela incorreta")
+
+    fila.iniciar()
+    ok = fila.descarregar(timeout=2)
+    time.sleep(0.1)  # dar tempo de um retorno indevido rodar
+    fila.encerrar()
+    return ok and confirmados == [] and servico.lotes == [{"Separação!T8": "Erro Oracle: tela incorreta"}]
+
+
+def teste_fila_status():
+    """Roda todos os cenários, cada um numa pasta temporária"""
+
+    print("=" * 70)
+    print("TESTE DA FILA DE STATUS (WRITE-BEHIND)")
+    print("=" * 70)
+
+    casos_teste = [
+        (caso_coalescencia, "Mesma célula coalescida num lote só"),
+        (caso_retorno_apos_confirmar, "ao_confirmar só depois da confirmação"),
+        (caso_falha_mantem_pendente, "Falha no lote: pendência mantida e reenviada"),
+        (caso_escrita_durante_envio, "Escrita durante o envio fica para o próximo lote"),
+        (caso_recarrega_do_disco, "Pendências recarregadas do arquivo"),
+        (caso_valor_substituido, "Concluído substituído por erro: sem ao_confirmar"),
+    ]
+
+    passou = 0
+    falhou = 0
+
+    for i, (caso, descricao) in enumerate(casos_teste, 1):
+        pasta = tempfile.mkdtemp(prefix="fila_status_")
+        try:
+            resultado = caso(pasta)
+        except Exception as e:
+            print(f"  Erro: {e}")
+            resultado = False
+        finally:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+        status = "[OK] PASSOU" if resultado else "[FALHOU]"
+        if resultado:
+            passou += 1
+        else:
+            falhou += 1
+
+        print(f"\nTeste {i}: {descricao}")
+        print(f"  {status}")
+
+    print("\n" + "=" * 70)
+    print(f"RESULTADOS: {passou} passou, {falhou} falhou de {len(casos_teste)} testes")
+    print("=" * 70)
+
+    return falhou == 0
+
+
+if __name__ == "__main__":
+    sucesso = teste_fila_status()
+    exit(0 if sucesso else 1)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste do ajuste de leituras de OCR ao código de item válido (indice_itens.py)
+
+O índice é carregado do cache texto (out/indice_itens.txt) de um snapshot
+falso, sem precisar do openpyxl:
+1. Sem índice carregado -> ajustar_item devolve None
+2. Leitura já válida -> usa direto (não conta como ajuste)
+3. Um único código próximo -> ajusta
+4. Vários códigos empatados -> ambíguo (não ajusta)
+5. Nenhum código a até DISTANCIA_MAXIMA -> sem candidato
+"""
+
+import os
+import shutil
+import tempfile
+
+import indice_itens
+from indice_itens import ajustar_item, carregar_indice, distancia_edicao
+
+indice_itens.gui_log = lambda mensagem: None
+
+CODIGOS = ["E2029A", "E2029B", "F1000", "MX7710"]
+
+
+def montar_snapshot(pasta_out):
+    """Snapshot vazio + cache com a assinatura dele (carregar_indice lê só o cache)"""
+    caminho_xlsx = os.path.join(pasta_out, "bancada-20261018.xlsx")
+    with open(caminho_xlsx, "wb"):
+        pass
+    assinatura = f"{os.path.basename(caminho_xlsx)}|{os.path.getmtime(caminho_xlsx)}"
+    with open(os.path.join(pasta_out, indice_itens.ARQUIVO_CACHE), "w", encoding="utf-8") as f:
+        f.write(assinatura + "\n" + "\n".join(CODIGOS))
+
+
+def teste_indice_itens():
+    """Testa os cenários de ajuste com o índice global"""
+
+    print("=" * 70)
+    print("TESTE DO ÍNDICE DE ITENS")
+    print("=" * 70)
+
+    sem_indice = ajustar_item("E2O29A") is None
+
+    pasta_out = tempfile.mkdtemp(prefix="indice_itens_")
+    try:
+        montar_snapshot(pasta_out)
+        indice = carregar_indice(pasta_out)
+    finally:
+        shutil.rmtree(pasta_out, ignore_errors=True)
+
+    casos_teste = [
+        # (descrição, condição)
+        ("Sem índice carregado -> None", sem_indice),
+        ("Índice carregado do cache texto", indice is not None and len(indice) == len(CODIGOS)),
+        ("distancia_edicao", [distancia_edicao(a, b) for a, b in [("E2029A", "E2029A"), ("E2O29A", "E2029A"),
+                                                                  ("E2029", "E2029A"), ("", "AB")]] == [0, 1, 1, 2]),
+    ]
+
+    if indice is not None:
+        valido = ajustar_item(" e2029a ")
+        trocado = ajustar_item("E2O29A")
+        ambiguo = ajustar_item("E2029C")
+        distante = ajustar_item("ZZZZZZ")
+        casos_teste += [
+            ("Leitura válida usada direto", valido.codigo == "E2029A" and not valido.ajustado),
+            ("O->0 ajustado para o único código próximo",
+             trocado.codigo == "E2029A" and trocado.ajustado and trocado.distancia == 1),
+            ("Empate entre E2029A e E2029B -> ambíguo",
+             ambiguo.codigo is None and ambiguo.ambiguo
+             and sorted(c for _, c in ambiguo.candidatos) == ["E2029A", "E2029B"]),
+            ("Sem código próximo -> sem candidato", distante.codigo is None and distante.candidatos == []),
+        ]
+
+    passou = 0
+    falhou = 0
+
+    for i, (descricao, resultado) in enumerate(casos_teste, 1):
+        status = "[OK] PASSOU" if resultado else "[FALHOU]"
+        if resultado:
+            passou += 1
+        else:
+            falhou += 1
+
+        print(f"\nTeste {i}: {descricao}")
+        print(f"  {status}")
+
+    print("\n" + "=" * 70)
+    print(f"RESULTADOS: {passou} passou, {falhou} falhou de {len(casos_teste)} testes")
+    print("=" * 70)
+
+    return falhou == 0 and indice is not None
+
+
+if __name__ == "__main__":
+    sucesso = teste_indice_itens()
+    exit(0 if sucesso else 1)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da leitura por colunas da aba Separação (leitor_separacao.py)
+
+Testa sem o Google Sheets (service falso em memória):
+1. agrupar_contiguas / letra_coluna
+2. Marca d'água: para na primeira linha não final e na primeira linha vazia
+3. eh_final do chamador (o padrão não é usado quando outro é passado)
+4. Leitura incremental: o batchGet seguinte começa na marca
+"""
+
+import re
+
+import leitor_separacao
+from leitor_separacao import LeitorSeparacao, agrupar_contiguas, letra_coluna
+
+leitor_separacao.gui_log = lambda mensagem: None
+
+HEADERS = ["Status", "Item", "Quantidade", "Status Oracle", "ID"]
+
+
+def indice_coluna(letras):
+    """Letra da coluna -> índice 0-based (A=0, AA=26)"""
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + ord(letra) - 64
+    return indice - 1
+
+
+class ServicoFalso:
+    """values().get / values().batchGet sobre uma tabela em memória"""
+
+    def __init__(self, tabela):
+        self.tabela = tabela  # linha 1 = cabeçalho
+        self.ranges_lidos = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, range):
+        self._resposta = {"values": self.tabela[:1]}
+        return self
+
+    def batchGet(self, spreadsheetId, ranges, majorDimension="ROWS"):
+        self.ranges_lidos.append(list(ranges))
+        faixas = []
+        for faixa in ranges:
+            inicio, linha, fim = re.match(r".*!([A-Z]+)(\d+):([A-Z]+)$", faixa).groups()
+            linhas = self.tabela[int(linha) - 1:]
+            colunas = []
+            for coluna in range(indice_coluna(inicio), indice_coluna(fim) + 1):
+                valores = [row[coluna] if coluna < len(row) else "" for row in linhas]
+                while valores and valores[-1] == "":
+                    valores.pop()
+                colunas.append(valores)
+            faixas.append({"values": colunas})
+        self._resposta = {"valueRanges": faixas}
+        return self
+
+    def execute(self):
+        return self._resposta
+
+
+def final_por_status_oracle(row, headers):
+    return row[headers.index("Status Oracle")] != ""
+
+
+def caso_agrupar_contiguas():
+    return (agrupar_contiguas([19, 20, 28, 2, 3, 4]) == [(2, 4), (19, 20), (28, 28)]
+            and agrupar_contiguas([5, 5, 6]) == [(5, 6)]
+            and agrupar_contiguas([]) == [])
+
+
+def caso_letra_coluna():
+    return [letra_coluna(i) for i in (0, 25, 26, 28)] == ["A", "Z", "AA", "AC"]
+
+
+def caso_marca_para_no_pendente():
+    leitor = LeitorSeparacao(None, "id", eh_final=final_por_status_oracle)
+    leitor.headers = HEADERS
+    dados = [
+        ["", "A1", "1", "Processo Oracle Concluído", "1"],
+        ["", "A2", "1", "", "2"],
+        ["", "A3", "1", "Processo Oracle Concluído", "3"],
+    ]
+    leitor._avancar_marca(dados, 2)
+    return leitor.marca == 3
+
+
+def caso_marca_para_na_vazia():
+    leitor = LeitorSeparacao(None, "id", eh_final=final_por_status_oracle)
+    leitor.headers = HEADERS
+    dados = [
+        ["", "A1", "1", "Processo Oracle Concluído", "1"],
+        ["", "", "", "", ""],
+        ["", "A3", "1", "Processo Oracle Concluído", "3"],
+    ]
+    leitor._avancar_marca(dados, 10)
+    return leitor.marca == 11
+
+
+def caso_marca_tudo_final():
+    leitor = LeitorSeparacao(None, "id", eh_final=final_por_status_oracle)
+    leitor.headers = HEADERS
+    dados = [["", "A1", "1", "PD", "1"], ["", "A2", "1", "Quantidade Zero", "2"]]
+    leitor._avancar_marca(dados, 5)
+    return leitor.marca == 7
+
+
+def caso_eh_final_do_chamador():
+    # Pelo padrão (status_final) "Erro OCR" não é final; pelo chamador é
+    dados = [["", "A1", "1", "Erro OCR", "1"], ["", "A2", "1", "", "2"]]
+
+    padrao = LeitorSeparacao(None, "id")
+    padrao.headers = HEADERS
+    padrao._avancar_marca(dados, 2)
+
+    chamador = LeitorSeparacao(None, "id", eh_final=final_por_status_oracle)
+    chamador.headers = HEADERS
+    chamador._avancar_marca(dados, 2)
+    return padrao.marca == 2 and chamador.marca == 3
+
+
+def caso_leitura_incremental():
+    tabela = [
+        HEADERS,
+        ["", "A1", "1", "Processo Oracle Concluído", "1"],
+        ["", "A2", "2", "Processo Oracle Concluído", "2"],
+        ["", "A3", "3", "", "3"],
+        ["", "A4", "4", "", "4"],
+    ]
+    servico = ServicoFalso(tabela)
+    leitor = LeitorSeparacao(servico, "id", colunas=("Item", "Status Oracle", "ID"), ultima_coluna="E",
+                             incremental=True, eh_final=final_por_status_oracle)
+
+    headers, dados, primeira = leitor.ler()
+    completa = (headers == HEADERS and primeira == 2 and len(dados) == 4
+                and dados[2] == ["", "A3", "", "", "3"] and leitor.marca == 4)
+
+    _, dados, primeira = leitor.ler()
+    incremental = (primeira == 4 and [row[1] for row in dados] == ["A3", "A4"]
+                   and servico.ranges_lidos[-1] == ["Separação!B4:B", "Separação!D4:E"])
+    return completa and incremental
+
+
+def teste_leitor_separacao():
+    """Roda todos os cenários do leitor"""
+
+    print("=" * 70)
+    print("TESTE DO LEITOR DA ABA SEPARAÇÃO")
+    print("=" * 70)
+
+    casos_teste = [
+        (caso_agrupar_contiguas, "agrupar_contiguas junta índices vizinhos"),
+        (caso_letra_coluna, "letra_coluna (A, Z, AA, AC)"),
+        (caso_marca_para_no_pendente, "Marca para na primeira linha não final"),
+        (caso_marca_para_na_vazia, "Marca para na primeira linha vazia"),
+        (caso_marca_tudo_final, "Tudo final: marca depois da última linha"),
+        (caso_eh_final_do_chamador, "eh_final do chamador substitui o padrão"),
+        (caso_leitura_incremental, "Segunda leitura começa na marca"),
+    ]
+
+    passou = 0
+    falhou = 0
+
+    for i, (caso, descricao) in enumerate(casos_teste, 1):
+        try:
+            resultado = caso()
+        except Exception as e:
+            print(f"  Erro: {e}")
+            resultado = False
+
+        status = "[OK] PASSOU" if resultado else "[FALHOU]"
+        if resultado:
+            passou += 1
+        else:
+            falhou += 1
+
+        print(f"\nTeste {i}: {descricao}")
+        print(f"  {status}")
+
+    print("\n" + "=" * 70)
+    print(f"RESULTADOS: {passou} passou, {falhou} falhou de {len(casos_teste)} testes")
+    print("=" * 70)
+
+    return falhou == 0
+
+
+if __name__ == "__main__":
+    sucesso = teste_leitor_separacao()
+    exit(0 if sucesso else 1)
@@ -4,9 +4,11 @@ validador_hibrido.py
 ====================
 Sistema de validação híbrido para campos Oracle (substitui validação OCR).
 
-Combina 3 técnicas para máxima confiabilidade:
+Combina 3 técnicas para máxima confiabilidade (em camadas: a mais cara só
+roda quando as baratas não decidem - validar_campos_em_camadas):
 1. Análise de Pixels - Detecta se campo está vazio ou preenchido
-2. Clipboard - Lê valor exato do campo (Ctrl+A + Ctrl+C)
+2. Clipboard - Lê valor exato do campo (Ctrl+A + Ctrl+C); todos os campos
+   do registro com TAB, opcional (ler_campos_via_tab)
 3. Detecção de Erros - Verifica imagens de erro (qtd_negativa, ErroProduto)
 
 Vantagens sobre OCR:
@@ -27,6 +29,30 @@ from PIL import Image, ImageGrab
 import os
 import sys
 
+# Espera por mudança do clipboard (número de sequência do Windows)
+import clipboard_eventos
+
+# Motor de detecção compartilhado (OpenCV com cache de templates)
+try:
+    import detector_tela
+    DETECTOR_TELA_DISPONIVEL = detector_tela.OPENCV_DISPONIVEL
+except ImportError:
+    DETECTOR_TELA_DISPONIVEL = False
+
+# Motor OCR persistente (camada intermediária da validação em camadas)
+try:
+    import motor_ocr
+    MOTOR_OCR_DISPONIVEL = motor_ocr.disponivel()
+except ImportError:
+    MOTOR_OCR_DISPONIVEL = False
+
+# Índice dos códigos de ITEM (ajusta a leitura do OCR ao código válido)
+try:
+    import indice_itens
+    INDICE_ITENS_DISPONIVEL = True
+except ImportError:
+    INDICE_ITENS_DISPONIVEL = False
+
 # ============================================================================
 # CONFIGURAÇÕES
 # ============================================================================
@@ -40,10 +66,31 @@ THRESHOLD_PIXELS = 0.05  # 5% dos pixels devem ser não-brancos (mais rigoroso)
 THRESHOLD_BRANCO = 230
 
 # Delays para operações de clipboard (ms)
+# SELECT/COPY são TIMEOUTS: a leitura volta assim que o clipboard muda
+# (clipboard_eventos). CLICK continua fixo (foco não é observável)
 DELAY_CLIPBOARD_CLICK = 200
 DELAY_CLIPBOARD_SELECT = 100
 DELAY_CLIPBOARD_COPY = 200
 
+# Leitura em lote (um percurso com TAB por todos os campos do registro)
+# Ordem de TAB do formulário de transferência (esquerda -> direita)
+ORDEM_TAB_PADRAO = [
+    "campo_item", "campo_sub_o", "campo_end_o", "campo_sub_d",
+    "campo_end_d", "campo_quantidade", "campo_referencia",
+]
+LEITURA_LOTE_HABILITADA = False  # opt-in: medir no formulário real antes de habilitar
+DELAY_LOTE_TAB = 150      # Oracle mover o foco para o próximo campo (ms)
+TIMEOUT_LOTE_COPY = 300   # Espera máxima pelo Ctrl+C (campo vazio = espera toda) (ms)
+TIMEOUT_CLIPBOARD = (DELAY_CLIPBOARD_SELECT + DELAY_CLIPBOARD_COPY) / 1000.0
+
+# Validação em camadas (pixels + estado -> OCR -> clipboard)
+# Campo só sobe de camada quando a mais barata não decide com confiança
+CAMADAS_HABILITADAS = True
+CAMPOS_CRITICOS = ["campo_item", "campo_quantidade"]  # nunca decididos só por pixels
+MARGEM_PIXELS = 2.0        # preenchido "com folga": percentual >= THRESHOLD_PIXELS * margem
+CAMADA_OCR_HABILITADA = True
+CONFIANCA_MINIMA_OCR = 60  # confiança média do Tesseract para aceitar o campo
+
 # ============================================================================
 # FUNÇÕES AUXILIARES
 # ============================================================================
@@ -53,6 +100,51 @@ def gui_log(mensagem):
     print(mensagem)
 
 
+def configurar_leitura_lote(config):
+    """
+    Configura a leitura em lote via TAB a partir do config.json.
+
+    Config:
+        "leitura_clipboard_lote": {"habilitado": true, "ordem_tab": [...],
+                                   "delay_tab_ms": 150, "timeout_copia_ms": 300}
+    """
+    global LEITURA_LOTE_HABILITADA, ORDEM_TAB_PADRAO, DELAY_LOTE_TAB, TIMEOUT_LOTE_COPY
+
+    cfg = config.get("leitura_clipboard_lote", {})
+    LEITURA_LOTE_HABILITADA = cfg.get("habilitado", LEITURA_LOTE_HABILITADA)
+    ORDEM_TAB_PADRAO = list(cfg.get("ordem_tab", ORDEM_TAB_PADRAO))
+    DELAY_LOTE_TAB = cfg.get("delay_tab_ms", DELAY_LOTE_TAB)
+    TIMEOUT_LOTE_COPY = cfg.get("timeout_copia_ms", TIMEOUT_LOTE_COPY)
+
+
+def configurar_camadas(config):
+    """
+    Configura a validação em camadas a partir do config.json.
+
+    Config:
+        "validacao_camadas": {"habilitado": true, "campos_criticos": [...],
+                              "margem_pixels": 2.0, "camada_ocr": true,
+                              "confianca_minima_ocr": 60}
+    """
+    global CAMADAS_HABILITADAS, CAMPOS_CRITICOS, MARGEM_PIXELS, CAMADA_OCR_HABILITADA, CONFIANCA_MINIMA_OCR
+
+    cfg = config.get("validacao_camadas", {})
+    CAMADAS_HABILITADAS = cfg.get("habilitado", CAMADAS_HABILITADAS)
+    CAMPOS_CRITICOS = list(cfg.get("campos_criticos", CAMPOS_CRITICOS))
+    MARGEM_PIXELS = cfg.get("margem_pixels", MARGEM_PIXELS)
+    CAMADA_OCR_HABILITADA = cfg.get("camada_ocr", CAMADA_OCR_HABILITADA)
+    CONFIANCA_MINIMA_OCR = cfg.get("confianca_minima_ocr", CONFIANCA_MINIMA_OCR)
+
+
+def _rpa_parado():
+    """True se o RPA foi parado (import dinâmico para evitar dependência circular)"""
+    try:
+        import main_ciclo
+        return not main_ciclo._rpa_running
+    except:
+        return False
+
+
 def carregar_imagem_erro(nome_arquivo):
     """
     Carrega imagem de erro (compatível com .exe e script Python).
@@ -127,6 +219,69 @@ def validar_campo_preenchido(x, y, largura, altura, threshold=THRESHOLD_PIXELS):
         return False, 0.0, {"erro": str(e)}
 
 
+def validar_campos_preenchidos(campos, threshold=THRESHOLD_PIXELS, imagem=None):
+    """
+    Versão em LOTE de validar_campo_preenchido(): UMA captura da faixa que
+    contém todos os campos (no Oracle todos ficam em y=155..177) e o
+    percentual de pixels não-brancos de cada campo calculado de uma vez.
+
+    Técnica: máscara "pixel < THRESHOLD_BRANCO" da faixa inteira + imagem
+    integral (soma acumulada). A contagem de cada campo vira 4 consultas
+    vetorizadas na imagem integral, sem recortar campo por campo.
+
+    Args:
+        campos: dict nome -> (x, y, largura, altura) em coordenadas da tela
+                (ex: config["campos_oracle_validacao"])
+        threshold: % mínimo de pixels não-brancos para considerar preenchido
+        imagem: Captura da faixa já feita (PIL.Image ou array em cinza),
+                com origem no canto superior esquerdo da união dos campos.
+                Se None, captura agora
+
+    Returns:
+        dict: nome -> (campo_preenchido: bool, percentual: float)
+              (vazio se nenhum campo válido ou erro na captura)
+    """
+    campos = {nome: tuple(int(v) for v in coord) for nome, coord in campos.items()
+              if isinstance(coord, (list, tuple)) and len(coord) == 4}
+    if not campos:
+        return {}
+
+    nomes = list(campos)
+    retangulos = np.array([campos[nome] for nome in nomes], dtype=np.int64)
+
+    # Faixa = união dos retângulos
+    esquerda, topo = retangulos[:, 0].min(), retangulos[:, 1].min()
+    direita = (retangulos[:, 0] + retangulos[:, 2]).max()
+    base = (retangulos[:, 1] + retangulos[:, 3]).max()
+
+    try:
+        if imagem is None:
+            imagem = ImageGrab.grab(bbox=(int(esquerda), int(topo), int(direita), int(base)))
+        if isinstance(imagem, Image.Image):
+            imagem = np.array(imagem.convert('L'))
+
+        # Imagem integral da máscara de pixels não-brancos (linha/coluna 0 = zeros)
+        mascara = (imagem < THRESHOLD_BRANCO).astype(np.int32)
+        integral = np.zeros((mascara.shape[0] + 1, mascara.shape[1] + 1), dtype=np.int32)
+        integral[1:, 1:] = mascara.cumsum(axis=0).cumsum(axis=1)
+
+        # Retângulos relativos à faixa (limitados ao tamanho capturado)
+        x0 = np.clip(retangulos[:, 0] - esquerda, 0, mascara.shape[1])
+        y0 = np.clip(retangulos[:, 1] - topo, 0, mascara.shape[0])
+        x1 = np.clip(x0 + retangulos[:, 2], 0, mascara.shape[1])
+        y1 = np.clip(y0 + retangulos[:, 3], 0, mascara.shape[0])
+
+        nao_brancos = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+        areas = np.maximum((x1 - x0) * (y1 - y0), 1)
+        percentuais = nao_brancos / areas
+
+    except Exception as e:
+        gui_log(f"⚠️ [PIXELS] Erro ao analisar pixels em lote: {e}")
+        return {}
+
+    return {nome: (bool(percentual > threshold), float(percentual)) for nome, percentual in zip(nomes, percentuais)}
+
+
 # ============================================================================
 # ETAPA 2: VALIDAÇÃO POR CLIPBOARD
 # ============================================================================
@@ -182,14 +337,10 @@ def ler_campo_via_clipboard(x, y, timeout=1.0, tentar_triplo_clique=True):
             try:
                 # Triplo-clique para selecionar tudo
                 pyautogui.click(x, y, clicks=3, interval=0.05)
-                time.sleep(DELAY_CLIPBOARD_SELECT / 1000.0)
-
-                # Copiar
-                pyautogui.hotkey('ctrl', 'c')
-                time.sleep(DELAY_CLIPBOARD_COPY / 1000.0)
 
-                # Ler clipboard
-                valor = pyperclip.paste().strip()
+                # Copiar e ler assim que o clipboard mudar
+                valor = clipboard_eventos.copiar_e_aguardar(
+                    lambda: pyautogui.hotkey('ctrl', 'c'), TIMEOUT_CLIPBOARD, _rpa_parado)
 
                 # Se conseguiu ler algo, retorna
                 if valor:
@@ -214,14 +365,10 @@ def ler_campo_via_clipboard(x, y, timeout=1.0, tentar_triplo_clique=True):
 
         # Selecionar tudo
         pyautogui.hotkey('ctrl', 'a')
-        time.sleep(DELAY_CLIPBOARD_SELECT / 1000.0)
-
-        # Copiar
-        pyautogui.hotkey('ctrl', 'c')
-        time.sleep(DELAY_CLIPBOARD_COPY / 1000.0)
 
-        # Ler clipboard
-        valor = pyperclip.paste().strip()
+        # Copiar e ler assim que o clipboard mudar
+        valor = clipboard_eventos.copiar_e_aguardar(
+            lambda: pyautogui.hotkey('ctrl', 'c'), TIMEOUT_CLIPBOARD, _rpa_parado)
         gui_log(f"   📋 [CTRL+A] Lido: '{valor}'")
 
         return valor
@@ -238,6 +385,138 @@ def ler_campo_via_clipboard(x, y, timeout=1.0, tentar_triplo_clique=True):
             pass
 
 
+def _trechos_contiguos(ordem, campos):
+    """
+    Campos pedidos agrupados em trechos contíguos da ordem de TAB.
+
+    ordem [item, sub_o, end_o, sub_d], campos {item, sub_o, sub_d}
+    -> [[item, sub_o], [sub_d]] (end_o não é percorrido)
+    """
+    trechos = []
+    anterior_pedido = False
+    for nome in ordem:
+        pedido = nome in campos
+        if pedido and anterior_pedido:
+            trechos[-1].append(nome)
+        elif pedido:
+            trechos.append([nome])
+        anterior_pedido = pedido
+    return trechos
+
+
+def ler_campos_via_tab(campos, ordem=None):
+    """
+    Lê os campos do registro com TAB em vez de clicar em cada um.
+
+    Os campos pedidos são divididos em trechos contíguos da ordem de TAB
+    (campos não pedidos não são percorridos). Em cada trecho: clica UMA
+    vez no primeiro campo e, para cada campo: Ctrl+A, Ctrl+C, lê, TAB. O
+    clipboard é salvo e restaurado uma única vez.
+
+    O TAB sai do campo e, no Oracle Forms, dispara a validação dele (pode
+    abrir LOV/mensagem e segurar o foco). Se o foco não sair, o Ctrl+C
+    seguinte copia o mesmo valor para o próximo nome: por isso um valor
+    igual ao do campo anterior encerra o trecho, e esse campo e os
+    seguintes ficam FORA do resultado (quem chama relê individualmente,
+    como os que voltam vazios). O TAB não passa do último campo pedido.
+
+    Args:
+        campos: dict nome -> (x, y, largura, altura) (coords_validacao)
+        ordem: Nomes dos campos na ordem de TAB do formulário
+               (None = ORDEM_TAB_PADRAO). Campos pedidos fora da ordem
+               não são lidos
+
+    Returns:
+        dict: nome -> valor lido ("" = vazio). Vazio se o RPA foi parado
+              ou a leitura falhou
+    """
+    trechos = _trechos_contiguos(list(ordem or ORDEM_TAB_PADRAO), campos)
+    if not trechos:
+        return {}
+
+    valores = {}
+    clipboard_backup = ""
+
+    try:
+        if _rpa_parado():
+            gui_log("   ⚠️ [CLIPBOARD LOTE] RPA parado, abortando leitura")
+            return {}
+
+        clipboard_backup = pyperclip.paste()
+
+        for trecho in trechos:
+            x, y, largura, altura = campos[trecho[0]]
+            pyautogui.click(x + largura // 2, y + altura // 2)
+            time.sleep(DELAY_CLIPBOARD_CLICK / 1000.0)
+
+            anterior = None
+            for indice, nome in enumerate(trecho):
+                if _rpa_parado():
+                    gui_log("   ⚠️ [CLIPBOARD LOTE] RPA parado durante leitura")
+                    return {}
+
+                pyperclip.copy("")
+                # _pause=False: sem a pausa global (pyautogui.PAUSE) a cada tecla
+                pyautogui.hotkey('ctrl', 'a', _pause=False)
+                valor = clipboard_eventos.copiar_e_aguardar(
+                    lambda: pyautogui.hotkey('ctrl', 'c', _pause=False), TIMEOUT_LOTE_COPY / 1000.0)
+
+                if valor and valor == anterior:
+                    # TAB pode não ter movido o foco: não confiar no resto do trecho
+                    gui_log(f"   ⚠️ [CLIPBOARD LOTE] {nome} repetiu o valor do campo anterior - "
+                            f"{', '.join(trecho[indice:])} serão relidos individualmente")
+                    break
+                valores[nome] = valor
+                anterior = valor
+
+                if indice < len(trecho) - 1:
+                    pyautogui.press('tab', _pause=False)
+                    time.sleep(DELAY_LOTE_TAB / 1000.0)
+
+        gui_log("   📋 [CLIPBOARD LOTE] " + " | ".join(f"{nome}='{valor}'" for nome, valor in valores.items()))
+        return valores
+
+    except Exception as e:
+        gui_log(f"⚠️ [CLIPBOARD LOTE] Erro ao ler campos: {e}")
+        return {}
+
+    finally:
+        try:
+            pyperclip.copy(clipboard_backup)
+        except:
+            pass
+
+
+def medir_leitura_clipboard(campos, ordem=None):
+    """
+    Compara o tempo da leitura em lote (TAB) com a leitura campo a campo.
+
+    Args:
+        campos: dict nome -> (x, y, largura, altura)
+        ordem: Ordem de TAB (None = ORDEM_TAB_PADRAO)
+
+    Returns:
+        dict: {"lote_s", "campo_s", "ganho", "divergencias"} - divergencias
+              lista os campos em que os dois métodos leram valores diferentes
+    """
+    inicio = time.time()
+    valores_lote = ler_campos_via_tab(campos, ordem)
+    tempo_lote = time.time() - inicio
+
+    inicio = time.time()
+    valores_campo = {}
+    for nome, (x, y, largura, altura) in campos.items():
+        valores_campo[nome] = ler_campo_via_clipboard(x + largura // 2, y + altura // 2)
+    tempo_campo = time.time() - inicio
+
+    divergencias = [nome for nome in campos if valores_lote.get(nome, "") != valores_campo.get(nome, "")]
+    ganho = tempo_campo / tempo_lote if tempo_lote > 0 else 0.0
+
+    gui_log(f"⏱️ [CLIPBOARD] Lote: {tempo_lote:.2f}s | Campo a campo: {tempo_campo:.2f}s | "
+            f"{ganho:.1f}x mais rápido | divergências: {divergencias or 'nenhuma'}")
+    return {"lote_s": tempo_lote, "campo_s": tempo_campo, "ganho": ganho, "divergencias": divergencias}
+
+
 def validar_campo_clipboard(x, y, valor_esperado, nome_campo="Campo", normalizar=True):
     """
     Valida campo Oracle comparando valor via clipboard.
@@ -324,11 +603,19 @@ def detectar_erro_oracle(confidence=0.7):
         tuple: (erro_detectado: bool, tipo_erro: str, posicao: tuple ou None)
     """
     try:
+        # Uma única captura para as duas imagens (motor OpenCV compartilhado)
+        frame = detector_tela.capturar_tela() if DETECTOR_TELA_DISPONIVEL else None
+
+        def localizar(caminho):
+            if frame is not None:
+                return detector_tela.localizar_na_tela(caminho, confidence=confidence, frame=frame)
+            return pyautogui.locateOnScreen(caminho, confidence=confidence)
+
         # Verificar qtd_negativa.png
         img_qtd_negativa = carregar_imagem_erro("qtd_negativa.png")
         if img_qtd_negativa:
             try:
-                pos_qtd = pyautogui.locateOnScreen(img_qtd_negativa, confidence=confidence)
+                pos_qtd = localizar(img_qtd_negativa)
                 if pos_qtd:
                     gui_log(f"🛑 [ERRO] Quantidade negativa detectada em {pos_qtd}")
                     return True, "QTD_NEGATIVA", pos_qtd
@@ -339,7 +626,7 @@ def detectar_erro_oracle(confidence=0.7):
         img_erro_produto = carregar_imagem_erro("ErroProduto.png")
         if img_erro_produto:
             try:
-                pos_erro = pyautogui.locateOnScreen(img_erro_produto, confidence=confidence)
+                pos_erro = localizar(img_erro_produto)
                 if pos_erro:
                     gui_log(f"🛑 [ERRO] Produto inválido detectado em {pos_erro}")
                     return True, "PRODUTO_INVALIDO", pos_erro
@@ -354,6 +641,139 @@ def detectar_erro_oracle(confidence=0.7):
         return False, "ERRO_DETECCAO", None
 
 
+# ============================================================================
+# VALIDAÇÃO EM CAMADAS
+# ============================================================================
+# Camada 1 (pixels): UMA captura da tela -> densidade de pixels de todos os
+#   campos + classificação do estado do Oracle (modais de erro) no mesmo frame
+# Camada 2 (OCR): um reconhecimento em lote dos campos que sobraram, com o
+#   perfil de cada campo (perfis_ocr, aplicado em motor_ocr.reconhecer_campos,
+#   também nos processos do pool_visao); o Item passa pelo índice de itens
+# Camada 3 (clipboard): leitura exata, só para o que nenhuma camada decidiu
+#
+# Campos críticos (Item, Quantidade) nunca são decididos só pelos pixels, e
+# pelo OCR só quando o texto lido confere com o valor esperado.
+
+# Estado do Oracle -> tipo de erro de detectar_erro_oracle (saída antecipada)
+_ERROS_POR_ESTADO = {}
+if DETECTOR_TELA_DISPONIVEL:
+    _ERROS_POR_ESTADO = {
+        detector_tela.ESTADO_QTD_NEGATIVA: "QTD_NEGATIVA",
+        detector_tela.ESTADO_ERRO_PRODUTO: "PRODUTO_INVALIDO",
+    }
+
+# Quantos campos cada camada decidiu (acumulado no processo)
+ESTATISTICAS_CAMADAS = {"validacoes": 0, "estado": 0, "pixels": 0, "ocr": 0, "clipboard": 0}
+
+
+def estatisticas_camadas():
+    """Contagem de campos decididos por camada (+ validações encerradas pelo estado)"""
+    return dict(ESTATISTICAS_CAMADAS)
+
+
+def _recorte_uniao(tela, campos):
+    """Recorte da captura com a união dos campos (origem esperada pelas funções em lote)"""
+    esquerda = min(x for x, _, _, _ in campos.values())
+    topo = min(y for _, y, _, _ in campos.values())
+    direita = max(x + w for x, _, w, _ in campos.values())
+    base = max(y + h for _, y, _, h in campos.values())
+    return tela.crop((esquerda, topo, direita, base))
+
+
+def _ocr_confere(chave, texto, esperado):
+    """
+    True se o texto do OCR é o valor esperado (mesma normalização de
+    validar_campo_clipboard: maiúsculas, sem espaços; quantidade sem
+    separadores)
+    """
+    lido = str(texto).upper().strip().replace(" ", "")
+    esperado = str(esperado).upper().strip().replace(" ", "")
+    if chave == "campo_quantidade":
+        lido = lido.replace(",", "").replace(".", "")
+        esperado = esperado.replace(",", "").replace(".", "")
+        if lido.isdigit() and esperado.isdigit():
+            return int(lido) == int(esperado)
+    return bool(lido) and lido == esperado
+
+
+def validar_campos_em_camadas(campos, esperados=None):
+    """
+    Decide os campos que as camadas baratas conseguem decidir com confiança.
+
+    Args:
+        campos: dict chave -> (x, y, largura, altura) dos campos a validar
+                (chaves de campos_oracle_validacao: "campo_item", ...)
+        esperados: dict chave -> valor da planilha. Campo crítico só é
+                   aceito pelo OCR se o texto lido conferir com o esperado
+                   (sem esperado -> sobe para o clipboard)
+
+    Returns:
+        tuple: (decididos, tipo_erro, estado_ok)
+            decididos: dict chave -> (camada, detalhe) dos campos aceitos como
+                       preenchidos ("pixels" ou "ocr")
+            tipo_erro: erro do Oracle visto na captura ("" se nenhum)
+            estado_ok: True se o frame foi classificado como formulário
+                       (sem modal) - dispensa a verificação global no fim se
+                       nenhuma camada interagiu com a tela
+    """
+    ESTATISTICAS_CAMADAS["validacoes"] += 1
+    campos = {chave: tuple(int(v) for v in coord) for chave, coord in campos.items()}
+    decididos = {}
+
+    # ─── CAMADA 1: pixels + estado (uma captura) ────────────────────────────
+    try:
+        tela = ImageGrab.grab()
+    except Exception as e:
+        gui_log(f"⚠️ [CAMADAS] Erro na captura: {e}")
+        return decididos, "", False
+
+    estado_ok = False
+    if DETECTOR_TELA_DISPONIVEL:
+        frame = np.ascontiguousarray(np.array(tela.convert('RGB'))[:, :, ::-1])  # RGB -> BGR
+        estado = detector_tela.classificar_estado_oracle(frame)
+        gui_log(f"🧭 [CAMADAS] Estado do Oracle: {estado.estado} ({estado.confianca:.2f})")
+
+        if estado.estado in _ERROS_POR_ESTADO:
+            ESTATISTICAS_CAMADAS["estado"] += 1
+            return decididos, _ERROS_POR_ESTADO[estado.estado], False
+        estado_ok = estado.estado == detector_tela.ESTADO_FORMULARIO
+
+    pixels = validar_campos_preenchidos(campos, imagem=_recorte_uniao(tela, campos))
+    for chave, (preenchido, percentual) in pixels.items():
+        # Sem o formulário confirmado no frame, pixels não decidem nada
+        if estado_ok and chave not in CAMPOS_CRITICOS and percentual >= THRESHOLD_PIXELS * MARGEM_PIXELS:
+            decididos[chave] = ("pixels", f"{percentual:.0%}")
+            ESTATISTICAS_CAMADAS["pixels"] += 1
+
+    # ─── CAMADA 2: OCR em lote dos campos restantes ─────────────────────────
+    restantes = {chave: coord for chave, coord in campos.items() if chave not in decididos}
+    if restantes and CAMADA_OCR_HABILITADA and MOTOR_OCR_DISPONIVEL:
+        # Campos claramente vazios pelos pixels não adiantam OCR
+        candidatos = {chave: coord for chave, coord in restantes.items()
+                      if pixels.get(chave, (True, 1.0))[0]}
+        if candidatos:
+            resultados = motor_ocr.reconhecer_campos(candidatos, imagem=_recorte_uniao(tela, candidatos))
+            for chave, resultado in resultados.items():
+                texto = resultado.texto
+                if not texto.strip() or resultado.confianca < CONFIANCA_MINIMA_OCR:
+                    continue
+                esperado = (esperados or {}).get(chave, "")
+                if chave == "campo_item" and INDICE_ITENS_DISPONIVEL and not _ocr_confere(chave, texto, esperado):
+                    # Leitura que não é um código válido -> código mais próximo do índice
+                    ajuste = indice_itens.ajustar_item(texto)
+                    if ajuste is not None and ajuste.ajustado:
+                        gui_log(f"   🔧 [OCR ÍNDICE] '{ajuste.lido}' → '{ajuste.codigo}' (distância {ajuste.distancia})")
+                        texto = ajuste.codigo
+                # Crítico: "tem texto" não basta (OCR pode ler 10 onde está 100)
+                if chave in CAMPOS_CRITICOS and not _ocr_confere(chave, texto, esperado):
+                    gui_log(f"   🔎 [OCR] {chave}: '{texto}' não confere com o esperado - clipboard")
+                    continue
+                decididos[chave] = ("ocr", f"'{texto}' ({resultado.confianca:.0f})")
+                ESTATISTICAS_CAMADAS["ocr"] += 1
+
+    return decididos, "", estado_ok
+
+
 # ============================================================================
 # VALIDAÇÃO HÍBRIDA PRINCIPAL
 # ============================================================================
@@ -538,11 +958,11 @@ def validar_campos_oracle_completo(coords, item, quantidade, referencia, sub_o,
 
         # Para COD: apenas verificar se campos estão preenchidos
         campos_validar = [
-            ("Item", coords["campo_item"], item),
-            ("Quantidade", coords["campo_quantidade"], quantidade),
-            ("Referência", coords["campo_referencia"], referencia),
-            ("Para Subinv.", coords["campo_sub_d"], sub_d),
-            ("Para Loc.", coords["campo_end_d"], end_d),
+            ("Item", "campo_item", item),
+            ("Quantidade", "campo_quantidade", quantidade),
+            ("Referência", "campo_referencia", referencia),
+            ("Para Subinv.", "campo_sub_d", sub_d),
+            ("Para Loc.", "campo_end_d", end_d),
         ]
     else:
         gui_log("📋 Referência MOV/OUTRO - validando campos ORIGEM")
@@ -550,13 +970,45 @@ def validar_campos_oracle_completo(coords, item, quantidade, referencia, sub_o,
 
         # Para MOV/OUTRO: apenas verificar se campos estão preenchidos
         campos_validar = [
-            ("Item", coords["campo_item"], item),
-            ("Quantidade", coords["campo_quantidade"], quantidade),
-            ("Referência", coords["campo_referencia"], referencia),
-            ("Subinvent.", coords["campo_sub_o"], sub_o),
-            ("Endereço", coords["campo_end_o"], end_o),
+            ("Item", "campo_item", item),
+            ("Quantidade", "campo_quantidade", quantidade),
+            ("Referência", "campo_referencia", referencia),
+            ("Subinvent.", "campo_sub_o", sub_o),
+            ("Endereço", "campo_end_o", end_o),
         ]
 
+    decididos = {}
+    estado_ok = False
+    if CAMADAS_HABILITADAS:
+        # Camadas baratas primeiro: pixels + estado (uma captura), depois OCR
+        decididos, tipo_erro_estado, estado_ok = validar_campos_em_camadas(
+            {chave: coords[chave] for _, chave, _ in campos_validar},
+            esperados={chave: valor for _, chave, valor in campos_validar})
+        if tipo_erro_estado:
+            gui_log(f"🛑 ERRO ORACLE NA CAPTURA: {tipo_erro_estado}")
+            gui_log("═══════════════════════════════════════════════════════════")
+            return False, tipo_erro_estado
+        gui_log(f"📊 [CAMADAS] {len(decididos)}/{len(campos_validar)} campos decididos sem clipboard: "
+                + (", ".join(f"{chave}={camada}" for chave, (camada, _) in decididos.items()) or "nenhum"))
+    else:
+        # Panorama por pixels: uma captura da faixa para todos os campos
+        pixels = validar_campos_preenchidos({nome: coords[chave] for nome, chave, _ in campos_validar})
+        if pixels:
+            resumo = " | ".join(f"{nome}={'✅' if preenchido else '❌'} {percentual:.0%}"
+                                for nome, (preenchido, percentual) in pixels.items())
+            gui_log(f"📊 [PIXELS] {resumo}")
+
+    # Leitura em lote: os campos ainda não decididos num percurso com TAB.
+    # Campo que voltar vazio ou ficar fora do lote (valor repetido: TAB pode
+    # não ter movido o foco) é relido individualmente (clique + cópia)
+    pendentes = {chave: coords[chave] for _, chave, _ in campos_validar if chave not in decididos}
+    valores_lote = {}
+    if LEITURA_LOTE_HABILITADA and pendentes:
+        inicio_lote = time.time()
+        valores_lote = ler_campos_via_tab(pendentes)
+        if valores_lote:
+            gui_log(f"📋 [CLIPBOARD LOTE] {len(valores_lote)} campos lidos em {time.time() - inicio_lote:.2f}s")
+
     gui_log("")
     gui_log("─" * 60)
     gui_log("🔎 INICIANDO VALIDAÇÃO CAMPO POR CAMPO:")
@@ -567,7 +1019,7 @@ def validar_campos_oracle_completo(coords, item, quantidade, referencia, sub_o,
     erros_detalhados = []
     campos_validados_ok = []
 
-    for idx, (nome, coord, valor) in enumerate(campos_validar, 1):
+    for idx, (nome, chave, valor) in enumerate(campos_validar, 1):
         # 🔧 CORREÇÃO: Verificar se RPA foi parado
         try:
             import main_ciclo
@@ -577,7 +1029,7 @@ def validar_campos_oracle_completo(coords, item, quantidade, referencia, sub_o,
         except:
             pass
 
-        x, y, largura, altura = coord
+        x, y, largura, altura = coords[chave]
 
         gui_log("")
         gui_log(f"━━━ [{idx}/{len(campos_validar)}] CAMPO: {nome} ━━━")
@@ -585,6 +1037,19 @@ def validar_campos_oracle_completo(coords, item, quantidade, referencia, sub_o,
         gui_log(f"🔍 Verificando se campo está PREENCHIDO (valor não será comparado)")
         gui_log(f"📍 Coordenadas: ({x}, {y}) | Tamanho: {largura}x{altura}")
 
+        if chave in decididos:
+            camada, detalhe = decididos[chave]
+            gui_log(f"✅ SUCESSO: Campo PREENCHIDO (camada {camada}: {detalhe})")
+            campos_validados_ok.append(nome)
+            continue
+
+        ESTATISTICAS_CAMADAS["clipboard"] += 1
+        if valores_lote.get(chave):
+            gui_log(f"✅ SUCESSO: Campo PREENCHIDO")
+            gui_log(f"   📋 Valor lido do clipboard (lote): '{valores_lote[chave]}'")
+            campos_validados_ok.append(nome)
+            continue
+
         sucesso, tipo, detalhes = validar_campo_oracle_hibrido(
             x, y, largura, altura,
             valor_esperado=valor,
@@ -630,10 +1095,15 @@ def validar_campos_oracle_completo(coords, item, quantidade, referencia, sub_o,
         for campo in campos_validados_ok:
             gui_log(f"   • {campo}")
 
-    # Verificar erros globais Oracle
+    # Verificar erros globais Oracle (dispensável se o frame das camadas já
+    # mostrou o formulário sem modal e nada interagiu com a tela depois)
     gui_log("")
-    gui_log("🔍 Verificando erros visuais do Oracle...")
-    erro_detectado, tipo_erro, _ = detectar_erro_oracle()
+    if estado_ok and not pendentes:
+        gui_log("✅ Estado do Oracle já verificado na captura das camadas")
+        erro_detectado, tipo_erro = False, ""
+    else:
+        gui_log("🔍 Verificando erros visuais do Oracle...")
+        erro_detectado, tipo_erro, _ = detectar_erro_oracle()
 
     if erro_detectado:
         gui_log(f"🛑 ERRO ORACLE GLOBAL: {tipo_erro}")
@@ -711,6 +1181,20 @@ if __name__ == "__main__":
     print(f"   Tipo: {tipo}")
     print(f"   Posição: {pos}")
 
+    # Teste da leitura em lote (formulário de transferência aberto)
+    print("\n4. Leitura em lote (TAB) x campo a campo")
+    print("   Deixe o formulário Oracle preenchido visível em 3 segundos...")
+    time.sleep(3)
+
+    import json
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json"), encoding="utf-8") as f:
+        config_teste = json.load(f)
+    configurar_leitura_lote(config_teste)
+    campos_teste = {nome: tuple(coord) for nome, coord in config_teste["campos_oracle_validacao"].items()
+                    if nome.startswith("campo_")}
+    medicao = medir_leitura_clipboard(campos_teste)
+    print(f"   Lote: {medicao['lote_s']:.2f}s | Campo a campo: {medicao['campo_s']:.2f}s | {medicao['ganho']:.1f}x")
+
     print("\n" + "=" * 60)
     print("TESTES CONCLUÍDOS")
     print("=" * 60)
@@ -21,6 +21,28 @@ from googleapiclient.discovery import build
 from pyscreeze import ImageNotFoundException as PyscreezeImageNotFoundException
 from pyautogui import ImageNotFoundException as PyautoguiImageNotFoundException
 
+# Motor de detecção compartilhado com o rpa_ciclo (OpenCV com cache de templates)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "rpa_ciclo"))
+try:
+    import detector_tela
+    DETECTOR_TELA_DISPONIVEL = detector_tela.OPENCV_DISPONIVEL
+except ImportError:
+    DETECTOR_TELA_DISPONIVEL = False
+
+# Escritas de "Status Oracle" em lote (values.batchUpdate), também do rpa_ciclo
+try:
+    import fila_status_sheets
+    FILA_STATUS_DISPONIVEL = True
+except ImportError:
+    FILA_STATUS_DISPONIVEL = False
+
+# Leitura da aba Separação só com as colunas usadas (values.batchGet)
+try:
+    import leitor_separacao
+    LEITOR_SEPARACAO_DISPONIVEL = True
+except ImportError:
+    LEITOR_SEPARACAO_DISPONIVEL = False
+
 # Diretório base compatível com .exe
 base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
 
@@ -40,6 +62,11 @@ SHEET_NAME = "Separação"
 QUICK_RECHECK_SECONDS = 5
 IDLE_KEEPALIVE_SECONDS = 30
 
+# Leitura incremental da Separação: só da primeira linha não finalizada para baixo,
+# com leitura completa a cada RESYNC_SEPARACAO_SECONDS (edições acima da marca)
+LEITURA_INCREMENTAL = True
+RESYNC_SEPARACAO_SECONDS = 600
+
 # Pasta de exportações
 EXPORT_DIR = os.path.join(data_path, "exportacoes")
 
@@ -58,10 +85,17 @@ estado = {"executando": False}
 # Armazena o que foi processado nesta sessão (some quando fechar o app)
 sessao = {
     "headers": None,   # lista com nomes das colunas (A..T)
-    "rows": []         # lista de listas com as linhas processadas
+    "rows": [],        # lista de listas com as linhas processadas
+    "numeros": []      # número de cada linha na planilha (completar colunas não lidas)
 }
 sessao_lock = threading.Lock()
 
+# Fila write-behind do Status Oracle (criada no robo_loop)
+fila_status = None
+
+# Leitor da aba Separação (criado no robo_loop)
+leitor = None
+
 # ─── CACHE LOCAL ANTI-DUPLICAÇÃO ────────────────────────────────────────────
 class CacheLocal:
     """Cache persistente para evitar duplicações no Oracle"""
@@ -70,6 +104,9 @@ class CacheLocal:
         self.arquivo = os.path.join(data_path, arquivo)
         self.dados = self._carregar()
         self.lock = threading.Lock()
+        # Serializa as gravações: marcar_concluido também roda na thread da
+        # fila de status, e a gravação mais nova precisa ser a última no disco
+        self.lock_salvar = threading.Lock()
         # Criar arquivo vazio se não existir
         if not os.path.exists(self.arquivo) and not self.dados:
             self._salvar()
@@ -87,28 +124,28 @@ class CacheLocal:
 
     def _salvar(self):
         """Salva cache no disco com lock"""
+        # Temporário próprio da thread (duas threads nunca escrevem no mesmo .tmp)
+        temp_arquivo = f"{self.arquivo}.{threading.get_ident()}.tmp"
         try:
-            # Converter dados para JSON string primeiro (para detectar erros de serialização)
-            json_str = json.dumps(self.dados, indent=2, ensure_ascii=False)
-
-            # Salvar em arquivo temporário primeiro
-            temp_arquivo = self.arquivo + ".tmp"
-            with open(temp_arquivo, 'w', encoding='utf-8') as f:
-                f.write(json_str)
-                f.flush()
-                os.fsync(f.fileno())  # Garantir que foi escrito no disco
-
-            # Substituir arquivo original pelo temporário
-            if os.path.exists(self.arquivo):
+            with self.lock_salvar:
+                # Converter dados para JSON string primeiro (para detectar erros de serialização)
+                # Snapshot sob o lock: outra thread pode estar alterando self.dados
+                with self.lock:
+                    json_str = json.dumps(self.dados, indent=2, ensure_ascii=False)
+
+                # Salvar em arquivo temporário primeiro
+                with open(temp_arquivo, 'w', encoding='utf-8') as f:
+                    f.write(json_str)
+                    f.flush()
+                    os.fsync(f.fileno())  # Garantir que foi escrito no disco
+
+                # Substituir arquivo original pelo temporário
                 os.replace(temp_arquivo, self.arquivo)
-            else:
-                os.rename(temp_arquivo, self.arquivo)
 
         except Exception as e:
             log_interface(f"[ERRO] Falha ao salvar cache: {e}")
             # Tentar limpar arquivo temporário se existir
             try:
-                temp_arquivo = self.arquivo + ".tmp"
                 if os.path.exists(temp_arquivo):
                     os.remove(temp_arquivo)
             except:
@@ -222,6 +259,10 @@ def authenticate_google():
             token.write(creds.to_json())
     return build("sheets", "v4", credentials=creds)
 
+def linha_final_oracle(row, headers):
+    """Marca da leitura incremental: só Status Oracle vazio é processado aqui"""
+    return row[headers.index("Status Oracle")].strip() != ""
+
 def buscar_linhas_novas(service):
     """
     Lê a planilha e retorna lista de tuplas (linha_index_na_planilha, dict_dos_campos)
@@ -232,15 +273,27 @@ def buscar_linhas_novas(service):
     - Se Status Oracle tiver qualquer valor (mesmo "PD"), não retorna
     - Isso evita duplicação caso cache seja limpo manualmente
     """
-    res = service.spreadsheets().values().get(
-        spreadsheetId=SPREADSHEET_ID,
-        range=f"{SHEET_NAME}!A1:AC"  # até AC (inclui coluna ID que está em AC)
-    ).execute()
-    valores = res.get("values", [])
-    if not valores:
-        return [], None, None
+    # Status ainda na fila precisam estar na planilha antes de relê-la
+    if fila_status is not None and not fila_status.descarregar(timeout=15):
+        log_interface(f"[FILA SHEETS] {fila_status.pendentes()} status ainda não enviados - lendo planilha assim mesmo")
+
+    if leitor is not None:
+        # Só as colunas usadas (ID está em AC); as demais vêm ""
+        # Incremental: a partir da primeira linha ainda não finalizada
+        headers, dados, primeira_linha = leitor.ler()
+        if not headers:
+            return [], None, None
+    else:
+        primeira_linha = 2
+        res = service.spreadsheets().values().get(
+            spreadsheetId=SPREADSHEET_ID,
+            range=f"{SHEET_NAME}!A1:AC"  # até AC (inclui coluna ID que está em AC)
+        ).execute()
+        valores = res.get("values", [])
+        if not valores:
+            return [], None, None
 
-    headers, dados = valores[0], valores[1:]
+        headers, dados = valores[0], valores[1:]
 
     with sessao_lock:
         if not sessao["headers"]:
@@ -267,7 +320,7 @@ def buscar_linhas_novas(service):
     linhas_aprovadas = 0
 
     # segurança contra linhas curtas
-    for i, row in enumerate(dados):
+    for i, row in enumerate(dados, start=primeira_linha - 2):  # i + 2 = linha na planilha
         linhas_analisadas += 1
         if len(row) < len(headers):
             row += [''] * (len(headers) - len(row))
@@ -308,12 +361,15 @@ def exportar_movimentacoes():
         with sessao_lock:
             headers = sessao["headers"]
             rows = list(sessao["rows"])  # cópia
+            numeros = list(sessao["numeros"])
 
         if not headers or not rows:
             messagebox.showinfo("Exportar Movimentacoes", "Nao ha movimentacoes desta sessao para exportar.")
             log_interface("[INFO] Exportacao cancelada: sessao sem registros.")
             return
 
+        rows = completar_linhas_sessao(rows, numeros)
+
         os.makedirs(EXPORT_DIR, exist_ok=True)
         ts = time.strftime("%Y%m%d_%H%M%S")
         out_path = os.path.join(EXPORT_DIR, f"export_sessao_{ts}.csv")
@@ -328,6 +384,30 @@ def exportar_movimentacoes():
         log_interface(f"[ERRO] Erro ao exportar (sessao): {e}")
         messagebox.showerror("Exportar Movimentacoes", f"Erro ao exportar:\n{e}")
 
+def completar_linhas_sessao(rows, numeros):
+    """
+    Preenche as colunas que a busca não leu (leitura só das colunas usadas)
+    com a linha inteira da planilha. Sem acesso ao Sheets, exporta como está.
+    """
+    if not LEITOR_SEPARACAO_DISPONIVEL or len(numeros) != len(rows):
+        return rows
+    try:
+        # Service próprio: a GUI roda em outra thread que a do robô
+        leitor_export = leitor_separacao.LeitorSeparacao(authenticate_google(), SPREADSHEET_ID, aba=SHEET_NAME)
+        completas = leitor_export.ler_linhas_completas(sorted(set(numeros)))
+    except Exception as e:
+        log_interface(f"[AVISO] Nao foi possivel completar as colunas da exportacao: {e}")
+        return rows
+
+    resultado = []
+    for row, numero in zip(rows, numeros):
+        completa = completas.get(numero, [])
+        resultado.append([
+            valor if valor != "" or k >= len(completa) else completa[k]
+            for k, valor in enumerate(row)
+        ])
+    return resultado
+
 def abrir_pasta_exportacoes():
     """Abre a pasta de exportações no Explorer/Finder."""
     try:
@@ -428,6 +508,10 @@ def atualizar_status_oracle(service, headers, linha, status_valor):
 
         log_interface(f"[SHEETS] Atualizando linha {linha}, coluna {coluna_letra} (índice {idx_status_oracle}) com '{status_valor}'")
 
+        if fila_status is not None:
+            fila_status.enfileirar(range_str, status_valor)
+            return True
+
         service.spreadsheets().values().update(
             spreadsheetId=SPREADSHEET_ID,
             range=range_str,
@@ -439,14 +523,26 @@ def atualizar_status_oracle(service, headers, linha, status_valor):
         log_interface(f"[ERRO] Falha ao atualizar Status Oracle: {e}")
         return False
 
+def localizar_imagem(caminho, confidence=0.8):
+    """
+    Procura a imagem na tela com o motor compartilhado (detector_tela).
+    Sem OpenCV, usa pyautogui.locateOnScreen.
+
+    Returns:
+        Região (left, top, width, height) ou None se não encontrou
+    """
+    if DETECTOR_TELA_DISPONIVEL:
+        return detector_tela.localizar_na_tela(caminho, confidence=confidence)
+    try:
+        return pyautogui.locateOnScreen(caminho, confidence=confidence)
+    except (PyautoguiImageNotFoundException, PyscreezeImageNotFoundException):
+        return None
+
 def verificar_erro_endereco(service, headers, i, id_item):
     """Verifica se o modal de erro de endereço apareceu na tela"""
     erro_endereco_path = os.path.join(base_path, "erroendereco.png")
     if os.path.isfile(erro_endereco_path):
-        try:
-            encontrado = pyautogui.locateOnScreen(erro_endereco_path, confidence=0.8)
-        except (PyautoguiImageNotFoundException, PyscreezeImageNotFoundException):
-            encontrado = None
+        encontrado = localizar_imagem(erro_endereco_path, confidence=0.8)
         if encontrado:
             atualizar_status_oracle(service, headers, i, "PD")
             log_interface(f"[ERRO] Linha {i} marcada como 'PD' (pendente) por erro de endereço detectado.")
@@ -460,18 +556,20 @@ def verificar_erro_endereco(service, headers, i, id_item):
 
 def tratar_erro_oracle():
     caminho = os.path.join(base_path, "qtd_negativa.png")
-    try:
-        if os.path.isfile(caminho) and pyautogui.locateOnScreen(caminho, confidence=0.8):
-            pyautogui.press("enter")
-            time.sleep(1)
-            pyautogui.hotkey("ctrl", "s")
-            time.sleep(1)
-    except (PyautoguiImageNotFoundException, PyscreezeImageNotFoundException):
-        pass
+    if os.path.isfile(caminho) and localizar_imagem(caminho, confidence=0.8):
+        pyautogui.press("enter")
+        time.sleep(1)
+        pyautogui.hotkey("ctrl", "s")
+        time.sleep(1)
 
 def sync_sheets_background(cache, service):
     """Thread que tenta atualizar Sheets para linhas pendentes (busca dinâmica)"""
     ciclo_retry = 0
+    leitor_retry = None
+    if LEITOR_SEPARACAO_DISPONIVEL:
+        leitor_retry = leitor_separacao.LeitorSeparacao(
+            service, SPREADSHEET_ID, aba=SHEET_NAME, colunas=("ID", "Status Oracle")
+        )
     while True:
         time.sleep(30)  # Retry a cada 30 segundos
 
@@ -487,18 +585,20 @@ def sync_sheets_background(cache, service):
 
             log_interface(f"[RETRY THREAD] Ciclo {ciclo_retry} - Encontrados {len(pendentes)} itens pendentes para atualizar")
 
-            # Buscar todas as linhas do Sheets (até AC para incluir coluna ID)
-            res = service.spreadsheets().values().get(
-                spreadsheetId=SPREADSHEET_ID,
-                range=f"{SHEET_NAME}!A1:AC"
-            ).execute()
-
-            valores = res.get("values", [])
-            if not valores:
+            # Buscar todas as linhas do Sheets (só ID e Status Oracle, ID em AC)
+            if leitor_retry is not None:
+                headers, dados, _ = leitor_retry.ler()  # leitura completa (não incremental)
+            else:
+                res = service.spreadsheets().values().get(
+                    spreadsheetId=SPREADSHEET_ID,
+                    range=f"{SHEET_NAME}!A1:AC"
+                ).execute()
+                valores = res.get("values", [])
+                headers, dados = (valores[0], valores[1:]) if valores else ([], [])
+
+            if not headers:
                 log_interface(f"[RETRY THREAD] Nenhum valor retornado do Sheets")
                 continue
-
-            headers, dados = valores[0], valores[1:]
             idx_id = headers.index("ID")
             idx_status_oracle = headers.index("Status Oracle")
             log_interface(f"[RETRY THREAD] Sheets carregado - {len(dados)} linhas encontradas")
@@ -550,6 +650,7 @@ def sync_sheets_background(cache, service):
             log_interface(f"[RETRY THREAD] Detalhes: {traceback.format_exc()[:300]}")
 
 def robo_loop():
+    global fila_status, leitor
     estado["executando"] = True
     log_interface("="*60)
     if MODO_TESTE:
@@ -572,6 +673,21 @@ def robo_loop():
     cache = CacheLocal("processados.json")
     log_interface(f"[CACHE] Cache carregado: {len(cache.dados)} itens processados anteriormente")
 
+    # Leitura da aba só com as colunas usadas (cabeçalho resolvido uma vez)
+    if LEITOR_SEPARACAO_DISPONIVEL:
+        leitor_separacao.gui_log = log_interface
+        leitor = leitor_separacao.LeitorSeparacao(
+            service, SPREADSHEET_ID, aba=SHEET_NAME,
+            incremental=LEITURA_INCREMENTAL, resync_s=RESYNC_SEPARACAO_SECONDS,
+            eh_final=linha_final_oracle
+        )
+
+    # Fila write-behind do Status Oracle (thread própria, com o próprio service)
+    if FILA_STATUS_DISPONIVEL:
+        fila_status_sheets.gui_log = log_interface
+        fila_status = fila_status_sheets.FilaStatusSheets(authenticate_google, SPREADSHEET_ID, pasta=data_path).iniciar()
+        log_interface(f"[FILA SHEETS] Status Oracle enviados em lote a cada {fila_status.intervalo:.0f}s")
+
     # Iniciar thread de retry em background
     threading.Thread(
         target=sync_sheets_background,
@@ -760,10 +876,7 @@ def robo_loop():
                         # erro de produto?
                         erro_produto_path = os.path.join(base_path, "ErroProduto.png")
                         if os.path.isfile(erro_produto_path):
-                            try:
-                                encontrado = pyautogui.locateOnScreen(erro_produto_path, confidence=0.8)
-                            except (PyautoguiImageNotFoundException, PyscreezeImageNotFoundException):
-                                encontrado = None
+                            encontrado = localizar_imagem(erro_produto_path, confidence=0.8)
                             if encontrado:
                                 atualizar_status_oracle(service, headers, i, "PD")
                                 log_interface(f"[ERRO] Linha {i} marcada como 'PD' (pendente) por erro detectado.")
@@ -897,18 +1010,24 @@ def robo_loop():
 
                         log_interface(f"[SHEETS] Tentando atualizar linha {i}, coluna {coluna_letra} (índice {idx_status_oracle}) - ID {id_item}")
 
-                        service.spreadsheets().values().update(
-                            spreadsheetId=SPREADSHEET_ID,
-                            range=range_str,
-                            valueInputOption="RAW",
-                            body={"values": [["Processo Oracle Concluído"]]}
-                        ).execute()
+                        def concluir(id_concluido=id_item, coluna=coluna_letra):
+                            # Remove do cache ao concluir
+                            if cache.marcar_concluido(id_concluido):
+                                log_interface(f"[SHEETS] ✓ ID {id_concluido} - Sheets atualizado com sucesso na coluna {coluna}, removido do cache")
+                            else:
+                                log_interface(f"[AVISO] ID {id_concluido} não estava no cache para remover")
 
-                        # Remove do cache ao concluir
-                        if cache.marcar_concluido(id_item):
-                            log_interface(f"[SHEETS] ✓ ID {id_item} - Sheets atualizado com sucesso na coluna {coluna_letra}, removido do cache")
+                        if fila_status is not None:
+                            # Em lote: concluir() roda quando o Google confirmar
+                            fila_status.enfileirar(range_str, "Processo Oracle Concluído", ao_confirmar=concluir)
                         else:
-                            log_interface(f"[AVISO] ID {id_item} não estava no cache para remover")
+                            service.spreadsheets().values().update(
+                                spreadsheetId=SPREADSHEET_ID,
+                                range=range_str,
+                                valueInputOption="RAW",
+                                body={"values": [["Processo Oracle Concluído"]]}
+                            ).execute()
+                            concluir()
 
                     except Exception as err_up:
                         log_interface(f"[ERRO SHEETS] ID {id_item} - Falha ao atualizar linha {i}: {str(err_up)[:150]}")
@@ -925,6 +1044,7 @@ def robo_loop():
                             if idx_so < len(linha_sessao):
                                 linha_sessao[idx_so] = "Processo Oracle Concluído"
                             sessao["rows"].append(linha_sessao)
+                            sessao["numeros"].append(i)
                     except Exception as e:
                         log_interface(f"[AVISO] Nao foi possivel registrar a linha na sessao: {e}")
 
@@ -955,6 +1075,13 @@ def robo_loop():
             restaurar_app()
             messagebox.showerror("Erro", f"Erro inesperado no loop:\n{str(e)[:200]}\n\nVeja o log para mais detalhes.")
 
+    if fila_status is not None:
+        fila, fila_status = fila_status, None
+        fila.encerrar()
+        est = fila.estatisticas()
+        log_interface(f"[FILA SHEETS] {est['enfileiradas']} status, {est['coalescidas']} coalescidos, "
+                      f"{est['lotes']} lotes, {est['falhas']} falhas")
+
     log_interface("="*60)
     log_interface("[FIM] Loop do robo encerrado")
     estado["executando"] = False
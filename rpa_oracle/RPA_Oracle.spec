@@ -3,10 +3,10 @@
 
 a = Analysis(
     ['RPA_Oracle.py'],
-    pathex=[],
+    pathex=['../rpa_ciclo'],  # detector_tela.py, fila_status_sheets.py e leitor_separacao.py (compartilhados)
     binaries=[],
     datas=[('CredenciaisOracle.json', '.'), ('qtd_negativa.png', '.'), ('ErroProduto.png', '.'), ('erroendereco.png', '.'), ('Tecumseh.png', '.'), ('Topo.png', '.'), ('Logo.png', '.')],
-    hiddenimports=['pyautogui', 'mouseinfo', 'PIL', 'googleapiclient', 'google.oauth2', 'google_auth_oauthlib', 'cv2'],
+    hiddenimports=['pyautogui', 'mouseinfo', 'PIL', 'googleapiclient', 'google.oauth2', 'google_auth_oauthlib', 'cv2', 'numpy', 'detector_tela', 'fila_status_sheets', 'leitor_separacao'],
     hookspath=['.'],
     hooksconfig={},
     runtime_hooks=[],